@@ -41,7 +41,7 @@ from common_utils       import *
 from airfoil            import Airfoil, Airfoil_Bezier, GEO_BASIC, GEO_SPLINE
 from airfoil            import NORMAL
 from airfoil_geometry   import Geometry, Side_Airfoil_Bezier, UPPER, LOWER
-from airfoil_geometry   import Match_Side_Bezier
+from airfoil_geometry   import Match_Side_Bezier, Match_Cache, run_matcher
 
 from airfoil_examples   import Root_Example
 from airfoil_artists    import *
@@ -1785,6 +1785,10 @@ class Dialog_Bezier (Dialog_Airfoil_Abstract):
         self._matcher_upper = None      # controller object to match side         
         self._matcher_lower = None      # controller object to match side         
 
+        # warm start cache of previous match results - per user, not in the install directory
+        cacheFile = os.path.join (user_cache_dir (AppName.replace(' ','')), 'bezier_cache.json')
+        self._match_cache   = Match_Cache (cacheFile)
+
         super().__init__ (master, airfoilFn)
 
 
@@ -1796,7 +1800,8 @@ class Dialog_Bezier (Dialog_Airfoil_Abstract):
             geoOrg  = self.airfoilOrg.geo
             self._matcher_upper = Match_Side_Bezier (geo.upper, geoOrg.upper, 
                                                      target_le_curv=geoOrg.curvature.max_at_le,
-                                                     max_te_curv   =geoOrg.curvature.at_upper_te)
+                                                     max_te_curv   =geoOrg.curvature.at_upper_te,
+                                                     cache=self._match_cache)
         return self._matcher_upper
 
     @property
@@ -1807,7 +1812,8 @@ class Dialog_Bezier (Dialog_Airfoil_Abstract):
             geoOrg  = self.airfoilOrg.geo
             self._matcher_lower = Match_Side_Bezier (geo.lower, geoOrg.lower, 
                                                      target_le_curv=geoOrg.curvature.max_at_le,
-                                                     max_te_curv   =geoOrg.curvature.at_lower_te)
+                                                     max_te_curv   =geoOrg.curvature.at_lower_te,
+                                                     cache=self._match_cache)
         return self._matcher_lower
 
 
@@ -1966,6 +1972,10 @@ class Dialog_Bezier (Dialog_Airfoil_Abstract):
                                     lab=f"Match {sideName}", set=self.match_side_bezier, 
                                     disable=self.match_side_bezier_disabled))
 
+        r += 1
+        self.add (Button_Widget (frame,r,c, width=100, padx=20, 
+                                lab="Match both", set=self.match_both_sides_bezier, 
+                                disable=self.match_both_sides_bezier_disabled))
         c = 0 
         r += 1
         self.add (Field_Widget  (frame,r,c,   lab="TE gap", width=50, lab_width=70,
@@ -2032,7 +2042,7 @@ class Dialog_Bezier (Dialog_Airfoil_Abstract):
             matcher = self.matcher_lower
             side    =self.airfoil.geo.lower
 
-        #---------- run optimization with nelder mead ---------------------
+        #---------- run optimization - least squares or nelder mead ---------------------
 
         messageFn = lambda: (f"Matching {sideName} side Bezier to \n\n{self.airfoilOrg.name} \n\n\n"
                            + f" {matcher.get_nevals():4d} evaluations") 
@@ -2044,6 +2054,30 @@ class Dialog_Bezier (Dialog_Airfoil_Abstract):
         self._match_result_info (side, matcher)                 # user info 
 
 
+    def match_both_sides_bezier (self): 
+        """ match upper and lower bezier curve in parallel to 'original' airfoil """
+
+        sides    = [self.airfoil.geo.upper, self.airfoil.geo.lower]
+        matchers = [self.matcher_upper, self.matcher_lower]
+
+        #---------- run both optimizations in a process pool ---------------------
+
+        jobs = [(run_matcher, (matcher,), matcher.set_result) for matcher in matchers]
+
+        message = f"Matching upper and lower side Bezier to \n\n{self.airfoilOrg.name} \n\n\n"
+
+        Eval_Parallel_With_ToolWindow (self, jobs, message)
+
+        self.airfoil.reset()                                    # make splined curves like thickness invalid 
+        fireEvent  (self.ctk_root, AIRFOIL_CHANGED)             # update diagram 
+        for side, matcher in zip (sides, matchers): 
+            self._match_result_info (side, matcher)             # user info 
+
+
+    def match_both_sides_bezier_disabled (self): 
+        return self.match_side_bezier_disabled (UPPER) or self.match_side_bezier_disabled (LOWER)
+
+
     def _match_result_info (self, side: Side_Airfoil_Bezier, matcher: Match_Side_Bezier):
         # info message for user 
 
@@ -2056,14 +2090,7 @@ class Dialog_Bezier (Dialog_Airfoil_Abstract):
         nevals      = matcher.get_nevals()
         title = f"Match Bezier {side.name} side"
 
-        if   nvar >= 7:
-            good_deviation = 0.001
-        elif nvar >= 5:
-            good_deviation = 0.005
-        else: 
-            good_deviation = 0.01
-
-        if deviation < good_deviation:         
+        if deviation < matcher.norm2_good:         
             text = f"Optimization with {nvar} variables successful. \n\n"  \
                    f"y-deviation at {ntarget} test points: {deviation:.5f} \n\n\n" 
             icon = "check"
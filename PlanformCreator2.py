@@ -45,6 +45,8 @@ import customtkinter as ctk
 sys.path.append(os.path.join(Path(__file__).parent , 'modules'))
 
 from common_utils       import * 
+from airfoil            import Airfoil
+from airfoil_library    import Airfoil_Library, THICKNESS, CAMBER, TE_GAP, LE_RADIUS
 from wing_model         import Planform, Planform_Bezier_StraightTE, \
                                        Planform_DXF, Planform_Trapezoidal, Planform_Bezier         
 
@@ -724,14 +726,12 @@ class Edit_WingSection(Edit_Abstract_Wing):
 
     
     def select_airfoil(self):
-        """ select airfoil with explorer and load it if possible """
+        """ select airfoil out of an airfoil library and load it if possible """
 
-        filetypes  = [('dat files', '*.dat')]
-    
-        newPathFilename = filedialog.askopenfilename(
-                    title='Select airfoil file',
-                    initialdir=self.workingDir,
-                    filetypes=filetypes)
+        dialog = Dialog_Select_Airfoil (self, workingDir=self.workingDir)
+        self.wait_window (dialog)
+
+        newPathFilename = dialog.return_pathFileName if dialog.return_OK else None
         if newPathFilename: 
             self.wingSection().set_airfoilWithPathFileName(newPathFilename)
             self.refresh()
@@ -2135,6 +2135,175 @@ class Dialog_Export_Airfoils (Dialog_Abstract):
 
 
 
+class Dialog_Select_Airfoil (Dialog_Abstract):
+    """ 
+    Select an airfoil out of an airfoil library filtered by thickness, camber, ...
+
+    """
+    name       = "Select Airfoil"
+    widthFrac  = 0.40
+    heightFrac = 0.40
+
+    MAX_SHOWN  = 200                                    # max airfoils in selection list 
+
+    def __init__(self, master, *args, workingDir=None, **kwargs):
+
+        # the library must be set explicitly - it is indexed and a cache is written there
+        self.libraryDir = Settings().get('airfoil_library_dir', default='')
+        if not self.libraryDir or not os.path.isdir (self.libraryDir): 
+            self.libraryDir = ''
+
+        self.library : Airfoil_Library = None
+        self.ranges  = {THICKNESS: [None, None], CAMBER: [None, None], 
+                        TE_GAP:    [None, None], LE_RADIUS: [None, None]}
+        self._selected = []                             # relative paths of filtered airfoils 
+        self._selectedFile = ''
+
+        self.return_pathFileName = None
+
+        super().__init__(master, *args, workingDir=workingDir, **kwargs)
+
+
+    def init (self):
+        # init UI 
+
+        # main grid 3 x 1  (header + edit + buttons) 
+        self.header_frame = ctk.CTkFrame(self.edit_frame, fg_color="transparent")
+        self.header_frame.grid(row=0, column=0, sticky="we")
+
+        self.input_frame = ctk.CTkFrame(self.edit_frame, fg_color="transparent")
+        self.input_frame.grid(row=1, column=0, sticky="nwes", padx=10, pady=20)
+
+        self.button_frame = ctk.CTkFrame(self.edit_frame, fg_color="transparent")
+        self.button_frame.grid(row=2, column=0, sticky="wes", pady=15)
+
+        self.edit_frame.grid_columnconfigure (0, weight=1)
+        self.edit_frame.grid_rowconfigure    (1, weight=1)
+
+        # header with hints 
+        r = 0 
+        c = 0 
+        Header_Widget (self.header_frame,r,c, lab="Airfoil library", width=110, pady=(7,10))
+        hint =  "Airfoils of the library directory are indexed once. \n" + \
+                "Filter them by thickness, camber, TE gap or LE radius in % of chord."
+        self.add (Label_Widget  (self.header_frame,r,c+1, lab=hint, sticky="w", 
+                                    columnspan=8, text_style='hint'))
+        self.header_frame.grid_columnconfigure (c+2, weight=1)
+
+        # entry fields 
+        r = 0 
+        c = 0 
+        self.add(Field_Widget  (self.input_frame,r,c, lab="Library directory", obj=self, get='libraryDir', set='',
+                                lab_width=105, width=300, columnspan=4, disable=True))
+        self.add(Button_Widget (self.input_frame,r,c+5, lab='Select', width=60, sticky='w', set=self.select_dir ))
+
+        r += 1 
+        Blank_Widget           (self.input_frame,r,c, width=50) 
+        r += 1 
+        Label_Widget           (self.input_frame,r,c+1, lab="min")
+        Label_Widget           (self.input_frame,r,c+3, lab="max")
+
+        for metric, lab in [(THICKNESS, "Thickness"), (CAMBER, "Camber"), 
+                            (TE_GAP, "TE gap"), (LE_RADIUS, "LE radius")]: 
+            r += 1 
+            for i in [0,1]:
+                self.add(Field_Widget  (self.input_frame,r,c+2*i, lab=lab if i == 0 else "", lab_width=105 if i == 0 else 10, 
+                                        width=70, get=self.range_value, set=self.set_range_value, objId=(metric, i),
+                                        dec=2, unit='%'))
+        r += 1 
+        Blank_Widget           (self.input_frame,r,c, width=50) 
+        r += 1 
+        self.add(Combo_Widget  (self.input_frame,r,c, lab="Airfoil", lab_width=105, width=300, 
+                                get='selectedFile', set='set_selectedFile', obj=self,
+                                options=self.selectedFiles))
+        r += 1 
+        self.add(Label_Widget  (self.input_frame,r,c+1, lab=self.selected_info, columnspan=4, 
+                                sticky="w", text_style='hint'))
+
+        self.add(Button_Widget (self.button_frame,0,1, lab='Browse...', set=self.browse, width=100))
+        self.add(Button_Widget (self.button_frame,0,2, lab='Ok', set=self.ok, style=PRIMARY, width=100))
+        self.add(Button_Widget (self.button_frame,0,3, lab='Cancel', set=self.cancel, width=100))
+        self.button_frame.grid_columnconfigure (0, weight=1)
+        self.button_frame.grid_columnconfigure (4, weight=1)
+
+        if self.libraryDir: 
+            self.after (100, self.load_library)
+
+
+    def range_value (self, objId=None):
+        metric, i = objId
+        return self.ranges[metric][i]
+
+    def set_range_value (self, aVal, objId=None):
+        metric, i = objId
+        self.ranges[metric][i] = aVal 
+        self.filter()
+
+    @property
+    def selectedFile (self): 
+        return self._selectedFile
+    def set_selectedFile (self, aFile): 
+        self._selectedFile = aFile
+
+    def selectedFiles (self) -> list: 
+        return self._selected [:self.MAX_SHOWN]
+
+    def selected_info (self) -> str: 
+        if not self.libraryDir: return "Select the directory of your airfoil library"
+        if self.library is None: return ""
+        return f"{len(self._selected)} of {self.library.nAirfoils} airfoils match"
+
+
+    def load_library (self): 
+        """ load index of library and update it with new or modified airfoils"""
+
+        self.library = Airfoil_Library (self.libraryDir)
+        Eval_With_ToolWindow (self, self.library.update, "Indexing airfoil library ...")
+        self.filter()
+
+
+    def filter (self): 
+        """ apply current ranges to library"""
+
+        if self.library is None: return 
+        pathFileNames  = self.library.select (**self.ranges)
+        self._selected = [os.path.relpath (p, self.libraryDir) for p in pathFileNames]
+        if self._selectedFile not in self._selected: 
+            self._selectedFile = self._selected[0] if self._selected else ''
+        self.refresh()
+
+
+    def select_dir(self):
+        " open dialog for directory selection"
+
+        newDir = filedialog.askdirectory(
+                    title='Select airfoil library directory',
+                    initialdir=self.libraryDir if self.libraryDir else self.workingDir)
+        if newDir:
+            self.libraryDir = os.path.normpath (newDir)
+            Settings().set('airfoil_library_dir', self.libraryDir)
+            self.load_library()
+
+
+    def browse (self):
+        " select airfoil with explorer"
+
+        newPathFilename = filedialog.askopenfilename(
+                    title='Select airfoil file',
+                    initialdir=self.workingDir,
+                    filetypes=[('dat files', '*.dat')])
+        if newPathFilename: 
+            self.return_pathFileName = newPathFilename
+            super().ok()
+
+    def ok(self): 
+        self.force_set()
+        if self.libraryDir and self._selectedFile: 
+            self.return_pathFileName = os.path.join (self.libraryDir, self._selectedFile)
+        super().ok()
+
+
+
 class Edit_File_Menu(Edit_Abstract_Wing):
     """ 
     Frame for the high level commands like load, save, ...
@@ -2432,6 +2601,9 @@ if __name__ == "__main__":
 
     Settings.belongTo (__file__, msg=True)
 
+    # optional binary cache of airfoil coordinates beside the .dat files 
+    Airfoil.useCoordCache = Settings().get('airfoil_coordinate_cache', default=False)
+
     ctk.set_appearance_mode    (Settings().get('appearance_mode', default='System'))   # Modes:  "System" (standard), "Dark", "Light"
     ctk.set_default_color_theme(Settings().get('color_theme', default='blue'))         # Themes: "blue" (standard), "green", "dark-blue"
     scaling = Settings().get('widget_scaling', default=1.0)
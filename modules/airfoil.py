@@ -8,6 +8,9 @@
 from typing import Type
 
 import os
+import io
+import hashlib
+import logging
 from pathlib import Path
 import numpy as np
 from math_util import * 
@@ -33,6 +36,66 @@ FINAL       = "Final"
 
 AIRFOIL_TYPES = [NORMAL, SEED, SEED_DESIGN, REF1, REF2, DESIGN, FINAL]
 
+# binary cache of .dat coordinates 
+
+COORD_CACHE_DIR = '__airfoil_cache__'           # sub directory beside the .dat files 
+
+
+#--------------------------------------------------------------------------
+
+def _coord_cache_file (pathFileName) -> tuple:
+    """
+    returns the file name of the binary coordinate cache of an airfoil file
+    and the prefix of all cache files of this airfoil file (older versions)
+
+    The cache file is addressed by a hash of path, modification time and size 
+    """
+    stat       = os.stat (pathFileName)
+    cacheDir   = os.path.join (os.path.dirname (os.path.abspath (pathFileName)), COORD_CACHE_DIR)
+    pathHash   = hashlib.sha1 (os.path.abspath (pathFileName).encode()).hexdigest()[:16]
+    stateHash  = hashlib.sha1 (f"{stat.st_mtime_ns}-{stat.st_size}".encode()).hexdigest()[:16]
+    prefix     = os.path.join (cacheDir, pathHash)
+    return f"{prefix}-{stateHash}.npy", prefix
+
+
+def load_coord_cache (pathFileName) -> np.ndarray:
+    """
+    returns the coordinates x,y as 2 x n array out of the binary cache of 
+    the airfoil file pathFileName - None if there is no valid cache file
+    """
+    try: 
+        cacheFile, _ = _coord_cache_file (pathFileName)
+        if not os.path.isfile (cacheFile): 
+            return None
+        # memory mapped read - copy to release the file at once 
+        xy = np.array (np.load (cacheFile, mmap_mode='r'))
+    except (OSError, ValueError) as e: 
+        logging.debug (f"Coordinate cache of '{pathFileName}' couldn't be read: {e}")
+        return None
+    if xy.ndim != 2 or xy.shape[0] != 2: 
+        return None
+    return xy
+
+
+def save_coord_cache (pathFileName, x : np.ndarray, y : np.ndarray):
+    """
+    writes the coordinates x,y of the airfoil file pathFileName into its binary cache 
+    and removes outdated cache files of pathFileName 
+    """
+    try: 
+        cacheFile, prefix = _coord_cache_file (pathFileName)
+        os.makedirs (os.path.dirname (cacheFile), exist_ok=True)
+
+        for oldFile in Path(os.path.dirname (cacheFile)).glob (os.path.basename (prefix) + '-*.npy'):
+            if str(oldFile) != cacheFile: 
+                oldFile.unlink (missing_ok=True)
+
+        buffer = io.BytesIO ()
+        np.save (buffer, np.vstack ((x, y)))
+        write_atomic (cacheFile, buffer.getvalue())    # concurrent loads see a complete file
+    except OSError as e: 
+        logging.debug (f"Coordinate cache of '{pathFileName}' couldn't be written: {e}")
+
 
 #--------------------------------------------------------------------------
 
@@ -46,6 +109,7 @@ class Airfoil:
     isEdited            = False
     isExample           = False                      # vs. Example_Airfoil 
     isBezierBased       = False
+    useCoordCache       = False                      # use binary cache beside .dat files on load
 
 
     def __init__(self, x= None, y = None, name = None,
@@ -466,6 +530,7 @@ class Airfoil:
         Loads airfoil coordinates from file. 
         pathFileName must be set before or fromPath must be defined.
         Load doesn't change self pathFileName
+        If 'useCoordCache' is set, a valid binary cache of the file is taken 
         """    
 
         if fromPath and os.path.isfile (fromPath):
@@ -476,40 +541,72 @@ class Airfoil:
             sourcePathFile = None 
 
         if sourcePathFile:
-            f = open(sourcePathFile, 'r')
-            file_lines = f.readlines()
-            f.close()
-            self._loadLines(file_lines)
+
+            xy = load_coord_cache (sourcePathFile) if self.useCoordCache else None
+
+            if xy is not None: 
+                with open(sourcePathFile, 'r') as f:
+                    self._name = f.readline().strip()
+                self._x, self._y = xy[0], xy[1]
+            else: 
+                f = open(sourcePathFile, 'r')
+                file_lines = f.readlines()
+                f.close()
+                self._loadLines(file_lines)
+
+                if self.useCoordCache: 
+                    save_coord_cache (sourcePathFile, self._x, self._y)
 
 
     def _loadLines (self, file_lines):
+        """
+        read the lines of the airfoil file into self x,y. 
+        The first line is the name, the coordinate block is parsed in one go. 
+        Duplicate points are removed.
+        """
 
-        # read the lines of the airfoil file into self x,y
-
-        x = []
-        y = []
-        xvalPrev = -9999.9
-        yvalPrev = -9999.9
-
-        for i, line in enumerate(file_lines):
-            if (i > 0): 
-                splitline = line.strip().split()               # will remove all extra spaces
-                if len(splitline) == 1:                        # couldn't split line - try tab as separator
-                    splitline = line.strip().split("\t",1)
-                if len(splitline) >= 2:                     
-                    xval = float(splitline[0].strip())
-                    yval = float(splitline[1].strip())
-                    if xval == xvalPrev and yval == yvalPrev:   # avoid duplicate, dirty coordinates
-                        WarningMsg ("Airfoil '%s' has duplicate coordinates - skipped." % self._name)
-                    else: 
-                        x.append (xval)
-                        y.append (yval) 
-                    xvalPrev = xval 
-                    yvalPrev = yval 
-            else: 
-                self._name = line.strip()
-        self._x = np.asarray (x)
-        self._y = np.asarray (y)
+        if not file_lines: 
+            self._x, self._y = np.asarray ([]), np.asarray ([])
+            return
+
+        self._name = file_lines[0].strip()
+
+        # bulk parse of coordinate block - space or tab separated 
+        if not any (line.strip() for line in file_lines[1:]):
+            xy = np.empty ((0,2))                   # header only - no data (loadtxt would warn)
+        else: 
+            try: 
+                xy = np.loadtxt (file_lines[1:], usecols=(0,1), ndmin=2, comments=None)
+            except ValueError:
+                xy = self._parseLines (file_lines)  # irregular lines - go line by line
+        x, y = xy[:,0], xy[:,1]
+
+        # avoid duplicate, dirty coordinates 
+        isDuplicate = np.concatenate (([False], (np.diff(x) == 0.0) & (np.diff(y) == 0.0)))
+        if np.any (isDuplicate): 
+            WarningMsg ("Airfoil '%s' has %d duplicate coordinates - skipped." % (self._name, np.sum(isDuplicate)))
+            x, y = x[~isDuplicate], y[~isDuplicate]
+
+        self._x = x
+        self._y = y
+
+
+    def _parseLines (self, file_lines) -> np.ndarray:
+        """ 
+        parse coordinate lines one by one - lines with less than 2 values are skipped.
+        Returns n x 2 array of coordinates - raises ValueError with line number 
+        """
+
+        xy = []
+        for i, line in enumerate(file_lines[1:]):
+            splitline = line.split()                    # space or tab 
+            if len(splitline) >= 2:                     
+                try: 
+                    xy.append ((float(splitline[0]), float(splitline[1])))
+                except ValueError:
+                    raise ValueError ("Airfoil '%s' line %d: invalid coordinates '%s'" % 
+                                      (self._name, i + 2, line.strip()))
+        return np.asarray (xy, dtype=float).reshape (-1, 2)
 
 
     def save (self):
@@ -533,8 +630,7 @@ class Airfoil:
 
         # create dir if not exist - build new airfoil filename
         if dir: 
-            if not os.path.isdir (dir):
-                os.mkdir(dir)
+            os.makedirs (dir, exist_ok=True)
             self.set_pathFileName (os.path.join (dir, self.name) + '.dat', noCheck=True)
 
         self.save()
@@ -573,8 +669,7 @@ class Airfoil:
 
         # create dir if not exist - build airfoil filename
         if dir: 
-            if not os.path.isdir (dir):
-                os.mkdir(dir)
+            os.makedirs (dir, exist_ok=True)            # exports may run concurrently 
             newPathFileName = os.path.join (dir, destName) + '.dat'
         else: 
             newPathFileName = destName + '.dat'
@@ -622,11 +717,12 @@ class Airfoil:
     def _write_to_file (self):
         """ writes .dat file of to self.pathFileName"""
 
-        with open(self.pathFileName, 'w+') as file:
-            file.write("%s\n" % self.name)
-            for i in range (len(self.x)):
-                file.write("%.7f %.7f\n" %(self.x[i], self.y[i]))
-            file.close()
+        # format coordinate block in one go 
+        buffer = io.StringIO()
+        np.savetxt (buffer, np.column_stack ((self.x, self.y)), fmt='%.7f', 
+                    header=self.name, comments='')
+
+        write_atomic (self.pathFileName, buffer.getvalue())
 
 
     def repanel (self): 
@@ -864,22 +960,20 @@ class Airfoil_Bezier(Airfoil):
         #  .bez-format for CAD etc and 
 
         # filename - remove .dat - add .bez 
-        with open(self.pathFileName_bezier, 'w+') as file:
+        buffer = io.StringIO()
 
-            # airfoil name 
-            file.write("%s\n" % self.name)
+        # airfoil name 
+        buffer.write("%s\n" % self.name)
 
-            file.write("Top Start\n" )
-            for p in self.geo.upper.controlPoints:
-                file.write("%13.10f %13.10f\n" %(p[0], p[1]))
-            file.write("Top End\n" )
+        buffer.write("Top Start\n" )
+        np.savetxt (buffer, np.asarray (self.geo.upper.controlPoints), fmt='%13.10f')
+        buffer.write("Top End\n" )
 
-            file.write("Bottom Start\n" )
-            for p in self.geo.lower.controlPoints:
-                file.write("%13.10f %13.10f\n" %(p[0], p[1]))
-            file.write("Bottom End\n" )
+        buffer.write("Bottom Start\n" )
+        np.savetxt (buffer, np.asarray (self.geo.lower.controlPoints), fmt='%13.10f')
+        buffer.write("Bottom End\n" )
 
-            file.close()
+        write_atomic (self.pathFileName_bezier, buffer.getvalue())
 
 
 
@@ -509,9 +509,7 @@ class Difference_Artist (Airfoil_Line_Artist):
 
     def _get_difference (self, side_ref: Side_Airfoil, side_actual: Side_Airfoil_Bezier):
         # calculate difference at y-stations of reference airfoil 
-        diff  = np.zeros (len(side_ref.x))
-        for i, x in enumerate(side_ref.x):
-            diff [i] = side_actual.bezier.eval_y_on_x (x, fast=True) - side_ref.y[i]
+        diff = side_actual.bezier.eval_y_on_x (side_ref.x, fast=True) - side_ref.y
         return diff 
 
 
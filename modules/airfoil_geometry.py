@@ -51,15 +51,18 @@
                     """
 
 
+import os
+import json
+import hashlib
 import numpy as np
 import logging
 
 from math_util import * 
 from copy import copy, deepcopy
-from spline import Spline1D, Spline2D, Bezier
+from spline import Spline1D, Spline2D, Bezier, basisMatrix
 from spline import print_array_compact
 
-from common_utils import ErrorMsg
+from common_utils import ErrorMsg, write_atomic
 
 
 UPPER  = 'upper'
@@ -72,21 +75,33 @@ LOWER  = 'lower'
 # -----------------------------------------------------------------------------
 
 
+# optimization methods for matching 
+
+NELDER_MEAD   = 'Nelder-Mead'                      
+LEAST_SQUARES = 'Levenberg-Marquardt'
+
+
 class Match_Bezier:
     """ 
     Abstract superclass 
 
     Controller for matching Bezier curves to a target which is either a 'Geometry' or a 'Side'
 
-    For 'nelder mead optimization' is used ... 
+    The default method is a 'Levenberg-Marquardt' least squares optimization using the 
+    analytic jacobian of the Bezier. If it fails or the result isn't good enough 
+    'nelder mead optimization' is used - starting from the least squares result ... 
 
     """
-    def __init__ (self):
+    def __init__ (self, method = LEAST_SQUARES):
 
-        # nelder mead results 
+        self.method      = method                   # optimization method to use 
+
+        # optimization results 
         self.niter       = None                     # number of iterations needed
         self.ntarget     = None                     # number of x,y target coordinates 
         self.max_reached = None                     # max number of iterations reached
+        self.method_used = None                     # method which finally was used 
+        self.warm_start  = False                    # run started from a previous solution 
 
         self._nevals     = 0                        # current number of objective function evals
 
@@ -97,13 +112,23 @@ class Match_Bezier:
         devi = self._deviation_to_target()
         return np.linalg.norm (devi)
 
+    @property
+    def norm2_good (self) -> float:
+        """ norm2 deviation regarded as a good match - depends on number of variables"""
+        if   self.nvar >= 7:
+            return 0.001
+        elif self.nvar >= 5:
+            return 0.005
+        else: 
+            return 0.01
+
 
     # -------- public 
 
     def run (self) :
         """ 
         Optimizes self to best fit to target (either single Side or both sides)
-        uses nelder meat root finding
+        uses least squares - or as fallback nelder meat root finding
         """
 
         self.niter       = 0                        # number of iterations needed
@@ -118,6 +143,19 @@ class Match_Bezier:
 
         variables_start, bounds = self._map_bezier_to_variables ()
 
+        # ----- least squares with analytic jacobian - fast 
+
+        variables_ls = None                         # result of least squares 
+
+        if self.method == LEAST_SQUARES:
+            if self._run_least_squares (variables_start, bounds): 
+                return 
+            logging.debug (f"{self} least squares not good enough - fallback to nelder mead")
+            variables_ls = self._map_bezier_to_variables ()[0]
+            niter_ls     = self.niter
+
+        self.method_used = NELDER_MEAD
+
         # ----- objective function
 
         f = lambda variables : self._objectiveFn (variables) 
@@ -145,15 +183,57 @@ class Match_Bezier:
         variables = res[0]
         score = res[1]
 
+        self.niter       = niter
+        self.max_reached = (niter >= max_iter)
+        self._evals      = 0 
+
+        # nelder mead started from the initial bezier - least squares (local minimum) 
+        #   could be still the better one 
+        if variables_ls is not None and self._objectiveFn (variables_ls) < score: 
+            variables = variables_ls
+            self.niter       = niter_ls
+            self.max_reached = False
+            self.method_used = LEAST_SQUARES
+
         #-- evaluate the new y values on Bezier for the target x-coordinate
 
         self._map_variables_to_bezier (variables)
 
+        return 
+
+
+    def _run_least_squares (self, variables_start, bounds) -> bool: 
+        """ 
+        Levenberg-Marquardt optimization of the residuals of self.
+        Returns False if not successful or the result isn't good enough - 
+        the bezier is then either the improved result or reset to variables_start 
+        """
+
+        if self._residuals (variables_start) is None: return False    # not implemented 
+
+        max_iter = 100 
+
+        obj_start = self._objectiveFn (variables_start)
+
+        res, niter = levenberg_marquardt (self._residuals, self._jacobian, variables_start,
+                                          bounds=bounds, max_iter=max_iter)
+        variables = res[0]
+
+        # check result - least squares may run into a local minimum of a strange bezier 
+        obj = self._objectiveFn (variables)
+        if not np.isfinite (obj) or obj >= obj_start: 
+            variables = variables_start                 # warm start could be already the optimum 
+
+        self._map_variables_to_bezier (variables)
+
+        # same quality bar as nelder mead - otherwise result will be polished 
+        if self.norm2 >= self.norm2_good or (variables is variables_start and not self.warm_start): 
+            return False
+
         self.niter       = niter
         self.max_reached = (niter >= max_iter)
-        self._evals      = 0 
-
-        return 
+        self.method_used = LEAST_SQUARES
+        return True 
 
 
     def get_nevals (self) -> int:
@@ -185,6 +265,142 @@ class Match_Bezier:
         """ returns norm2 value of y deviations of self to target y at x """
         # must be overloaded
 
+    def _residuals (self, variables) -> np.ndarray:
+        """ returns array of residuals for least squares - None if not supported"""
+        # may be overloaded
+        return None
+
+    def _jacobian (self, variables) -> np.ndarray:
+        """ returns jacobian of residuals (nresiduals x nvar) """
+        # may be overloaded
+
+
+
+class Match_Cache: 
+    """ 
+    Persistent cache of converged Bezier control points of Match_Side_Bezier 
+
+    A target side is identified by a fingerprint (hash of target x,y and number of control points).
+    For a target which is not in the cache, the nearest solution (a slightly modified airfoil,
+    a strak neighbour) is taken, if the target y-values at fixed x-stations are close enough.
+    """
+
+    MAX_ENTRIES = 500                               # oldest entries will be removed 
+    MAX_NEAREST = 0.005                             # max norm2 distance of nearest target 
+    SIGNATURE_X = (1 - np.cos (np.linspace (0.05, 1.0, 20) * np.pi)) / 2   # x-stations of signature
+
+    def __init__ (self, pathFileName : str, auto_write = True):
+        """ 
+        Args:
+            pathFileName: the json file of the cache 
+            auto_write: write file with each store - else new entries are written with 'flush' 
+        """
+
+        self._pathFileName = pathFileName
+        self._auto_write   = auto_write
+        self._entries      = None                   # dict of fingerprint: entry - lazy loaded 
+        self._pending      = {}                     # stored entries not written to file 
+
+    @property
+    def entries (self) -> dict: 
+        """ dict of fingerprint: {ncp, signature, px, py}"""
+        if self._entries is None: 
+            self._entries = self._read_file ()
+        return self._entries
+
+
+    def fingerprint (self, targets_x, targets_y, ncp : int) -> str:
+        """ hash of target coordinates and number of control points"""
+        xy = np.round (np.concatenate ((targets_x, targets_y)), 7)
+        return hashlib.sha1 (xy.tobytes() + str(ncp).encode()).hexdigest()
+
+
+    def signature (self, targets_x, targets_y) -> np.ndarray:
+        """ target y values at fixed x-stations to compare different targets"""
+        return np.interp (self.SIGNATURE_X, targets_x, targets_y)
+
+
+    def get (self, targets_x, targets_y, ncp : int):
+        """ 
+        returns control points px, py of the cached solution for target - or 
+        of the nearest cached target with the same number of control points.
+        None if there is no suitable entry 
+        """
+        entry = self.entries.get (self.fingerprint (targets_x, targets_y, ncp))
+
+        if entry is None: 
+            signature = self.signature (targets_x, targets_y)
+            distance  = self.MAX_NEAREST
+            for candidate in self.entries.values(): 
+                if candidate['ncp'] == ncp: 
+                    dist = np.linalg.norm (signature - candidate['signature'])
+                    if dist < distance: 
+                        entry, distance = candidate, dist
+
+        if entry is None: 
+            return None
+        return list(entry['px']), list(entry['py'])
+
+
+    def store (self, targets_x, targets_y, px : list, py : list):
+        """ stores the control points as solution for target and writes cache file 
+        if 'auto_write' - otherwise the file is written with 'flush' """
+
+        key = self.fingerprint (targets_x, targets_y, len(px))
+        new_entry = {'ncp'      : len(px),
+                     'signature': list(np.round (self.signature (targets_x, targets_y), 7)), 
+                     'px'       : [float(x) for x in px],
+                     'py'       : [float(y) for y in py]}
+
+        self.entries.pop (key, None)
+        self.entries [key] = new_entry
+        self._pending.pop (key, None)
+        self._pending [key] = new_entry
+
+        if self._auto_write: 
+            self.flush ()
+
+
+    def flush (self):
+        """ writes the stored entries to the cache file """
+
+        if not self._pending: return 
+
+        # merge with current file - may be written by another process in the meantime
+        self._entries = self._read_file ()
+        for key, entry in self._pending.items(): 
+            self._entries.pop (key, None)
+            self._entries [key] = entry
+        while len(self._entries) > self.MAX_ENTRIES: 
+            self._entries.pop (next(iter(self._entries)))
+
+        self._write_file ()
+        self._pending = {}
+
+
+    def _read_file (self) -> dict:
+        try: 
+            with open(self._pathFileName, 'r') as file:
+                return json.load (file)
+        except (OSError, ValueError): 
+            return {}
+
+
+    def _write_file (self):
+        # write to temp file and rename to be safe against concurrent writes 
+        try: 
+            write_atomic (self._pathFileName, json.dumps (self._entries))
+        except OSError as e: 
+            logging.warning (f"Bezier match cache couldn't be written to {self._pathFileName}: {e}")
+
+
+
+def run_matcher (matcher : 'Match_Side_Bezier') -> dict:
+    """ runs matcher and returns its result - to be used within a process pool.
+    The result is stored in the warm start cache when set in the main process """
+    matcher.run(store_cache=False)
+    return matcher.result
+
 
 
 class Match_Side_Bezier (Match_Bezier):
@@ -194,15 +410,22 @@ class Match_Side_Bezier (Match_Bezier):
     def __init__ (self, side : 'Side_Airfoil_Bezier', 
                   target_side: 'Side_Airfoil',
                   target_le_curv : float = None,
-                  max_te_curv : float = None):
+                  max_te_curv : float = None,
+                  method = LEAST_SQUARES,
+                  cache : Match_Cache = None):
         """match a single Side_Bezier to a target side 
 
         Args:
             side (Side_Airfoil_Bezier): the side with bezier to match 
             target_side (Side_Airfoil): the target side 
-            include_le_curvature: (bool): the curvature at le of target will be additional target
+            target_le_curv: the curvature at le of target will be additional target
+            max_te_curv: the curvature at te shouldn't exceed this value 
+            method: either LEAST_SQUARES (fallback nelder mead) or NELDER_MEAD 
+            cache: optional Match_Cache to warm start from a previous solution 
         """
-        super().__init__ ()
+        super().__init__ (method=method)
+
+        self._cache      = cache                            # warm start cache 
 
         self._bezier = side.bezier
 
@@ -212,6 +435,9 @@ class Match_Side_Bezier (Match_Bezier):
         self.ntarget = len(self._targets_x) 
 
         self._target_le_curv = target_le_curv               # also take curvature at le into account
+        if target_le_curv:                                  # upper side bends clockwise - negative curvature
+            sign = -1.0 if self._targets_y[0] >= 0.0 else 1.0
+            self._target_le_curv = sign * abs(target_le_curv)
         self._max_te_curv    = max_te_curv                  # also take curvature ta te into account
 
 
@@ -220,6 +446,27 @@ class Match_Side_Bezier (Match_Bezier):
         """ bezier curve of self"""
         return self._bezier
 
+    @property
+    def result (self) -> dict:
+        """ result of run - control points and statistics. 
+        The result can be transferred from another process with set_result """
+        return {'points'      : self.bezier.points, 
+                'niter'       : self.niter,
+                'max_reached' : self.max_reached,
+                'method_used' : self.method_used,
+                'warm_start'  : self.warm_start,
+                'nevals'      : self._nevals}
+
+    def set_result (self, result : dict): 
+        """ set the result of a run - typically made in another process"""
+        self.bezier.set_points (result['points'])
+        self.niter       = result['niter']
+        self.max_reached = result['max_reached']
+        self.method_used = result['method_used']
+        self.warm_start  = result['warm_start']
+        self._nevals     = result['nevals']
+        self._store_to_cache ()
+
     @property
     def ncp (self) -> int:
         """ number of contro points"""
@@ -255,6 +502,23 @@ class Match_Side_Bezier (Match_Bezier):
         return np.array(targ_x), np.array(targ_y)
 
 
+    def run (self, store_cache = True):
+        """ 
+        Optimizes self to best fit to target - the result is stored in cache 
+        """
+        super().run()
+        if store_cache: 
+            self._store_to_cache ()
+
+
+    def _store_to_cache (self):
+        """ store the current bezier as solution for target in warm start cache - 
+        only a good result - a bad local minimum would be the start of all later runs"""
+        if self._cache is not None and self.norm2 < self.norm2_good: 
+            self._cache.store (self._targets_x, self._targets_y, 
+                               self.bezier.points_x, self.bezier.points_y)
+
+
     def _set_initial_bezier (self):
         """ returns inital coordinates of control points """
 
@@ -288,6 +552,22 @@ class Match_Side_Bezier (Match_Bezier):
 
         self.bezier.set_points (cp_x, cp_y)              # a new Bezier curve 
 
+        # warm start from the solution of the same or nearest target in cache 
+        #       if it is a better start than the default 
+
+        self.warm_start = False
+        if self._cache is not None: 
+            cached = self._cache.get (self._targets_x, self._targets_y, ncp)
+            if cached is not None: 
+                obj_default = self._objectiveFn (self._map_bezier_to_variables ()[0])
+                cached_x, cached_y = cached
+                cached_y[-1] = self._target_y_te        # te of nearest could be different
+                self.bezier.set_points (cached_x, cached_y)
+                if self._objectiveFn (self._map_bezier_to_variables ()[0]) < obj_default:
+                    self.warm_start = True
+                else: 
+                    self.bezier.set_points (cp_x, cp_y) 
+
 
     def _map_bezier_to_variables (self): 
         """ 
@@ -346,14 +626,23 @@ class Match_Side_Bezier (Match_Bezier):
         """returns array of deviations of current bezier to targets at target_x"""
 
         # evaluate the new y values on Bezier for the target x-coordinate
-        y_new = np.zeros (len(self.targets_y))
-        for i, x in enumerate(self.targets_x) :
-            y_new[i] = self.bezier.eval_y_on_x(x, fast=True, epsilon=1e-7)
+        y_new = self.bezier.eval_y_on_x(self.targets_x, fast=True, epsilon=1e-7)
 
         # calculate abs difference between bezier y and target y 
         return np.abs((y_new - self.targets_y))
 
 
+    def _target_weights (self):
+        """ returns the weights (divisor) of the y deviations at the targets"""
+
+        # norm2 of the *relative* deviations 
+        base = np.abs(self.targets_y)
+
+        # move base so targets with a small base (at TE) don't become overweighted 
+        shift = np.max (base) * 0.6 # 0.4    
+        return base + shift
+
+
     def _objectiveFn (self, variables : list ):  
         """ returns norm2 value of y deviations of self to target y at x """
 
@@ -362,24 +651,11 @@ class Match_Side_Bezier (Match_Bezier):
         devi = self._deviation_to_target ()            
 
         # calculate norm2 of the *relative* deviations 
-        base = np.abs(self.targets_y)
+        obj = np.linalg.norm (devi / self._target_weights())
 
-        # move base so targets with a small base (at TE) don't become overweighted 
-        shift = np.max (base) * 0.6 # 0.4    
-        obj = np.linalg.norm (devi / (base+shift))
-
-        # if a target le curvature defined, add this to objective
-        if self._target_le_curv:
-            delta_le = abs ( abs(self._target_le_curv) - abs(self.bezier.curvature(0.0) ))
-            obj += delta_le / 2000                 # add empirical normalized delta 
-            # print("delta_le ", delta_le)
-
-        # if a max te curvature defined, add this to objective
-        if self._target_le_curv:
-            delta = abs(self.bezier.curvature(1.0) - abs(self._max_te_curv))
-            if delta > 0: 
-                obj += delta/500                    # add empirical normalized delta     
-                # print("delta_le ", delta_le/500, "  delta te ", delta/200)
+        # if a target le curvature or a max te curvature defined, add the deviations 
+        #   to objective - the same as the residuals of least squares 
+        obj += np.sum (np.abs (self._curvature_residuals ()))
 
         # counter of objective evaluations (for entertainment)
         self._nevals += 1
@@ -387,6 +663,75 @@ class Match_Side_Bezier (Match_Bezier):
         return obj 
 
 
+    def _residuals (self, variables : list ) -> np.ndarray:  
+        """ returns array of the relative y deviations of self to target y at x 
+        and the deviations of curvature at le and te"""
+
+        self._map_variables_to_bezier (variables)
+
+        y_new = self.bezier.eval_y_on_x (self.targets_x, fast=True, epsilon=1e-7)
+        res   = (y_new - self.targets_y) / self._target_weights()
+
+        self._nevals += 1
+
+        return np.concatenate ((res, self._curvature_residuals ()))
+
+
+    def _curvature_residuals (self) -> np.ndarray: 
+        """ returns the normed deviations of le and te curvature  (empirical factors)
+        used by least squares (residuals) and nelder mead (objective) """
+
+        res = []
+        if self._target_le_curv:
+            res.append ((self.bezier.curvature(0.0) - self._target_le_curv) / 2000)
+        if self._max_te_curv is not None:
+            res.append ((self.bezier.curvature(1.0) - abs(self._max_te_curv)) / 500)
+        return np.array (res)
+
+
+    def _jacobian (self, variables : list) -> np.ndarray:  
+        """ returns the jacobian of residuals - analytic for the y deviations 
+            numerical for curvature """
+
+        self._map_variables_to_bezier (variables)
+
+        # at targets  x(u) = x_target  and  y(u) = Sum Bi(u) * pyi 
+        #   dy/dpyi = Bi(u)
+        #   dy/dpxi = - y'(u)/x'(u) * Bi(u)     (u moves to keep x(u) at x_target)
+
+        bezier = self.bezier 
+        u      = bezier.eval_u_on_x (self.targets_x, fast=True, epsilon=1e-7)
+        B      = basisMatrix (bezier.npoints - 1, u, cache=False)
+
+        dx, dy = bezier.eval (u, der=1)
+        slope  = np.divide (dy, dx, out=np.zeros_like(dy), where= dx != 0.0)
+
+        # columns of design variables - same order as in _map_bezier_to_variables
+        columns = []
+        for icp in range (1, bezier.npoints - 1): 
+            if icp == 1: 
+                columns.append (B[:,icp])               # le tangent only y
+            else:                                       
+                columns.append (- slope * B[:,icp])     # x value of control point
+                columns.append (B[:,icp])               # y value of control point
+        jac = np.column_stack (columns) / self._target_weights()[:, np.newaxis]
+
+        # curvature residuals - forward differences 
+        res0 = self._curvature_residuals ()
+        if len(res0):
+            jac_curv = np.zeros ((len(res0), len(variables)))
+            dv = 1e-6
+            for ivar in range (len(variables)):
+                vars_dv = np.array (variables, dtype=float)
+                vars_dv[ivar] += dv
+                self._map_variables_to_bezier (vars_dv)
+                jac_curv[:, ivar] = (self._curvature_residuals () - res0) / dv
+            self._map_variables_to_bezier (variables)
+            jac = np.vstack ((jac, jac_curv))
+
+        return jac 
+
+
 
 # -----------------------------------------------------------------------------
 #  Curvature Classes 
@@ -715,14 +1060,15 @@ class Side_Airfoil:
                 iend   = imax + 3
                 self._max_spline = Spline1D (self.x[istart:iend+1], self.y[istart:iend+1])
 
-                # nelder mead search
-                xstart = self.x[istart]
-                xend   = self.x[iend]
-                if max_y > min_y:                   # upper side 
-                    xmax = findMax (self._yFn_max, self.x[imax], bounds=(xstart, xend))
-                else:                               # lower side
-                    xmax = findMin (self._yFn_max, self.x[imax], bounds=(xstart, xend))
-                ymax = self._yFn_max (xmax)
+                # analytic extrema of the helper spline - take maximum (upper) or minimum (lower)
+                x_ext, y_ext = self._max_spline.extrema ()
+                if len(x_ext): 
+                    iext = np.argmax (y_ext) if max_y > min_y else np.argmin (y_ext)
+                    xmax = float (x_ext[iext])
+                    ymax = float (y_ext[iext])
+                else: 
+                    xmax = self.x[imax]
+                    ymax = self.y[imax]
 
                 # print (f"delta x  {xmax - self.x[imax]:.5f}" )
                 # print (f"delta y  {ymax - max_y:.5f}" )
@@ -818,10 +1164,7 @@ class Side_Airfoil_Spline (Side_Airfoil):
 
         # finally re-map x-values to move high point 
 
-        newX = np.zeros(len(self.x))
-        for i, xi in enumerate (self.x):
-            newX[i] = mapSpl.eval(xi)    
-            # print (i, "%.8f" %(self.x[i] - newX[i]), newX[i])
+        newX = mapSpl.eval(self.x)    
         newX[0]  = self.x[0]                # ensure LE and TE not to change due to numeric issues
         newX[-1] = self.x[-1]
 
@@ -1103,6 +1446,77 @@ class Side_Airfoil_Bezier (Side_Airfoil):
 # -----------------------------------------------------------------------------
 
 
+class Derived_Cache: 
+    """ 
+    Lazy cache of the derived properties of a geometry with dependency tracking
+
+    Each derived property declares the inputs (like 'xy') or the other derived properties
+    it depends on. A cached value is valid as long as the revisions of all of its 
+    (transitive) inputs didn't change. 'changed' increases the revision of an input. 
+    """
+
+    def __init__ (self, dependencies : dict):
+        """
+        Args:
+            dependencies: dict of derived name: list of input or derived names 
+        """
+
+        self._dependencies = dependencies
+        self._inputs       = {}                 # derived name: transitive input names 
+        self._revisions    = {}                 # input name: revision 
+        self._values       = {}                 # derived name: (value, revisions of inputs)
+
+        self.hits          = 0                  # statistics 
+        self.misses        = 0 
+
+
+    def inputs_of (self, name) -> tuple:
+        """ the input names a derived property depends on - directly or via other derived"""
+
+        if name not in self._inputs: 
+            inputs = set()
+            for dep in self._dependencies.get (name, []): 
+                if dep in self._dependencies: 
+                    inputs.update (self.inputs_of (dep))
+                else: 
+                    inputs.add (dep)
+            self._inputs [name] = tuple (sorted (inputs))
+        return self._inputs [name]
+
+
+    def changed (self, *inputs): 
+        """ input(s) changed - all depending derived values become invalid"""
+        for inp in inputs: 
+            self._revisions [inp] = self._revisions.get (inp, 0) + 1
+
+
+    def isValid (self, name) -> bool: 
+        """ is there a valid cached value for name"""
+        cached = self._values.get (name)
+        return cached is not None and cached[1] == self._snapshot (name)
+
+
+    def get (self, name, evalFn):
+        """ returns the cached value of name - evalFn() is called if it is invalid"""
+
+        if self.isValid (name): 
+            self.hits += 1
+        else: 
+            self.misses += 1
+            self.set (name, evalFn())
+        return self._values [name][0]
+
+
+    def set (self, name, value): 
+        """ sets the value of name e.g. if it was evaluated as a by-product"""
+        self._values [name] = (value, self._snapshot (name))
+
+
+    def _snapshot (self, name) -> tuple:
+        # the current revisions of the inputs of name 
+        return tuple (self._revisions.get (inp, 0) for inp in self.inputs_of (name))
+
+
 
 class Geometry (): 
     """ 
@@ -1119,6 +1533,14 @@ class Geometry ():
 
     sideDefaultClass = Side_Airfoil
 
+    # derived properties and the inputs they depend on 
+    dependencies = {'upper'             : ['xy'],
+                    'lower'             : ['xy'],
+                    'thickness_camber'  : ['xy'],
+                    'curvature'         : ['xy'],
+                    'panel_angles'      : ['xy'],
+                    'panel_angle_le'    : ['xy']}
+
     def __init__ (self, x : np.ndarray, y: np.ndarray):
 
         self._x_org = x                         # copy as numpy is used in geometry 
@@ -1127,10 +1549,7 @@ class Geometry ():
         self._x = None   
         self._y = None
 
-        self._thickness : Side_Airfoil = None  # thickness distribution
-        self._camber    : Side_Airfoil = None  # camber line
-
-        self._curvature : Curvature_of_Spline     = None  # curvature object
+        self._cache = Derived_Cache (self.dependencies)     # lazy cache of derived properties 
 
 
     def __repr__(self) -> str:
@@ -1150,6 +1569,11 @@ class Geometry ():
     def xy (self):
         return self.x, self.y
 
+    @property
+    def cache_info (self) -> tuple: 
+        """ hits and misses of the derived properties cache"""
+        return self._cache.hits, self._cache.misses
+
     @property
     def iLe (self) -> int: 
         """ the index of leading edge in x coordinate array"""
@@ -1210,6 +1634,9 @@ class Geometry ():
     @property 
     def panelAngle_le (self): 
         """returns the panel angle of the 2 panels at leading edge - should be less 170"""
+        return self._cache.get ('panel_angle_le', self._eval_panelAngle_le)
+
+    def _eval_panelAngle_le (self) -> float: 
 
         # panang1 = atan((zt(2)-zt(1))/(xt(2)-xt(1))) *                &
         #           180.d0/acos(-1.d0)
@@ -1241,19 +1668,22 @@ class Geometry ():
     def panelAngle_min (self): 
         """ returns the min angle between two panels - something between 160-180° - 
         and the point index of the min point"""
-        return np.min(panel_angles(self.x,self.y)),  np.argmin(panel_angles(self.x,self.y))       
+        angles = self._cache.get ('panel_angles', lambda: panel_angles (self.x, self.y))
+        return np.min(angles),  np.argmin(angles)       
 
 
     @property
     def upper(self) -> 'Side_Airfoil': 
         """the upper surface as a line object - where x 0..1"""
-        return self.sideDefaultClass (np.flip (self.x [0: self.iLe + 1]),
-                              np.flip (self.y [0: self.iLe + 1]), name=UPPER)
+        return self._cache.get ('upper', lambda: 
+                    self.sideDefaultClass (np.flip (self.x [0: self.iLe + 1]),
+                                           np.flip (self.y [0: self.iLe + 1]), name=UPPER))
             
     @property
     def lower(self) -> 'Side_Airfoil': 
         """the lower surface as a line object - where x 0..1"""
-        return self.sideDefaultClass (self.x[self.iLe:], self.y[self.iLe:], name=LOWER)
+        return self._cache.get ('lower', lambda: 
+                    self.sideDefaultClass (self.x[self.iLe:], self.y[self.iLe:], name=LOWER))
 
     def side(self, sideName) -> 'Side_Airfoil': 
         """side with 'side_name' as a line object - where x 0..1"""
@@ -1268,16 +1698,12 @@ class Geometry ():
     @property
     def camber (self) -> 'Side_Airfoil': 
         """ return the camber line """
-        if self._camber is None: 
-            self._eval_thickness_camber()
-        return self._camber
+        return self._cache.get ('thickness_camber', self._eval_thickness_camber)[1]
 
     @property
     def thickness (self) -> 'Side_Airfoil': 
         """ the thickness distribution as a line object """
-        if self._thickness is None: 
-            self._eval_thickness_camber()
-        return self._thickness
+        return self._cache.get ('thickness_camber', self._eval_thickness_camber)[0]
 
     @property
     def maxThick (self): 
@@ -1302,9 +1728,7 @@ class Geometry ():
     @property
     def curvature (self) -> Curvature_of_xy: 
         " return the curvature object"
-        if self._curvature is None: 
-            self._curvature = Curvature_of_xy (self.x, self.y)  
-        return self._curvature 
+        return self._cache.get ('curvature', lambda: Curvature_of_xy (self.x, self.y))
 
 
 
@@ -1349,7 +1773,7 @@ class Geometry ():
             else:
                 y[i] = y[i] - 0.5 * dgap * x[i] * tfac # * gap   
 
-        self._x, self._y = x, y 
+        self._set_xy (x, y) 
 
 
 
@@ -1432,9 +1856,9 @@ class Geometry ():
         cosa  = np.cos (-angle) 
         sina  = np.sin (-angle) 
 
-        for i in range (len(xn)):
-            xn[i] = xn[i] * cosa - yn[i] * sina
-            yn[i] = xn[i] * sina + yn[i] * cosa
+        rotation = np.array ([[cosa, -sina],
+                              [sina,  cosa]])
+        xn, yn = rotation @ np.vstack ((xn, yn))
          
         # Scale airfoil so that it has a length of 1 
         #  - there are mal formed airfoils with different TE on upper and lower
@@ -1443,11 +1867,8 @@ class Geometry ():
         scale_lower = 1.0 / xn[-1]
 
         ile = np.argmin (xn)
-        for i in range (len(xn)):
-            if i <= ile:
-               xn[i] = xn[i] * scale_upper
-            else: 
-               xn[i] = xn[i] * scale_lower
+        is_upper = np.arange (len(xn)) <= ile
+        xn = xn * np.where (is_upper, scale_upper, scale_lower)
 
         # due to numerical issues ensure 0 is 0.0 ..
         xn[ile] = 0.0 
@@ -1455,11 +1876,8 @@ class Geometry ():
         xn[0]   = 1.0 
         xn[-1]  = 1.0
 
-        self._x = np.round (xn, 10)
-        self._y = np.round (yn, 10) 
-        # re-init 
-        self._reset_lines()                     # the child lines like thickness
-        self._reset_spline()                    # the spline (if exists)
+        # re-init - derived properties like thickness or spline will be re-evaluated 
+        self._set_xy (np.round (xn, 10), np.round (yn, 10))
 
         return True
 
@@ -1519,8 +1937,8 @@ class Geometry ():
         lower_y = (1 - blendBy) * lower1.y + blendBy * lower2.y
         
         # rebuild x,y coordinates 
-        self._x = np.concatenate ((np.flip(upper_x), lower_x[1:]))
-        self._y = np.concatenate ((np.flip(upper_y), lower_y[1:]))
+        self._set_xy (np.concatenate ((np.flip(upper_x), lower_x[1:])),
+                      np.concatenate ((np.flip(upper_y), lower_y[1:])))
 
 
     # ------------------ private ---------------------------
@@ -1528,7 +1946,7 @@ class Geometry ():
 
     def _eval_thickness_camber (self): 
         """
-        evalutes self thickness and camber distribution as Side_Airfoil objects
+        evalutes and returns self thickness and camber distribution as Side_Airfoil objects
         with a x-distribution of the upper side.
         
         Using linear interpolation - shall be overloaded 
@@ -1554,19 +1972,19 @@ class Geometry ():
 
         # thickness and camber can now easily calculated 
 
-        self._thickness = self.sideDefaultClass (upper.x, (upper.y - lower.y), 
+        thickness = self.sideDefaultClass (upper.x, (upper.y - lower.y), 
                                             name='Thickness distribution')
-        self._camber    = self.sideDefaultClass (upper.x, (upper.y + lower.y) / 2.0, 
+        camber    = self.sideDefaultClass (upper.x, (upper.y + lower.y) / 2.0, 
                                             name='Camber line')
 
         # for symmetric airfoil with unclean data set camber line to 0 
-        if np.max(self._camber._y) < 0.00001: 
-            self._camber._y = np.zeros (len(self._camber._y))
+        if np.max(camber._y) < 0.00001: 
+            camber._y = np.zeros (len(camber._y))
 
-        if not self.thickness.isNormalized or not self.camber.isNormalized:
+        if not thickness.isNormalized or not camber.isNormalized:
             raise ValueError ("eval thickness: Thickness or Camber are not normalized")
 
-        return 
+        return thickness, camber 
 
 
     def _rebuildFromThicknessCamber(self):
@@ -1581,29 +1999,29 @@ class Geometry ():
 
         # easy sum of thickness and camber to get new airfoil 
 
-        x_upper = self.thickness.x
-        y_upper = self.camber.y + self.thickness.y / 2.0 
-        x_lower = self.thickness.x
-        y_lower = self.camber.y - self.thickness.y / 2.0
+        thickness, camber = self.thickness, self.camber
 
-        self._x = np.concatenate ((np.flip(x_upper), x_lower[1:]))
-        self._y = np.concatenate ((np.flip(y_upper), y_lower[1:]))
+        x_upper = thickness.x
+        y_upper = camber.y + thickness.y / 2.0 
+        x_lower = thickness.x
+        y_lower = camber.y - thickness.y / 2.0
 
-        # rseet only curvature 
-        self._curvature = None
+        self._set_xy (np.concatenate ((np.flip(x_upper), x_lower[1:])),
+                      np.concatenate ((np.flip(y_upper), y_lower[1:])))
 
+        # thickness and camber are the master - they remain valid 
+        self._cache.set ('thickness_camber', (thickness, camber))
 
 
-    def _reset_lines (self):
-        """ reinit the dependand lines of self""" 
-        self._thickness  = None                 # thickness distribution
-        self._camber     = None                 # camber line
-        self._curvature  = None                 # curvature 
+    def _set_xy (self, x, y):
+        """ set new coordinates x,y - derived properties will be re-evaluated""" 
+        self._x = x
+        self._y = y
+        self._cache.changed ('xy')
 
-    def _reset_spline (self):
-        """ reinit self spline data if x,y has changed""" 
-        # to be overloaded
-        pass
+    def _reset_lines (self):
+        """ coordinates were changed from outside - reinit the derived properties of self""" 
+        self._cache.changed ('xy')
 
 
 
@@ -1619,27 +2037,34 @@ class Geometry_Splined (Geometry):
 
     sideDefaultClass = Side_Airfoil_Spline
 
+    # derived properties and the inputs they depend on 
+    dependencies = {**Geometry.dependencies, 
+                    'spline'            : ['xy'],
+                    'uLe'               : ['spline'],
+                    'le_residual'       : ['uLe'],
+                    'le_real'           : ['uLe'],
+                    'curvature'         : ['spline']}
+
     def __init__ (self, x,y):
         super().__init__(x,y)        
 
 
-        self._spline : Spline2D          = None   # 2 D cubic spline representation of self
-        self._uLe = None                          # leading edge  - u value 
-
-
     @property 
     def spline (self) -> Spline2D:
         """ spline representation of self """
+        return self._cache.get ('spline', self._new_spline)
 
-        if self._spline is None: 
-            self._spline = Spline2D (self.x, self.y)
-            logging.debug (f"{self} New Spline ")
-        return self._spline
+    def _new_spline (self) -> Spline2D:
+        logging.debug (f"{self} New Spline ")
+        return Spline2D (self.x, self.y)
 
     @property
     def le_real (self): 
         """ le calculated based on spline """
         #overloading
+        return self._cache.get ('le_real', self._eval_le_real)
+
+    def _eval_le_real (self) -> tuple: 
         xLe, yLe = self.xyFn (self.uLe)   
         # + 0.0 ensures not to have -0.0 
         return round(xLe,7) + 0.0, round(yLe,7) + 0.0 
@@ -1647,9 +2072,12 @@ class Geometry_Splined (Geometry):
     @property
     def uLe (self): 
         """ u (arc) value of the leading edge """
-        if self._uLe is None: 
-            self._uLe = self._le_find()
-        return self._uLe
+        return self._cache.get ('uLe', self._le_find)
+
+    @property
+    def le_residual (self) -> float: 
+        """ residual of the scalar product tangent and te vector at leading edge - 0.0 is exact"""
+        return self._cache.get ('le_residual', lambda: abs (self.scalarProductFn (self.uLe)))
 
     @property
     def _isLe_closeTo_le_real (self): 
@@ -1675,9 +2103,7 @@ class Geometry_Splined (Geometry):
     @property
     def curvature (self) -> Curvature_of_Spline: 
         " return the curvature object"
-        if self._curvature is None: 
-            self._curvature = Curvature_of_Spline (self.spline)  
-        return self._curvature 
+        return self._cache.get ('curvature', lambda: Curvature_of_Spline (self.spline))
 
     @property
     def angle (self): 
@@ -1694,23 +2120,11 @@ class Geometry_Splined (Geometry):
         
         Using spline interpolation  
         """
-        # evaluate the corresponding y-values on lower side 
-        upper_y = np.zeros (len(new_x))
- 
-        for i, x in enumerate (new_x):
- 
-            # nelder mead find min boundaries 
-            uStart = 0.0
-            uEnd   = self.uLe 
-            uGuess = interpolate (0.0, 1.0, uStart, uEnd, x)   # best guess as start value
-
-            u = findMin (lambda xlow: abs(self.spline.evalx(xlow) - x), uGuess, 
-                        bounds=(uStart, uEnd), no_improve_thr=1e-8) 
+        # evaluate the corresponding u-values on upper side - x(u) is monotone
+        u = self.spline.eval_u_on_x (new_x, bounds=(0.0, self.uLe))
 
-            # with the new u-value we get the y value on lower side 
-            upper_y[i] = self.spline.evaly (u)
-
-        upper_y = np.round(upper_y, 10)
+        # with the new u-values we get the y values on upper side 
+        upper_y = np.round(self.spline.evaly (u), 10)
 
         return self.sideDefaultClass (new_x, upper_y, name=UPPER)
 
@@ -1722,28 +2136,15 @@ class Geometry_Splined (Geometry):
         
         Using spline interpolation  
         """
-        # evaluate the corresponding y-values on lower side 
-        lower_y = np.zeros (len(new_x))
- 
-        for i, x in enumerate (new_x):
+        # evaluate the corresponding u-values on lower side - x(u) is monotone
+        u = self.spline.eval_u_on_x (new_x, bounds=(self.uLe, 1.0))
 
-            # first and last point from current lower to avoid numerical issues 
-            if i == 0: 
-                lower_y[i] = self.lower.y[0]
-            elif i == (len(new_x) -1):
-                lower_y[i] = self.lower.y[-1]
-            else:
- 
-                # nelder mead find min boundaries 
-                uStart = self.uLe
-                uEnd   = 1.0 
-                uGuess = interpolate (new_x[0], new_x[-1], uStart, 1.0, x)   # best guess as start value
-
-                u = findMin (lambda xlow: abs(self.spline.evalx(xlow) - x), uGuess, 
-                            bounds=(uStart, uEnd), no_improve_thr=1e-8) 
+        # with the new u-values we get the y values on lower side 
+        lower_y = self.spline.evaly (u)
 
-                # with the new u-value we get the y value on lower side 
-                lower_y[i] = self.spline.evaly (u)
+        # first and last point from current lower to avoid numerical issues 
+        lower_y[0]  = self.lower.y[0]
+        lower_y[-1] = self.lower.y[-1]
 
         lower_y = np.round(lower_y, 10)
 
@@ -1796,6 +2197,21 @@ class Geometry_Splined (Geometry):
         dot = dx * dxTe + dy * dyTe
 
         return dot 
+
+
+    def _scalarProductFn_der1 (self,u): 
+        """ return the derivative d/du of scalarProductFn"""
+
+        # exact trailing edge point 
+        xTe = (self.x[0] + self.x[-1]) / 2
+        yTe = (self.y[0] + self.y[-1]) / 2
+
+        x,y      = self.xyFn(u) 
+        dx, dy   = self.spline.eval(u, der=1)               # derivatives are d/ds 
+        ddx, ddy = self.spline.eval(u, der=2) 
+        ds_du    = self.spline.s[-1] - self.spline.s[0]
+
+        return (dx * dx + dy * dy + ddx * (x - xTe) + ddy * (y - yTe)) * ds_du
         
 
     def repanel (self,  nPanels : int = None, 
@@ -1846,22 +2262,18 @@ class Geometry_Splined (Geometry):
         # new calculated x,y coordinates  
         x, y = self.xyFn(u_new)
 
-        self._x = np.round (x, 10)
-        self._y = np.round (y, 10)
-
-        # reset the child lines, keep current spline as it was the master
-        self._reset_lines()
+        # keep current spline as it was the master
+        spline, uLe = self.spline, self.uLe
 
+        self._set_xy (np.round (x, 10), np.round (y, 10))
 
+        self._cache.set ('spline', spline)
+        self._cache.set ('uLe', uLe)
 
 
-    # ------------------ private ---------------------------
 
 
-    def _reset_spline (self):
-        """ reinit self spline data if x,y has changed""" 
-        self._spline     = None
-        self._uLe        = None                  # u value at LE 
+    # ------------------ private ---------------------------
 
 
     def _rebuildFromThicknessCamber(self):
@@ -1873,11 +2285,7 @@ class Geometry_Splined (Geometry):
         nPan_upper = self.iLe
         nPan_lower = self.nPanels - nPan_upper
 
-        super()._rebuildFromThicknessCamber()
-
-        # reset spline so it will be rebuild out of new coordinates
-
-        self._reset_spline ()
+        super()._rebuildFromThicknessCamber()               # spline will be rebuild out of new coordinates 
 
         # when panel number changed with rebuild do repanel to get original number again 
 
@@ -1895,13 +2303,31 @@ class Geometry_Splined (Geometry):
     def _le_find (self):
         """ returns u (arc) value of leading edge based on scalar product tangent and te vector = 0"""
 
+        u = self.spline.u
         iLeGuess = np.argmin (self.x)          # first guess for Le point 
+
         # exact determination of root  = scalar product = 0.0 
-        try: 
-            uLe = findRoot (self.scalarProductFn, self.spline.u[iLeGuess-1] , bounds=(0.4, 0.6)) 
-        except: 
-            uLe = self.spline.u [iLeGuess]
-            print ("Warn: Le not found - taking geometric Le")
+        #   the bracket is the knot segment having a sign change of the scalar product 
+        #   next to the geometric le - at least the range u = 0.4..0.6 is scanned 
+        #   then Newton iteration with analytic derivative of the spline segments 
+        dot       = self.scalarProductFn (u)
+        iChange   = np.flatnonzero (np.sign (dot[:-1]) * np.sign (dot[1:]) <= 0.0)
+        uMid      = (u[iChange] + u[iChange+1]) / 2
+        inRange   = ((uMid >= 0.4) & (uMid <= 0.6)) | (np.abs (iChange - iLeGuess) <= 2)
+        iChange   = iChange [inRange]
+
+        if len(iChange): 
+            i = iChange [np.argmin (np.abs (iChange - iLeGuess))]
+            uStart, uEnd = u[i], u[i+1]
+            x0 = min (max (u[iLeGuess], uStart), uEnd)
+            uLe, niter = newton_bracketed (self.scalarProductFn, self._scalarProductFn_der1,
+                                           [uStart], [uEnd], x0=[x0], epsilon=1e-13)
+            uLe = float (uLe[0])
+        else: 
+            uLe, niter = u [iLeGuess], 0
+            ErrorMsg (f"{self} Le not found - taking geometric Le")
+
+        logging.debug (f"{self} le found after {niter} iterations - residual {abs (self.scalarProductFn (uLe)):.1e}")
 
         return uLe
 
@@ -1922,27 +2348,19 @@ class Geometry_Splined (Geometry):
         """
 
         iLe = np.argmin (self.x)
+        xIn = np.asarray (xIn, dtype=float)
 
         if side == LOWER: 
             uStart = self.spline.u[iLe] 
             uEnd   = self.spline.u[-1]  
-            uGuess = 0.75          
         elif side == UPPER:
             uStart = self.spline.u[0] 
-            # uEnd   = self.spline.u[iLe-1]   
             uEnd   = self.spline.u[iLe]   
-            uGuess = 0.25         
         else:
             raise ValueError ("'%s' not supported" % side)
 
-        ux = np.zeros (len(xIn))
-        for i, xi in enumerate (xIn): 
-
-            # find matching u to x-value 
-            #   no_improve_thr= 10e-6 is sufficient to get average 10e-10  tolerance
-            ux[i] = findMin (lambda u: abs(self.spline.evalx(u) - xi), uGuess, bounds=(uStart, uEnd), 
-                             no_improve_thr= 10e-6) 
-            uGuess = ux[i]
+        # find matching u to x-values - one spline inverse for all xIn 
+        ux = self.spline.eval_u_on_x (xIn, bounds=(uStart, uEnd))
 
         # get y coordinate from u          
         yOut = self.spline.evaly (ux)
@@ -2063,14 +2481,13 @@ class Geometry_Bezier (Geometry):
         #overloaded to directly manipulate Bezier
         self.upper.set_te_gap (  newGap / 2)
         self.lower.set_te_gap (- newGap / 2)
+        self._reset_lines()
 
 
     @property
     def curvature (self) -> Curvature_of_Bezier: 
         " return the curvature object"
-        if self._curvature is None: 
-            self._curvature = Curvature_of_Bezier (self.upper, self.lower)  
-        return self._curvature 
+        return self._cache.get ('curvature', lambda: Curvature_of_Bezier (self.upper, self.lower))
 
 
 
@@ -2111,10 +2528,7 @@ class Geometry_Bezier (Geometry):
         Using bezier interpolation  
         """
         # evaluate the corresponding y-values on upper side 
-        upper_y = np.zeros (len(new_x))
- 
-        for i, x in enumerate (new_x):
-            upper_y[i] = self.upper.bezier.eval_y_on_x (x, fast=True)  
+        upper_y = self.upper.bezier.eval_y_on_x (new_x, fast=True)  
 
         upper_y = np.round(upper_y, 10)
 
@@ -2127,18 +2541,12 @@ class Geometry_Bezier (Geometry):
         Using bezier interpolation  
         """
         # evaluate the corresponding y-values on lower side 
-        lower_y = np.zeros (len(new_x))
- 
         # !! bezier must be evaluated with u to have x,y !! 
-        for i, x in enumerate (new_x):
+        lower_y = self.lower.bezier.eval_y_on_x (new_x, fast=True)  
 
-            # first and last point from current lower to avoid numerical issues 
-            if i == 0: 
-                lower_y[i] = self.lower.y[0]
-            elif i == (len(new_x) -1):
-                lower_y[i] = self.lower.y[-1]
-            else:
-                lower_y[i] = self.lower.bezier.eval_y_on_x (x, fast=True)  
+        # first and last point from current lower to avoid numerical issues 
+        lower_y[0]  = self.lower.y[0]
+        lower_y[-1] = self.lower.y[-1]
 
         lower_y = np.round(lower_y, 10)
 
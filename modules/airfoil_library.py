@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+
+Index of an airfoil library - a directory tree of .dat airfoil files
+
+    - the geometric metrics (thickness, camber, te gap, le radius) of each airfoil
+      are evaluated once with the geometry classes - new airfoils in parallel
+    - the metrics are stored in a compact npz index file in the library directory
+    - an entry is re-evaluated only if modification time or size of its file changed
+    - airfoils can be filtered by ranges of the metrics
+
+    Usage:  python airfoil_library.py <airfoil_dir> [-t <min> <max>] [-c <min> <max>] ...
+
+"""
+
+import os
+import io
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from common_utils       import *
+from airfoil            import Airfoil, GEO_BASIC, COORD_CACHE_DIR
+
+
+INDEX_FILE  = 'airfoil_index.npz'                       # index file in cache directory of library
+
+# metrics of an airfoil in the index - all values in % of chord
+
+THICKNESS   = 'thickness'
+THICKNESS_X = 'thicknessX'
+CAMBER      = 'camber'
+CAMBER_X    = 'camberX'
+TE_GAP      = 'teGap'
+LE_RADIUS   = 'leRadius'
+
+METRICS     = [THICKNESS, THICKNESS_X, CAMBER, CAMBER_X, TE_GAP, LE_RADIUS]
+
+# minimum number of airfoils to evaluate for using a process pool
+
+MIN_PARALLEL = 8
+
+
+
+def airfoil_metrics (pathFileName : str) -> tuple:
+    """
+    Loads and normalizes the airfoil pathFileName and evaluates its metrics
+
+    Returns:
+        name: of the airfoil
+        metrics: list of the values of METRICS - None if the airfoil couldn't be evaluated
+    """
+
+    try:
+        airfoil = Airfoil (pathFileName=pathFileName, geometry=GEO_BASIC)
+        airfoil.load()
+        airfoil.normalize()
+
+        le_curv  = airfoil.geo.curvature.max_at_le
+        leRadius = 100.0 / le_curv if le_curv > 0.0 else 0.0
+
+        metrics = [airfoil.maxThickness, airfoil.maxThicknessX,
+                   airfoil.maxCamber,    airfoil.maxCamberX,
+                   airfoil.teGap_perc,   leRadius]
+    except Exception as e:
+        WarningMsg (f"Airfoil '{pathFileName}' couldn't be evaluated: {e}")
+        return os.path.splitext(os.path.basename(pathFileName))[0], None
+
+    return airfoil.name, metrics
+
+
+
+class Airfoil_Library:
+    """
+    Index of the .dat airfoils in a directory and its sub directories
+
+    The metrics of the airfoils are held in a numpy array (one row per airfoil)
+    and stored in the npz index file of the library
+    """
+
+    def __init__ (self, libraryDir : str):
+        """
+        Args:
+            libraryDir: root directory of the airfoil library
+        """
+
+        self.libraryDir = os.path.normpath (libraryDir)
+        self.indexFile  = os.path.join (self.libraryDir, COORD_CACHE_DIR, INDEX_FILE)
+
+        self._files     = np.zeros (0, dtype=str)                # file paths relative to libraryDir
+        self._names     = np.zeros (0, dtype=str)                # airfoil names
+        self._stats     = np.zeros ((0,2), dtype=np.int64)       # mtime_ns, size of file
+        self._metrics   = np.zeros ((0,len(METRICS)))            # nan if airfoil isn't valid
+
+        self._load_index ()
+
+
+    @property
+    def nAirfoils (self) -> int:
+        """ number of airfoils in the index"""
+        return len (self._files)
+
+    @property
+    def names (self) -> list:
+        """ names of the airfoils in the index"""
+        return list (self._names)
+
+
+    def pathFileNames (self) -> list:
+        """ absolute path of the airfoils in the index"""
+        return [os.path.join (self.libraryDir, f) for f in self._files]
+
+
+    def metrics_of (self, pathFileName : str) -> dict:
+        """ dict of the metrics of the airfoil pathFileName - None if not in index"""
+
+        relPath = os.path.relpath (os.path.abspath (pathFileName), self.libraryDir)
+        i = np.flatnonzero (self._files == relPath)
+        if not len(i): return None
+        return dict (zip (METRICS, self._metrics[i[0]].tolist()))
+
+
+    def limits (self, metric : str) -> tuple:
+        """ min and max value of metric of the valid airfoils in the index"""
+
+        values = self._metrics [:, METRICS.index (metric)]
+        values = values [~np.isnan (values)]
+        if not len(values): return 0.0, 0.0
+        return float(np.min (values)), float(np.max (values))
+
+
+    def select (self, **ranges) -> list:
+        """
+        Filters the airfoils of the index by ranges of metrics
+
+        Args:
+            ranges: metric=(min, max) - min or max may be None
+
+        Returns:
+            list of absolute pathFileNames of the matching airfoils sorted by name
+        """
+
+        isValid = ~np.any (np.isnan (self._metrics), axis=1)
+        for metric, (vmin, vmax) in ranges.items():
+            values = self._metrics [:, METRICS.index (metric)]
+            if vmin is not None: isValid &= values >= vmin
+            if vmax is not None: isValid &= values <= vmax
+
+        iSelected = np.flatnonzero (isValid)
+        iSelected = iSelected [np.argsort (np.char.lower (self._names [iSelected]), kind='stable')]
+        return [os.path.join (self.libraryDir, f) for f in self._files [iSelected]]
+
+
+    def update (self, max_workers : int = None) -> int:
+        """
+        Scans the library directory and evaluates the metrics of new or modified airfoils
+        in parallel. Removed airfoils are dropped. A changed index is written to file.
+
+        Returns:
+            number of evaluated airfoils
+        """
+
+        files, stats = self._scan ()
+
+        # which files are unchanged since the index was written
+
+        old_index  = {f: i for i, f in enumerate (self._files)}
+        iOld       = np.array ([old_index.get (f, -1) for f in files], dtype=int)
+        isUptodate = iOld >= 0
+        isUptodate [isUptodate] = np.all (self._stats [iOld [isUptodate]] == stats [isUptodate], axis=1)
+
+        names   = np.empty (len(files), dtype=object)
+        metrics = np.full  ((len(files), len(METRICS)), np.nan)
+        names   [isUptodate] = self._names   [iOld [isUptodate]]
+        metrics [isUptodate] = self._metrics [iOld [isUptodate]]
+
+        # evaluate the others - in parallel if there are some more
+
+        iNew      = np.flatnonzero (~isUptodate)
+        pathFiles = [os.path.join (self.libraryDir, files[i]) for i in iNew]
+
+        if len(pathFiles) >= MIN_PARALLEL:
+            with ProcessPoolExecutor (max_workers=max_workers) as executor:
+                chunksize = max (1, len(pathFiles) // (4 * (max_workers or os.cpu_count() or 1)))
+                results   = list (executor.map (airfoil_metrics, pathFiles, chunksize=chunksize))
+        else:
+            results = [airfoil_metrics (pathFile) for pathFile in pathFiles]
+
+        for i, (name, values) in zip (iNew, results):
+            names [i] = name
+            if values is not None:
+                metrics [i] = values
+
+        changed = len(iNew) > 0 or len(files) != self.nAirfoils
+
+        self._files   = np.asarray (files, dtype=str)
+        self._names   = np.asarray (names.tolist(), dtype=str)
+        self._stats   = stats
+        self._metrics = metrics
+
+        if changed:
+            self._save_index ()
+
+        return len(iNew)
+
+
+    def _scan (self) -> tuple:
+        """ returns the relative paths and the stats (mtime, size) of all .dat files"""
+
+        files = []
+        stats = []
+        for dirPath, dirNames, fileNames in os.walk (self.libraryDir):
+            dirNames[:] = sorted (d for d in dirNames if not d.startswith ('__'))   # skip cache dirs
+            for fileName in sorted (fileNames):
+                if fileName.lower().endswith ('.dat'):
+                    pathFileName = os.path.join (dirPath, fileName)
+                    stat = os.stat (pathFileName)
+                    files.append (os.path.relpath (pathFileName, self.libraryDir))
+                    stats.append ((stat.st_mtime_ns, stat.st_size))
+
+        return files, np.asarray (stats, dtype=np.int64).reshape (-1, 2)
+
+
+    def _load_index (self):
+        """ reads the index file if it exists"""
+
+        if not os.path.isfile (self.indexFile): return
+
+        try:
+            with np.load (self.indexFile, allow_pickle=False) as index:
+                files, names   = index['files'], index['names']
+                stats, metrics = index['stats'], index['metrics']
+        except (OSError, ValueError, KeyError) as e:
+            WarningMsg (f"Airfoil index '{self.indexFile}' couldn't be read: {e}")
+            return
+
+        if metrics.shape != (len(files), len(METRICS)): return          # other version of index
+
+        self._files, self._names, self._stats, self._metrics = files, names, stats, metrics
+
+
+    def _save_index (self):
+        """ writes the index file - atomic by renaming a temp file"""
+
+        os.makedirs (os.path.dirname (self.indexFile), exist_ok=True)
+        buffer = io.BytesIO ()
+        np.savez (buffer, files=self._files, names=self._names,
+                          stats=self._stats, metrics=self._metrics)
+        write_atomic (self.indexFile, buffer.getvalue())
+
+
+
+#--------------------------------
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(prog='airfoil_library',
+                                     description='Index and filter a library of .dat airfoils')
+    parser.add_argument("airfoil_dir", help="Root directory of the airfoil library")
+    parser.add_argument("-t", "--thickness", type=float, nargs=2, default=(None, None), help="Range of max thickness in %%")
+    parser.add_argument("-c", "--camber",    type=float, nargs=2, default=(None, None), help="Range of max camber in %%")
+    parser.add_argument("-g", "--tegap",     type=float, nargs=2, default=(None, None), help="Range of te gap in %%")
+    parser.add_argument("-r", "--leradius",  type=float, nargs=2, default=(None, None), help="Range of le radius in %%")
+    args = parser.parse_args()
+
+    if not os.path.isdir (args.airfoil_dir):
+        ErrorMsg ("Airfoil directory '%s' doesn't exist" % args.airfoil_dir)
+        sys.exit(1)
+
+    library = Airfoil_Library (args.airfoil_dir)
+    nEval   = library.update ()
+    NoteMsg (f"{library.nAirfoils} airfoils in index - {nEval} evaluated")
+
+    for pathFileName in library.select (thickness=args.thickness, camber=args.camber,
+                                        teGap=args.tegap, leRadius=args.leradius):
+        metrics = library.metrics_of (pathFileName)
+        print ("%-40s" % os.path.relpath (pathFileName, library.libraryDir) +
+               "".join ("  %s %6.2f" % (m, metrics[m]) for m in METRICS))
@@ -9,11 +9,18 @@
 import pytest
 
 import numpy as np 
+from pathlib import Path
 
 from airfoil import Airfoil, Airfoil_Bezier, GEO_BASIC, GEO_SPLINE
 from airfoil_examples import Root_Example, Tip_Example
 from airfoil_geometry import Geometry, Geometry_Splined, Geometry_Bezier
 from airfoil_geometry import Curvature_of_xy, Curvature_of_Spline, Curvature_of_Bezier
+from airfoil_geometry import Match_Side_Bezier, Match_Cache, LEAST_SQUARES, NELDER_MEAD
+from airfoil_geometry import UPPER, LOWER
+from math_util import panel_angles, panel_angles_batch
+from math_util import bisection_array, newton_bracketed, brent_min_array
+from spline import Spline1D, solve_tridiagonal, solve_banded, TRIDIAGONAL_LAPACK_MIN
+from wing_model import Wing, Planform_DXF, Planform_Pure_Elliptical, Planform_Paneled
 
 
 class Test_Airfoil:
@@ -34,7 +41,7 @@ class Test_Airfoil:
         # thickness, camber 
 
         assert geo.thickness.maximum == (0.2903642, 0.0764996)
-        assert geo.camber.maximum    == (0.4152061, 0.0170131)
+        assert geo.camber.maximum    == (0.4152062, 0.0170131)
 
         geo.set_maxThick  (0.08)
         assert round(geo.maxThick,4) == 0.08
@@ -82,7 +89,7 @@ class Test_Airfoil:
         # thickness, camber 
 
         assert geo.thickness.maximum == (0.2903379, 0.076502)
-        assert geo.camber.maximum    == (0.4153376, 0.0170051)
+        assert geo.camber.maximum    == (0.4153411, 0.0170051)
 
         geo.set_maxThick  (0.08)
         assert round(geo.maxThick,4) == 0.08
@@ -123,6 +130,39 @@ class Test_Airfoil:
         assert round(curv.lower.maximum[1],0) == 372
         assert round(np.min (np.abs(curv.lower.y[-10:])),3) == 0.032
 
+        # cache of derived properties
+
+        geo : Geometry_Splined = airfoil.geo
+        spline = geo.spline
+        thickness = geo.thickness
+        assert geo.spline is spline and geo.thickness is thickness
+        hits, misses = geo.cache_info
+
+        geo.set_teGap (0.01)
+        assert geo.spline is not spline and geo.thickness is not thickness
+        assert geo.cache_info[1] > misses
+
+
+    def test_normalize_rotated (self):
+
+        org = Root_Example(geometry = GEO_SPLINE)
+        org.normalize()
+
+        # rotate and shift airfoil - normalize should find le and bring it back
+
+        for angle in [8, -8, 15]:
+            a = np.radians (angle)
+            x = org.x * np.cos(a) - org.y * np.sin(a) + 0.1
+            y = org.x * np.sin(a) + org.y * np.cos(a) - 0.05
+            airfoil = Airfoil (x=x, y=y, name="<rotated>", geometry = GEO_SPLINE)
+
+            assert not airfoil.isNormalized
+            assert airfoil.normalize()
+            assert airfoil.isNormalized
+            assert airfoil.geo.le == (0.0, 0.0)
+            assert abs(airfoil.geo.le_real[1]) < 1e-5
+            assert round(airfoil.maxThickness,2) == round(org.maxThickness,2)
+
 
 
     def test_airfoil_geo_functions (self):
@@ -193,6 +233,7 @@ class Test_Airfoil:
 
         from pathlib import Path
         import shutil
+        import warnings
         import numpy as np 
 
 
@@ -226,6 +267,18 @@ class Test_Airfoil:
         new_airfoil = Airfoil (pathFileName=newPathFileName)
         new_airfoil.load()
 
+        # header only file - no coordinates, no numpy warning 
+
+        emptyPathFileName = str(p_tmp / 'empty.dat')
+        with open(emptyPathFileName, 'w') as f:
+            f.write ("empty\n\n")
+        empty_airfoil = Airfoil (pathFileName=emptyPathFileName)
+        with warnings.catch_warnings():
+            warnings.simplefilter ("error")
+            empty_airfoil.load()
+        assert empty_airfoil.name == "empty"
+        assert len(empty_airfoil.x) == 0
+
 
         shutil.rmtree(str(p_tmp))
 
@@ -276,9 +329,648 @@ class Test_Airfoil_Bezier:
 
         te_curv = curv.lower.y[-10:]
         assert round(np.min (np.abs(te_curv)),3) == 0.062
+
+
+    def test_match_bezier (self): 
+
+        target = Root_Example(geometry = GEO_SPLINE)
+        target.normalize()
+        geo_target = target.geo
+
+        for method in [LEAST_SQUARES, NELDER_MEAD]:
+
+            airfoil = Airfoil_Bezier()
+            side = airfoil.geo.upper
+            side.set_controlPoints_closeTo (geo_target.upper, 6)
+
+            matcher = Match_Side_Bezier (side, geo_target.upper, 
+                                         target_le_curv=geo_target.curvature.max_at_le,
+                                         max_te_curv   =geo_target.curvature.at_upper_te,
+                                         method=method)
+            matcher.run()
+
+            assert matcher.method_used == method
+            assert not matcher.max_reached
+            assert matcher.norm2 < 0.002
+
+
+    def test_match_bezier_quality (self):
+
+        from pathlib import Path
+
+        # JX-GS-04 upper side was matched with a flipped le curvature before
+        # JX-RS upper side - least squares runs into a local minimum, nelder mead has to fix it 
+
+        examples = Path(__file__).parent.parent / 'examples'
+
+        for pathFileName, sideName in [(examples / 'VJX' / 'JX-GS-04.dat', UPPER), 
+                                       (examples / 'VJX' / 'JX-GS-04.dat', LOWER),
+                                       (examples / 'Amokka-JX' / 'JX-RS.dat', UPPER)]:
+
+            target = Airfoil (pathFileName=str(pathFileName))
+            target.load()
+            target.normalize()
+            geo_target = target.geo
+
+            airfoil = Airfoil_Bezier()
+            side        = airfoil.geo.upper if sideName == UPPER else airfoil.geo.lower
+            target_side = geo_target.upper  if sideName == UPPER else geo_target.lower
+            target_te   = geo_target.curvature.at_upper_te if sideName == UPPER else geo_target.curvature.at_lower_te
+            side.set_controlPoints_closeTo (target_side, 6)
+
+            le_curv = geo_target.curvature.max_at_le
+            matcher = Match_Side_Bezier (side, target_side, target_le_curv=le_curv, max_te_curv=target_te)
+            matcher.run()
+
+            assert matcher.norm2 < matcher.norm2_good
+
+            # upper side bends clockwise at le - negative curvature
+            bezier_le_curv = side.bezier.curvature(0.0)
+            assert np.sign (bezier_le_curv) == (-1 if sideName == UPPER else 1)
+            assert abs (abs(bezier_le_curv) - le_curv) / le_curv < 0.05
+
+
+    def test_match_bezier_cache (self, tmp_path): 
+
+        target = Root_Example(geometry = GEO_SPLINE)
+        target.normalize()
+        geo_target = target.geo
+        cacheFile = str(tmp_path / "bezier_cache.json")
+        cache = Match_Cache (cacheFile)
+
+        norm2 = []
+        for warm_start in [False, True]:
+
+            airfoil = Airfoil_Bezier()
+            side = airfoil.geo.upper
+            side.set_controlPoints_closeTo (geo_target.upper, 6)
+
+            matcher = Match_Side_Bezier (side, geo_target.upper, cache=cache)
+            matcher.run()
+
+            assert matcher.warm_start == warm_start
+            norm2.append (matcher.norm2)
+
+        assert matcher.niter <= 2
+        assert norm2[1] <= norm2[0]
+
+        # a bad result is not stored - it would be the warm start of later runs 
+
+        target_side = Tip_Example(geometry = GEO_SPLINE).geo.upper
+        airfoil = Airfoil_Bezier()
+        side = airfoil.geo.upper
+        side.set_controlPoints_closeTo (target_side, 6)
+        matcher = Match_Side_Bezier (side, target_side, cache=cache)
+
+        result = matcher.result
+        result['points'] = [(0.0, 0.0), (0.0, 0.1), (0.3, 0.2), (0.6, 0.1), (0.8, 0.05), (1.0, 0.0)]
+        nEntries = len(cache.entries)
+        matcher.set_result (result)
+        assert matcher.norm2 > matcher.norm2_good
+        assert len(Match_Cache (cacheFile).entries) == nEntries
+
+        # batch mode - entries are written with flush 
+
+        batchFile = str(tmp_path / "bezier_batch_cache.json")
+        cache = Match_Cache (batchFile, auto_write=False)
+        for target_side in [geo_target.upper, geo_target.lower]:
+            cache.store (target_side.x, target_side.y, [0.0, 0.0, 0.5, 1.0], [0.0, 0.1, 0.1, 0.0])
+        assert len(cache.entries) == 2
+        assert len(Match_Cache (batchFile).entries) == 0
+        cache.flush()
+        assert len(Match_Cache (batchFile).entries) == 2
     
 
 
+class Test_Airfoil_Library:
+
+
+    def test_library_index (self, tmp_path): 
+
+        import os
+        import shutil
+        from pathlib import Path
+        from airfoil_library import Airfoil_Library, THICKNESS, CAMBER, TE_GAP
+
+        examples = Path(__file__).parent.parent / 'examples'
+        shutil.copy (examples / 'VJX' / 'JX-GS-04.dat', tmp_path)
+        shutil.copy (examples / 'VJX' / 'JX-GS-15.dat', tmp_path)
+        os.makedirs (tmp_path / 'sub')
+        shutil.copy (examples / 'Amokka-JX' / 'JX-RS-Tip.dat', tmp_path / 'sub')
+        with open (tmp_path / 'invalid.dat', 'w') as f:
+            f.write ("invalid\n")
+
+        # index is build once - metrics equal a direct evaluation 
+
+        library = Airfoil_Library (str(tmp_path))
+        assert library.update () == 4
+        assert library.nAirfoils == 4
+        assert library.update () == 0
+
+        airfoil = Airfoil (pathFileName=str(tmp_path / 'sub' / 'JX-RS-Tip.dat'), geometry=GEO_BASIC)
+        airfoil.load()
+        airfoil.normalize()
+        metrics = library.metrics_of (str(tmp_path / 'sub' / 'JX-RS-Tip.dat'))
+        assert metrics[THICKNESS] == airfoil.maxThickness
+        assert metrics[CAMBER]    == airfoil.maxCamber
+        assert metrics[TE_GAP]    == airfoil.teGap_perc
+
+        # select by ranges - invalid airfoil is never selected 
+
+        selected = [os.path.basename (p) for p in library.select ()]
+        assert selected == ['JX-GS-04.dat', 'JX-GS-15.dat', 'JX-RS-Tip.dat']
+        selected = [os.path.basename (p) for p in library.select (thickness=(7.0, None), teGap=(None, 0.05))]
+        assert selected == ['JX-GS-15.dat']
+        assert library.select (thickness=(20.0, 30.0)) == []
+
+        # index is read from file - only modified or new airfoils are evaluated 
+
+        shutil.copy (examples / 'VJX' / 'JX-GS-06.dat', tmp_path)
+        os.remove (tmp_path / 'JX-GS-15.dat')
+        with open (tmp_path / 'JX-GS-04.dat', 'a') as f:
+            f.write ("\n")
+
+        library = Airfoil_Library (str(tmp_path))
+        assert library.nAirfoils == 4
+        assert library.update () == 2
+        assert sorted (library.names) == ['JX-GS-04', 'JX-GS-06', 'JX-RS-Tip', 'invalid']
+        assert library.metrics_of (str(tmp_path / 'JX-GS-15.dat')) is None
+
+        assert not [f for f in os.listdir (os.path.dirname (library.indexFile)) if f.endswith ('.tmp')]
+
+
+
+class Test_Spline:
+
+
+    def test_spline1D_eval (self): 
+
+        x = np.linspace (0.0, 1.0, 12) ** 1.5
+        y = np.sin (3 * x) + x
+
+        for boundary in ['notaknot', 'natural']:
+            for arccos in [False, True]:
+
+                spline = Spline1D (x, y, boundary=boundary, arccos=arccos)
+
+                # array evaluation equals scalar evaluation - also outside (clipped) 
+                x_test = np.concatenate (([-0.1], np.linspace (0.0, 1.0, 51), x, [1.1]))
+                for der in [0, 1, 2]:
+                    y_array  = spline.eval (x_test, der=der)
+                    y_scalar = np.array ([spline.eval (float(xi), der=der) for xi in x_test])
+                    assert np.allclose (y_array, y_scalar, rtol=0.0, atol=1e-12)
+
+                # spline interpolates the knots 
+                if not arccos: 
+                    assert np.allclose (spline.eval (x), y, rtol=0.0, atol=1e-12)
+
+
+    def test_spline1D_batch (self): 
+
+        x  = np.linspace (0.0, 1.0, 15) ** 2
+        ys = [np.sin (3 * x), x**3 - x, np.cos (5 * x) * x]
+
+        for boundary in ['notaknot', 'natural']:
+
+            splines = Spline1D.batch (x, ys, boundary=boundary)
+            assert len(splines) == len(ys)
+
+            # a batch spline equals the spline built one by one 
+            for spline, y in zip (splines, ys):
+                single = Spline1D (x, y, boundary=boundary)
+                for coeff in ['a', 'b', 'c', 'd']:
+                    assert np.allclose (getattr(spline, coeff), getattr(single, coeff), rtol=0.0, atol=1e-12)
+                x_test = np.linspace (0.0, 1.0, 33)
+                assert np.allclose (spline.eval (x_test, der=2), single.eval (x_test, der=2), rtol=0.0, atol=1e-10)
+
+        with pytest.raises(ValueError, match="Length of x,y"):
+            Spline1D.batch (x, [ys[0], ys[1][:-1]])
+
+
+    def test_spline1D_extrema_solve (self): 
+
+        # a notaknot spline reproduces a cubic exactly - y = x**3 - 3x 
+        x = np.linspace (-2.0, 2.5, 10)
+        spline = Spline1D (x, x**3 - 3 * x)
+
+        # extrema at x = -1 (max) and x = 1 (min)
+        x_ext, y_ext = spline.extrema()
+        assert np.allclose (x_ext, [-1.0, 1.0], atol=1e-10)
+        assert np.allclose (y_ext, [ 2.0,-2.0], atol=1e-10)
+
+        # inverse in the increasing and in the decreasing part 
+        for bounds in [(1.0, 2.5), (-1.0, 1.0)]:
+            x_known = np.linspace (bounds[0], bounds[1], 7)
+            x_inv   = spline.solve (x_known**3 - 3 * x_known, bounds=bounds)
+            assert np.allclose (x_inv, x_known, atol=1e-9)
+
+        assert round (spline.solve (0.0, bounds=(1.0, 2.5)), 10) == round (np.sqrt(3.0), 10)
+
+        # sine - extrema at pi/2 and 3pi/2
+        x = np.linspace (0.0, 2 * np.pi, 40)
+        spline = Spline1D (x, np.sin (x))
+        x_ext, y_ext = spline.extrema()
+        assert np.allclose (x_ext, [np.pi/2, 3*np.pi/2], atol=1e-4)
+        assert np.allclose (y_ext, [1.0, -1.0], atol=1e-4)
+        assert abs (spline.solve (0.5, bounds=(0.0, np.pi/2)) - np.arcsin (0.5)) < 1e-5
+
+
+    def test_spline1D_roots (self): 
+
+        # a notaknot spline reproduces a cubic exactly - y = x**3 - 3x 
+        x = np.linspace (-2.0, 2.5, 10)
+        spline = Spline1D (x, x**3 - 3 * x)
+
+        assert np.allclose (spline.roots(), [-np.sqrt(3.0), 0.0, np.sqrt(3.0)], atol=1e-10)
+
+        # x**3 - 3x + 1 = 0  ->  x = 2 cos (phi),  phi = 40°, 160°, 280° 
+        x_known = np.sort (2 * np.cos (np.radians ([40.0, 160.0, 280.0])))
+        assert np.allclose (spline.roots (-1.0), x_known, atol=1e-10)
+
+        assert len(spline.roots (10.0)) == 0                     # no solution within knots 
+
+        # sine - roots at the end knots included 
+        x = np.linspace (0.0, 2 * np.pi, 40)
+        spline = Spline1D (x, np.sin (x))
+        assert np.allclose (spline.roots(), [0.0, np.pi, 2 * np.pi], atol=1e-5)
+        assert np.allclose (spline.roots (0.5), [np.arcsin (0.5), np.pi - np.arcsin (0.5)], atol=1e-5)
+
+        # linear segments (d = 0) 
+        spline = Spline1D (np.linspace (0.0, 1.0, 6), np.linspace (0.0, 2.0, 6))
+        assert np.allclose (spline.roots (0.6), [0.3])
+
+
+    def test_solve_tridiagonal (self): 
+
+        rng = np.random.default_rng (1)
+        n   = 50
+        a   = rng.uniform (0.1, 1.0, n-1)
+        c   = rng.uniform (0.1, 1.0, n-1)
+        b   = 4.0 + rng.uniform (0.0, 1.0, n)             # diagonal dominant 
+        matrix = np.diag (b) + np.diag (a, -1) + np.diag (c, 1)
+
+        d1 = rng.uniform (-1.0, 1.0, n)
+        d3 = rng.uniform (-1.0, 1.0, (n, 3))
+
+        # single and several right hand sides against dense reference - both backends 
+        for backend in [None, 'thomas', 'lapack']:
+
+            if backend == 'lapack' and solve_banded is None: 
+                with pytest.raises(ValueError):                 # scipy isn't installed 
+                    solve_tridiagonal (a, b, c, d1, backend=backend)
+                continue
+
+            assert np.allclose (solve_tridiagonal (a, b, c, d1, backend=backend), np.linalg.solve (matrix, d1))
+
+            x = solve_tridiagonal (a, b, c, d3, backend=backend)
+            assert x.shape == d3.shape
+            assert np.allclose (x, np.linalg.solve (matrix, d3))
+
+        # default backend for large systems 
+        n = TRIDIAGONAL_LAPACK_MIN + 1
+        a, c = np.full (n-1, 1.0), np.full (n-1, 1.0)
+        b, d = np.full (n, 4.0),   np.ones (n)
+        x = solve_tridiagonal (a, b, c, d)
+        assert np.allclose (x, solve_tridiagonal (a, b, c, d, backend='thomas'))
+
+
+
+class Test_Math_Util:
+
+
+    def test_panel_angles (self): 
+
+        airfoils = [Root_Example(geometry = GEO_BASIC), Tip_Example(geometry = GEO_BASIC)]
+        xs = [airfoils[0].x, airfoils[1].x[::2]]
+        ys = [airfoils[0].y, airfoils[1].y[::2]]
+
+        singles = [panel_angles (x, y) for x, y in zip (xs, ys)]
+        for single in singles: 
+            assert single[0] == 180.0 and single[-1] == 180.0
+
+        # batch of polylines with different number of points equals single evaluation 
+        batch = panel_angles_batch (xs, ys)
+        assert len(batch) == 2
+        for angles, single in zip (batch, singles): 
+            assert np.array_equal (angles, single)
+        assert panel_angles_batch ([], []) == []
+
+        # 2D stack of polylines having the same number of points 
+        x2D = np.vstack ([airfoils[0].x, airfoils[1].x])
+        y2D = np.vstack ([airfoils[0].y, airfoils[1].y])
+        angles2D = panel_angles (x2D, y2D)
+        assert angles2D.shape == x2D.shape
+        for i in range(2): 
+            assert np.array_equal (angles2D[i], panel_angles (airfoils[i].x, airfoils[i].y))
+
+        # blunt polyline - zero dx defaults to 180° 
+        angles = panel_angles ([0.0, 0.0, 1.0, 2.0], [0.0, 1.0, 1.0, 1.0])
+        assert np.array_equal (angles, [180.0, 180.0, 180.0, 180.0])
+
+
+    def test_batched_root_finders (self): 
+
+        # independent roots of x**2 - c in one run 
+        c     = np.array ([2.0, 3.0, 5.0])
+        f     = lambda x: x**2 - c
+        Df    = lambda x: 2 * x
+        exact = np.sqrt (c)
+
+        x, niter = bisection_array (f, [0.0, 0.0, 0.0], [3.0, 3.0, 3.0])
+        assert np.allclose (x, exact, rtol=0.0, atol=1e-12)
+        assert niter < 100
+
+        x, niter = newton_bracketed (f, Df, [0.0, 0.0, 0.0], [3.0, 3.0, 3.0])
+        assert np.allclose (x, exact, rtol=0.0, atol=1e-12)
+        assert niter < 10 
+
+        # not converged - max_iter reached 
+        x, niter = bisection_array (f, [0.0, 0.0, 0.0], [3.0, 3.0, 3.0], max_iter=5)
+        assert niter == 4 
+        assert np.max (np.abs (x - exact)) > 1e-3
+        assert np.all ((x >= 0.0) & (x <= 3.0))
+
+        x, niter = newton_bracketed (np.arctan, lambda x: 1 / (1 + x**2), [-10.0], [20.0], x0=[15.0], max_iter=3)
+        assert niter == 2 
+        assert abs (x[0]) > 1e-3
+
+        # newton step would leave bracket (arctan overshoots) - bisection fallback 
+        x, niter = newton_bracketed (np.arctan, lambda x: 1 / (1 + x**2), [-10.0], [20.0], x0=[15.0])
+        assert abs (x[0]) < 1e-12
+
+        # zero derivative at start - bisection fallback 
+        x, niter = newton_bracketed (lambda x: x**3 - 1, lambda x: 3 * x**2, [-1.0], [3.0], x0=[0.0])
+        assert abs (x[0] - 1.0) < 1e-12
+
+
+    def test_batched_minimum_finder (self): 
+
+        # independent minima in one run 
+        xmin = np.array ([0.1, 0.5, 0.9])
+        x, fx, niter = brent_min_array (lambda x: (x - xmin)**2 + 1.0, [0.0, 0.0, 0.0], [1.0, 1.0, 1.0])
+        assert np.allclose (x, xmin, rtol=0.0, atol=1e-8)
+        assert np.allclose (fx, 1.0)
+
+        x, fx, niter = brent_min_array (np.cos, [2.0], [4.0])
+        assert abs (x[0] - np.pi) < 1e-7 and abs (fx[0] + 1.0) < 1e-12
+
+        # monotone function - minimum at the bracket boundary 
+        x, fx, niter = brent_min_array (lambda x: x, [1.0], [2.0])
+        assert abs (x[0] - 1.0) < 1e-8
+
+        # not converged - max_iter reached 
+        x, fx, niter = brent_min_array (np.cos, [2.0], [4.0], max_iter=3)
+        assert niter == 2
+        assert abs (x[0] - np.pi) > 1e-7
+        assert 2.0 <= x[0] <= 4.0
+
+
+class Test_Wing:
+
+    examples = Path(__file__).parent.parent / 'examples'
+
+
+    def test_planform_functions_array (self): 
+
+        # array based planform functions equal the evaluation point by point 
+
+        for example in ['VJX/VJX.pc2', 'Amokka-JX/Amokka-JX.pc2']:
+            for planformType in ['Bezier', 'Bezier TE straight', 'trapezoidal', 'Elliptical', 'paneled', 'DXF file']:
+
+                wing = Wing (str(self.examples / example))
+                if planformType == 'Elliptical': 
+                    planform = Planform_Pure_Elliptical (wing)
+                elif planformType == 'paneled': 
+                    planform = Planform_Paneled (wing)
+                elif planformType == 'DXF file': 
+                    planform = wing.refPlanform_DXF
+                    if not planform.isValid: continue
+                else: 
+                    wing.set_planformType (planformType)
+                    planform = wing.planform
+                    assert planform.planformType == planformType
+
+                if planformType == 'paneled':                               # tip maybe cutted 
+                    y = np.linspace (0.0, planform._sections_yPos_chord()[0][-1], 37)
+                else: 
+                    y = np.linspace (0.0, wing.halfwingspan, 37)
+                le, te = planform._planform_function (y)
+                le_te  = np.array ([planform._planform_function (yi) for yi in y])
+                assert np.allclose (le, le_te[:,0], rtol=0.0, atol=1e-8)
+                assert np.allclose (te, le_te[:,1], rtol=0.0, atol=1e-8)
+
+                chord = planform.norm_chord_function (y / wing.halfwingspan)
+                chord_single = [planform.norm_chord_function (yi / wing.halfwingspan) for yi in y]
+                assert np.allclose (chord, chord_single, rtol=0.0, atol=1e-10)
+
+                if planformType != 'paneled':
+                    y_lines, le, te = planform.lines ()
+                    le_te  = np.array ([planform._planform_function (yi) for yi in y_lines])
+                    assert np.allclose (le, le_te[:,0], rtol=0.0, atol=1e-8)
+                    assert np.allclose (te, le_te[:,1], rtol=0.0, atol=1e-8)
+
+
+    def test_chord_lookup (self): 
+
+        wing     = Wing (str(self.examples / 'VJX/VJX.pc2'))
+        planform = wing.planform
+
+        # y from chord equals a direct evaluation of the chord function 
+
+        chords = np.linspace (wing.tipchord + 0.1, wing.rootchord - 0.1, 25)
+        for chord in chords: 
+            y = planform.find_yPosFromChord (chord)
+            assert 0.0 <= y <= wing.halfwingspan
+            assert abs (planform.chord_function (y, fast=False) - chord) < 1e-6      # in mm 
+
+        # lookup table is built once per revision - each setter increases revision 
+
+        chords_table = planform._chord_lookup ()[0]
+        assert planform._chord_lookup ()[0] is chords_table
+
+        for setter, value in [(planform.set_p1x, planform.p1x * 0.99), 
+                              (planform.set_p1y, planform.p1y * 1.05), 
+                              (planform.set_p2x, planform.p2x * 1.05), 
+                              (planform.set_p3x, planform.p3x * 0.95), 
+                              (planform.set_banana_p1x, 0.05), 
+                              (planform.set_banana_p1y, 0.5)]:
+            revision = planform.revision
+            setter (value)
+            assert planform.revision == revision + 1
+            assert planform._chord_lookup ()[0] is not chords_table
+            chords_table = planform._chord_lookup ()[0]
+
+            chord = planform.norm_chord_function (np.array([0.7]), fast=False)[0] * wing.rootchord
+            y = planform.find_yPosFromChord (chord)
+            assert abs (y - 0.7 * wing.halfwingspan) < 1e-6
+
+        # trapezoidal is inverted directly 
+
+        wing.set_planformType ('trapezoidal')
+        planform = wing.planform
+        for chord in chords: 
+            y = planform.find_yPosFromChord (chord)
+            assert abs (planform.chord_function (y) - chord) < 1e-8
+
+
+    def test_revision_snapshot (self): 
+
+        def assert_snapshot_direct (wing : Wing): 
+            # snapshot values equal a direct computation with the planform 
+            snapshot = wing.snapshot ()
+            planform = wing.planform
+            assert snapshot.revision == wing.revision
+
+            y, le, te = planform.lines ()
+            assert np.array_equal (snapshot.y, y)
+            assert np.array_equal (snapshot.le, le) and np.array_equal (snapshot.te, te)
+            outline_y, outline_x = planform.linesPolygon ()
+            assert np.array_equal (snapshot.outline_y, outline_y)
+            assert np.array_equal (snapshot.outline_x, outline_x)
+            hinge_y, hinge_x = planform.hingeLine ()
+            assert np.array_equal (snapshot.hinge_y, hinge_y) and np.array_equal (snapshot.hinge_x, hinge_x)
+            assert (snapshot.area, snapshot.aspectRatio) == planform.calc_area_AR (outline_y, outline_x)
+
+            flaps = wing.getFlaps ()
+            assert len (snapshot.flaps) == len (flaps)
+            for flap_snap, flap in zip (snapshot.flaps, flaps): 
+                assert flap_snap.flapGroup == flap.flapGroup
+                assert np.array_equal (flap_snap.x, flap.x) and np.array_equal (flap_snap.y, flap.y)
+                assert flap_snap.depthLeft == flap.depthLeft and flap_snap.depthRight == flap.depthRight
+
+            yPos, chord = wing.get_wingSections_yPos_chord ()
+            assert np.array_equal (snapshot.sections_yPos, yPos)
+            assert np.array_equal (snapshot.sections_chord, chord)
+
+        wing = Wing (str(self.examples / 'VJX/VJX.pc2'))
+
+        # snapshot is memoized per revision and immutable 
+
+        assert_snapshot_direct (wing)
+        snapshot = wing.snapshot ()
+        assert wing.snapshot () is snapshot
+        with pytest.raises (AttributeError):
+            snapshot.area = 1.0
+        with pytest.raises (ValueError):
+            snapshot.le[0] = 1.0
+
+        # each setter increases revision - a new snapshot is built 
+
+        section = wing.wingSections[2]
+        changes = [(wing.set_wingspan,         wing.wingspan * 1.05), 
+                   (wing.set_rootchord,        wing.rootchord * 0.95), 
+                   (wing.set_tipchord,         wing.tipchord * 1.1), 
+                   (wing.set_hingeAngle,       wing.hingeAngle + 1.0), 
+                   (wing.set_flapDepthRoot,    wing.flapDepthRoot + 2.0), 
+                   (wing.set_flapDepthTip,     wing.flapDepthTip + 2.0), 
+                   (wing.planform.set_p1y,     wing.planform.p1y * 1.05), 
+                   (wing.planform.set_banana_p1y, 0.5), 
+                   (section.set_norm_chord,    section.norm_chord * 0.98), 
+                   (section.set_yPos,          section.yPos * 1.02), 
+                   (section.set_flapGroup,     section.flapGroup + 1), 
+                   (wing.createSectionAfter,   section),
+                   (wing.deleteSection,        section), 
+                   (wing.set_planformType,     'trapezoidal')]
+
+        for setter, value in changes: 
+            revision = wing.revision
+            setter (value)
+            assert wing.revision > revision, f"{setter.__name__} didn't increase revision"
+            assert wing.snapshot () is not snapshot
+            snapshot = wing.snapshot ()
+            assert_snapshot_direct (wing)
+
+
+    def test_paneled_section_table (self): 
+
+        def assert_table_direct (wing : Wing, paneled : Planform_Paneled): 
+            # section table equals a direct computation with wing sections and planform 
+            yPos, chord = paneled._sections_yPos_chord ()
+            le, te      = paneled._sections_le_te ()
+            yPos_wing, chord_wing = wing.get_wingSections_yPos_chord ()
+
+            assert yPos[:-1] == yPos_wing[:-1] and chord[:-1] == chord_wing[:-1]
+            if paneled.isTipCutted: 
+                assert yPos[-1] < wing.halfwingspan
+                assert abs (wing.planform.chord_function (yPos[-1]) - paneled.minTipChord) < 0.05   # findRoot
+                assert chord[-1] == wing.planform.chord_function (yPos[-1])
+            else: 
+                assert yPos[-1] == yPos_wing[-1] and chord[-1] == chord_wing[-1]
+
+            le_direct, te_direct = wing.planform._planform_function (np.asarray (yPos))
+            assert np.array_equal (le, le_direct) and np.array_equal (te, te_direct)
+
+        wing    = Wing (str(self.examples / 'VJX/VJX.pc2'))
+        paneled = Planform_Paneled (wing)
+
+        # table is built once per wing revision and minTipChord 
+
+        assert_table_direct (wing, paneled)
+        table = paneled._section_table ()
+        assert paneled._section_table () is table 
+
+        chord_beforeTip = wing.get_wingSections_yPos_chord ()[1][-2]
+        for minTipChord in [wing.tipchord, (wing.tipchord + 0.9 * chord_beforeTip) / 2]:
+            paneled.set_minTipChord (minTipChord)
+            assert paneled._section_table () is not table
+            table = paneled._section_table ()
+            assert_table_direct (wing, paneled)
+        assert paneled.isTipCutted
+
+        wing.set_rootchord (wing.rootchord * 0.95)
+        assert paneled._section_table () is not table
+        assert_table_direct (wing, paneled)
+
+        # le, te of the paneled planform interpolate the section table 
+
+        yPos, chord = paneled._sections_yPos_chord ()
+        le, te = paneled._sections_le_te ()
+        y = np.linspace (yPos[0], yPos[-1], 50)
+        le_y, te_y = paneled._planform_function (y)
+        assert np.allclose (le_y, np.interp (y, yPos, le)) and np.allclose (te_y, np.interp (y, yPos, te))
+        assert np.allclose (paneled._planform_function (np.asarray (yPos))[1] - 
+                            paneled._planform_function (np.asarray (yPos))[0], chord)
+
+
+    def test_dxf_contour_lookup (self): 
+
+        def get_xFromY_snapped (line, x):
+            # former point by point lookup - snaps to a contour point within eps 
+            eps = 0.00001
+            for idx in range(len(line)):
+                xp, yp = line[idx]
+                if abs(x-xp) < eps: 
+                    return yp
+                elif xp >= (x+eps) and idx >= 1:
+                    x1, y1 = line[idx-1]
+                    return y1 + (yp - y1) * (x - x1) / (xp - x1)
+
+        wing     = Wing (None)
+        planform = Planform_DXF (wing)
+        y = np.linspace (0.0, 1.0, 500)
+        planform.le_norm_dxf = np.column_stack ((y, 0.1 * (1 - np.sqrt (1 - 0.999 * y**2))))
+        planform.te_norm_dxf = np.column_stack ((y, 1 - 0.5 * y**2))
+        get_xFromY = planform._Planform_DXF__get_xFromY
+
+        # stated tolerance: eps of the former snapping * max slope of the contour 
+        #    le near the tip: 1e-5 * 1.95 * rootchord 200mm = 0.004mm 
+        x = np.concatenate ((y[1:-1] - 0.4e-5, y[1:-1] + 0.4e-5, np.linspace (0.001, 0.999, 333)))
+        for line in [planform.le_norm_dxf, planform.te_norm_dxf]:
+            slope_max = np.max (np.abs (np.diff (line[:,1]) / np.diff (line[:,0])))
+            tol = 1e-5 * slope_max
+            x_ref = np.array ([get_xFromY_snapped (line, xi) for xi in x])
+            dev   = np.abs (get_xFromY (line, x) - x_ref)
+            assert np.max (dev) <= tol
+            assert np.max (dev) * wing.rootchord < 0.01                     # in mm 
+
+        # chord of the planform within the same tolerance 
+        chord = planform.norm_chord_function (x) * wing.rootchord
+        chord_ref = np.array ([get_xFromY_snapped (planform.te_norm_dxf, xi) - 
+                               get_xFromY_snapped (planform.le_norm_dxf, xi) for xi in x]) * wing.rootchord
+        assert np.max (np.abs (chord - chord_ref)) < 0.01
+
+
+
 # Main program for testing 
 if __name__ == "__main__":
 
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+
+Batch conversion of a directory of .dat airfoils into Bezier based airfoils
+
+    - each .dat airfoil is normalized and upper and lower side is matched with Bezier
+    - all sides are matched in parallel within a process pool
+    - for each airfoil a .bez and a .dat file is written to the output directory
+    - a csv file with the matching results (norm2 deviation, iterations) is written
+
+    Usage:  python bezier_batch.py <airfoil_dir> [-o <out_dir>] [-n <control points>]
+
+"""
+
+import os
+import sys
+import csv
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from common_utils       import *
+from airfoil            import Airfoil, Airfoil_Bezier
+from airfoil_geometry   import Match_Side_Bezier, Match_Cache, run_matcher, UPPER, LOWER
+
+
+NAME_EXT    = '-bezier'                                 # name extension of the bezier airfoils
+OUT_SUBDIR  = 'bezier'                                  # default output sub directory
+CSV_FILE    = 'bezier_match.csv'                        # result file in output directory
+CACHE_FILE  = 'bezier_match_cache.json'                 # warm start cache in output directory
+
+
+
+def bezier_matchers (airfoilOrg : Airfoil, ncp_upper : int = 6, ncp_lower : int = 6,
+                     cache : Match_Cache = None):
+    """
+    Creates a new Airfoil_Bezier for airfoilOrg with control points close to the target
+    and the matchers for upper and lower side - optionally warm started from cache
+
+    Returns:
+        airfoil: Airfoil_Bezier
+        matchers: list of Match_Side_Bezier for upper and lower side
+    """
+
+    if not airfoilOrg.isNormalized:
+        airfoilOrg.normalize()
+
+    airfoil = Airfoil_Bezier (name=airfoilOrg.name + NAME_EXT)
+
+    geo     = airfoil.geo
+    geoOrg  = airfoilOrg.geo
+
+    geo.upper.set_controlPoints_closeTo (geoOrg.upper, ncp_upper)
+    geo.lower.set_controlPoints_closeTo (geoOrg.lower, ncp_lower)
+
+    matchers = [Match_Side_Bezier (geo.upper, geoOrg.upper,
+                                   target_le_curv=geoOrg.curvature.max_at_le,
+                                   max_te_curv   =geoOrg.curvature.at_upper_te, cache=cache),
+                Match_Side_Bezier (geo.lower, geoOrg.lower,
+                                   target_le_curv=geoOrg.curvature.max_at_le,
+                                   max_te_curv   =geoOrg.curvature.at_lower_te, cache=cache)]
+    return airfoil, matchers
+
+
+
+def convert_directory (airfoil_dir : str, out_dir : str = None,
+                       ncp_upper : int = 6, ncp_lower : int = 6,
+                       max_workers : int = None, use_cache : bool = True) -> str:
+    """
+    Converts all .dat airfoils in airfoil_dir into Bezier airfoils.
+    Upper and lower side of all airfoils are matched in parallel in a process pool.
+
+    Args:
+        airfoil_dir: directory with .dat files
+        out_dir: output directory for .bez and .dat files - default 'airfoil_dir/bezier'
+        ncp_upper: number of control points upper side
+        ncp_lower: number of control points lower side
+        max_workers: max number of processes - default number of processors
+        use_cache: warm start from previous results in the cache file of out_dir
+
+    Returns:
+        pathFileName of the csv result file
+    """
+
+    if out_dir is None:
+        out_dir = os.path.join (airfoil_dir, OUT_SUBDIR)
+    if not os.path.isdir (out_dir):
+        os.makedirs (out_dir)
+
+    # cache file is written once at the end of the batch 
+    cache = Match_Cache (os.path.join (out_dir, CACHE_FILE), auto_write=False) if use_cache else None
+
+    datFiles = sorted ([f for f in os.listdir(airfoil_dir) if f.lower().endswith('.dat')])
+
+    # prepare airfoils and matchers
+
+    jobs = []                                           # (airfoil, matchers)
+    for datFile in datFiles:
+        try:
+            airfoilOrg = Airfoil (pathFileName=os.path.join (airfoil_dir, datFile))
+            airfoilOrg.load()
+            airfoil, matchers = bezier_matchers (airfoilOrg, ncp_upper, ncp_lower, cache=cache)
+        except Exception as e:
+            ErrorMsg (f"Airfoil '{datFile}' couldn't be prepared for matching: {e}")
+        else:
+            jobs.append ((airfoil, matchers))
+
+    # match all sides of all airfoils in parallel
+
+    with ProcessPoolExecutor (max_workers=max_workers) as executor:
+        futures = [[executor.submit (run_matcher, matcher) for matcher in matchers]
+                   for _, matchers in jobs]
+
+        rows = []
+        for (airfoil, matchers), side_futures in zip (jobs, futures):
+            try:
+                for matcher, future in zip (matchers, side_futures):
+                    matcher.set_result (future.result())
+            except Exception as e:
+                ErrorMsg (f"Matching of '{airfoil.name}' failed: {e}")
+                continue
+
+            airfoil.saveAs (dir=out_dir)                # writes .dat and .bez
+
+            row = [airfoil.name]
+            for matcher in matchers:
+                row += [matcher.ncp, round(matcher.norm2, 7), matcher.niter,
+                        matcher.max_reached, matcher.method_used]
+            rows.append (row)
+            InfoMsg (f"{airfoil.name}: norm2 {UPPER} {matchers[0].norm2:.5f}  {LOWER} {matchers[1].norm2:.5f}")
+
+    if cache is not None: 
+        cache.flush ()
+
+    # write result csv
+
+    csvPathFileName = os.path.join (out_dir, CSV_FILE)
+    with open(csvPathFileName, 'w', newline='') as file:
+        writer = csv.writer (file)
+        header = ['airfoil']
+        for sideName in [UPPER, LOWER]:
+            header += [f"{sideName}_{col}" for col in ['ncp', 'norm2', 'niter', 'max_reached', 'method']]
+        writer.writerow (header)
+        writer.writerows (rows)
+
+    return csvPathFileName
+
+
+
+#--------------------------------
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(prog='bezier_batch',
+                                     description='Convert a directory of .dat airfoils into Bezier airfoils')
+    parser.add_argument("airfoil_dir", help="Directory with airfoil .dat files")
+    parser.add_argument("-o", "--out", default=None, help="Output directory - default <airfoil_dir>/bezier")
+    parser.add_argument("-n", "--ncp", type=int, default=6, help="Number of Bezier control points per side")
+    parser.add_argument("--no-cache", action='store_true', help="Don't warm start from previous results")
+    args = parser.parse_args()
+
+    if not os.path.isdir (args.airfoil_dir):
+        ErrorMsg ("Airfoil directory '%s' doesn't exist" % args.airfoil_dir)
+        sys.exit(1)
+
+    csvPathFileName = convert_directory (args.airfoil_dir, out_dir=args.out,
+                                         ncp_upper=args.ncp, ncp_lower=args.ncp,
+                                         use_cache=not args.no_cache)
+    NoteMsg ("Results written to '%s'" % csvPathFileName)
@@ -8,6 +8,7 @@ Common Utility functions for convinience
 from termcolor import colored
 from colorama import just_fix_windows_console
 import os
+import uuid
 from pathlib import Path
 import json
 
@@ -242,6 +243,39 @@ class Settings (Parameters):
 # File, Path handling 
 #------------------------------------------------------------------------------
 
+def write_atomic (pathFileName, text):
+    """
+    writes text (or binary data) to pathFileName via a temp file in the same directory 
+    which is renamed to pathFileName - a reader never sees a partly written file
+    """
+    tmpFile = f"{pathFileName}.{uuid.uuid4().hex[:8]}.tmp"     # unique for concurrent writers
+    try: 
+        with open (tmpFile, 'wb' if isinstance (text, bytes) else 'w') as file:
+            file.write (text)
+        os.replace (tmpFile, pathFileName)
+    except: 
+        if os.path.isfile (tmpFile): os.remove (tmpFile)
+        raise
+
+
+def user_cache_dir (appName : str) -> str:
+    """ 
+    returns the per-user directory for cache files of appName - it is created if needed.
+    Windows: %LOCALAPPDATA%\\appName - else $XDG_CACHE_HOME/appName or ~/.cache/appName 
+    """
+    if os.name == 'nt':
+        baseDir = os.environ.get ('LOCALAPPDATA', os.path.join (Path.home(), 'AppData', 'Local'))
+    else: 
+        baseDir = os.environ.get ('XDG_CACHE_HOME', os.path.join (Path.home(), '.cache'))
+
+    cacheDir = os.path.join (baseDir, appName)
+    try: 
+        os.makedirs (cacheDir, exist_ok=True)
+    except OSError: 
+        WarningMsg (f"Cache directory '{cacheDir}' couldn't be created")
+    return cacheDir
+
+
 class PathHandler(): 
     """ handles relative Path of actual files to a workingDir """
 
@@ -171,7 +171,8 @@ class Dxf_Artist:
 
     def plot_planform (self):
         
-        y, le, te, = self.wing.planform.lines()
+        snapshot = self.wing.snapshot()
+        y, le, te = snapshot.y, snapshot.le, snapshot.te
 
         # mirror the lines along span so that root-te will be at 0,0 
         le = self._line_mirror (le)
@@ -193,7 +194,8 @@ class Dxf_Artist:
 
     def plot_hingeLine (self):
 
-        y, hl = self.wing.planform.hingeLine()
+        snapshot = self.wing.snapshot()
+        y, hl = snapshot.hinge_y, snapshot.hinge_x
         # mirror the lines along span so that root-te will be at 0,0 
         hl = self._line_mirror (hl)
         # insert into dxf doc
@@ -202,7 +204,7 @@ class Dxf_Artist:
 
     def plot_flapLines (self):
 
-        flaps = self.wing.getFlaps()
+        flaps = self.wing.snapshot().flaps
 
         flap : Flap
         for i, flap in enumerate (flaps):
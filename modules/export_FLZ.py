@@ -295,6 +295,7 @@ class SEGMENT (FLZ_Element):
 
         # use sections of the paneled planform as original tip cut be cutted due to minTipChord ... 
         sections_yPos, sections_chord = self.paneledPlanform._sections_yPos_chord()
+        sections_le, _                = self.paneledPlanform._sections_le_te()
         leftSection_yPos   = sections_yPos  [leftSectionIndex]
         leftSection_chord  = sections_chord [leftSectionIndex]
         rightSection_yPos  = sections_yPos  [rightSectionIndex]
@@ -316,8 +317,8 @@ class SEGMENT (FLZ_Element):
         twist = 0.0 
         dihedral = 0.0
 
-        le_left,_  = self.wing.planform._planform_function (leftSection_yPos)  
-        le_right,_ = self.wing.planform._planform_function (rightSection_yPos) 
+        le_left    = sections_le [leftSectionIndex]  
+        le_right   = sections_le [rightSectionIndex] 
         sweep = atan (abs((le_left - le_right)/(1000 *width))) * 180 / pi
         refSweep = 0
 
@@ -131,6 +131,7 @@ class Export_Xflr5:
 
         # get section yPos and chord from paneled planform as tip could be cutted 
         sections_yPos, sections_chord = self.paneledPlanform._sections_yPos_chord()
+        sections_le, _                = self.paneledPlanform._sections_le_te()
 
         for iSec, section in enumerate(self.wing.wingSections):
             # copy the template
@@ -159,8 +160,7 @@ class Export_Xflr5:
                 chord.text = str(sections_chord[iSec])
 
             for xOffset in newSectionXml.iter('xOffset'):
-                le, te = self.paneledPlanform._planform_function (sections_yPos[iSec])
-                xOffset.text = str(le)
+                xOffset.text = str(sections_le[iSec])
 
             for dihedral in newSectionXml.iter('Dihedral'):
                 # tbd
@@ -6,7 +6,6 @@
 """
 
 import numpy as np
-import math
 
 
 #------------ time to run -----------------------------------
@@ -40,6 +39,7 @@ def interpolate(x1, x2, y1, y2, x):
 def panel_angles (x,y):
     """returns an array of panel angles of polyline x,y - between 160 - 180
     angle[0] and [-1] default to 180° 
+    x,y may also be 2D arrays of polylines having the same number of points  
     """
 
     # Xfoil - CANG 
@@ -72,21 +72,46 @@ def panel_angles (x,y):
     #         ENDIF
     #    30 CONTINUE
 
-    angles = np.zeros (len(x))
-    for i in range(1, len(x)-1):
-        dx1 = x[i] - x[i-1] 
-        dy1 = y[i] - y[i-1] 
-        dx2 = x[i] - x[i+1] 
-        dy2 = y[i] - y[i+1] 
-        if dx1 != 0.0 and dx2 != 0.0:               # check for pathologic airfoil (blunt le) 
-            crossp = (dx2 * dy1 - dy2 * dx1) / math.sqrt ((dx1**2 + dy1**2) * (dx2**2 + dy2**2))
-            angles[i] = math.asin(crossp)
-        else: 
-            angles[i] = 0.0
+    x = np.asarray (x, dtype=float)
+    y = np.asarray (y, dtype=float)
+
+    dx1 = x[...,1:-1] - x[...,:-2] 
+    dy1 = y[...,1:-1] - y[...,:-2] 
+    dx2 = x[...,1:-1] - x[...,2:] 
+    dy2 = y[...,1:-1] - y[...,2:] 
+
+    # check for pathologic airfoil (blunt le) - angle defaults to 180°
+    valid = (dx1 != 0.0) & (dx2 != 0.0) 
+
+    with np.errstate (divide='ignore', invalid='ignore'):
+        crossp = (dx2 * dy1 - dy2 * dx1) / np.sqrt ((dx1**2 + dy1**2) * (dx2**2 + dy2**2))
+    crossp = np.where (valid, np.clip (crossp, -1.0, 1.0), 0.0)
+
+    angles = np.zeros (x.shape)
+    angles[...,1:-1] = np.arcsin (crossp)
     angles = 180.0 - angles * (180/np.pi)
     return angles 
 
 
+def panel_angles_batch (xs, ys) -> list:
+    """returns a list of panel angle arrays of a stack of polylines xs, ys 
+    which may have different number of points 
+    """
+
+    lengths = [len(x) for x in xs]
+    if not lengths: return []
+
+    angles  = panel_angles (np.concatenate (xs), np.concatenate (ys))
+
+    # the angles at the joints of two polylines are not valid - reset to default 
+    ends   = np.cumsum (lengths) 
+    angles = np.split (angles, ends[:-1])
+    for a in angles: 
+        if len(a): 
+            a[0], a[-1] = 180.0, 180.0
+    return angles 
+
+
 #------------ Bisection - find index  -----------------------------------
 
 def bisection(array,value):
@@ -229,6 +254,259 @@ def newton(f,Df,x0,epsilon = 10e-8 , max_iter= 50, bounds=None):
 
 
 
+def newton_array (f, Df, x0, epsilon = 10e-8 , max_iter= 50, bounds=None):
+    '''Approximate solutions of f(x)=0 for an array of independent problems by Newton's method.
+
+        Vectorized version of 'newton' - all problems are iterated together. 
+        f and Df are evaluated for the whole array x in each iteration. 
+        Converged elements are not moved anymore. 
+        An element with zero derivative will remain at its current value. 
+
+    Parameters
+    ----------
+    f : function
+        Vectorized function for which we are searching for the solutions f(x)=0.
+    Df : function
+        Vectorized derivative of f(x).
+    x0 : array 
+        Initial guesses for the solutions f(x)=0.
+    epsilon : number
+        Stopping criteria is abs(f(x)) < epsilon for all elements.
+    max_iter : integer
+        Maximum number of iterations of Newton's method.
+    bounds : optional - tuple of lower and upper bound of x
+
+    Returns
+    -------
+    xn : array 
+    niter : iterations needed 
+    '''
+
+    xn = np.array (x0, dtype=float)
+    n  = 0 
+    for n in range(0,max_iter):
+
+        if bounds is not None: 
+            xn = np.clip (xn, bounds[0], bounds[1])
+
+        fxn = f(xn)
+
+        active = np.abs(fxn) >= epsilon
+        if not np.any (active):
+            break
+
+        Dfxn = Df(xn)
+        active = np.logical_and (active, Dfxn != 0.0)
+        xn[active] = xn[active] - fxn[active]/Dfxn[active]
+
+    if bounds is not None: 
+        xn = np.clip (xn, bounds[0], bounds[1])
+
+    return xn, n
+
+
+
+#------------ batched 1D root and minimum finders -----------------------------------
+#
+#   solve N independent 1D problems at once - f (and Df) must be vectorized
+#   and are evaluated for the whole array in each iteration
+
+
+def bisection_array (f, a, b, epsilon=1e-12, max_iter=100):
+    '''Approximate solutions of f(x)=0 for an array of independent brackets [a,b] by bisection.
+
+    Parameters
+    ----------
+    f : function
+        Vectorized function for which we are searching for the solutions f(x)=0.
+    a,b : arrays
+        The brackets in which to search - f must change its sign within each bracket
+    epsilon : number
+        Stopping criteria is the width of all brackets < epsilon.
+    max_iter : integer
+        Maximum number of iterations.
+
+    Returns
+    -------
+    x : array
+    niter : iterations needed
+    '''
+
+    a  = np.array (a, dtype=float)
+    b  = np.array (b, dtype=float)
+    sa = np.sign (f(a))
+
+    n = 0
+    for n in range(0,max_iter):
+        if np.max (np.abs (b - a)) < epsilon:
+            break
+        m  = 0.5 * (a + b)
+        sm = np.sign (f(m))
+        left = (sm == sa)                           # root is in [m,b]
+        a = np.where (left, m, a)
+        b = np.where (left, b, m)
+
+    return 0.5 * (a + b), n
+
+
+
+def newton_bracketed (f, Df, a, b, x0=None, epsilon=1e-12, max_iter=50):
+    '''Approximate solutions of f(x)=0 for an array of independent brackets [a,b]
+    by a safeguarded Newton iteration.
+
+        The brackets are shrinked in each iteration. If a Newton step
+        would leave its bracket, a bisection step is taken instead.
+
+    Parameters
+    ----------
+    f : function
+        Vectorized function for which we are searching for the solutions f(x)=0.
+    Df : function
+        Vectorized derivative of f(x).
+    a,b : arrays
+        The brackets in which to search - f must change its sign within each bracket
+    x0 : array - optional
+        Initial guesses within the brackets - default is the middle of the brackets
+    epsilon : number
+        Stopping criteria is abs(f(x)) < epsilon or all steps < epsilon.
+    max_iter : integer
+        Maximum number of iterations.
+
+    Returns
+    -------
+    x : array
+    niter : iterations needed
+    '''
+
+    a  = np.array (a, dtype=float)
+    b  = np.array (b, dtype=float)
+    x  = 0.5 * (a + b) if x0 is None else np.array (x0, dtype=float)
+    sa = np.sign (f(a))
+
+    n = 0
+    for n in range(0,max_iter):
+
+        fx = f(x)
+        if np.max (np.abs (fx)) < epsilon:
+            break
+
+        # shrink brackets
+        left = (np.sign (fx) == sa)                 # root is in [x,b]
+        a = np.where (left, x, a)
+        b = np.where (left, b, x)
+
+        Dfx   = Df(x)
+        x_new = x - np.divide (fx, Dfx, out=np.full_like (x, np.inf), where=(Dfx != 0.0))
+
+        # Newton step out of bracket - take bisection
+        outside = ~((x_new > np.minimum (a,b)) & (x_new < np.maximum (a,b)))
+        x_new[outside] = 0.5 * (a[outside] + b[outside])
+
+        converged = np.max (np.abs (x_new - x)) < epsilon
+        x = x_new
+        if converged:
+            break
+
+    return x, n
+
+
+
+def brent_min_array (f, a, b, x0=None, epsilon=1e-10, max_iter=100):
+    '''Approximate the minimum of f for an array of independent brackets [a,b] by
+    the method of Brent - parabolic interpolation safeguarded by golden section steps.
+
+    Parameters
+    ----------
+    f : function
+        Vectorized function to minimize
+    a,b : arrays
+        The brackets in which to search a minimum
+    x0 : array - optional
+        Initial guesses within the brackets - default is the golden section
+    epsilon : number
+        Relative tolerance of x
+    max_iter : integer
+        Maximum number of iterations.
+
+    Returns
+    -------
+    x : array - x of the minimum
+    fx : array - f at x
+    niter : iterations needed
+    '''
+    # based on Numerical Recipes 'brent'
+
+    CGOLD = 0.3819660
+    ZEPS  = 1e-14
+
+    a  = np.array (a, dtype=float)
+    b  = np.array (b, dtype=float)
+    x  = a + CGOLD * (b - a) if x0 is None else np.array (x0, dtype=float)
+    w  = x.copy()
+    v  = x.copy()
+    fx = f(x)
+    fw = fx.copy()
+    fv = fx.copy()
+    d  = np.zeros_like (x)
+    e  = np.zeros_like (x)
+
+    n = 0
+    for n in range(0,max_iter):
+
+        xm   = 0.5 * (a + b)
+        tol1 = epsilon * np.abs(x) + ZEPS
+        tol2 = 2.0 * tol1
+        active = np.abs (x - xm) > (tol2 - 0.5 * (b - a))
+        if not np.any (active):
+            break
+
+        # trial parabolic fit
+        r = (x - w) * (fx - fv)
+        q = (x - v) * (fx - fw)
+        p = (x - v) * q - (x - w) * r
+        q = 2.0 * (q - r)
+        p = np.where (q > 0.0, -p, p)
+        q = np.abs (q)
+
+        golden_e  = np.where (x >= xm, a - x, b - x)
+        parabolic = (np.abs(e) > tol1) & (np.abs(p) < np.abs(0.5 * q * e)) & \
+                    (p > q * (a - x)) & (p < q * (b - x))
+
+        d_para = np.divide (p, q, out=np.zeros_like (p), where=parabolic)
+        u_para = x + d_para
+        d_para = np.where ((u_para - a < tol2) | (b - u_para < tol2),
+                           np.copysign (tol1, xm - x), d_para)
+
+        e = np.where (parabolic, d, golden_e)
+        d = np.where (parabolic, d_para, CGOLD * golden_e)
+
+        u  = np.where (np.abs(d) >= tol1, x + d, x + np.copysign (tol1, d))
+        u  = np.where (active, u, x)
+        fu = f(u)
+
+        # housekeeping - only for the active problems
+        better = (fu <= fx) & active
+        worse  = (fu >  fx) & active
+
+        a_new = np.where (better & (u >= x), x, np.where (worse & (u <  x), u, a))
+        b_new = np.where (better & (u <  x), x, np.where (worse & (u >= x), u, b))
+        a, b  = a_new, b_new
+
+        shift_w = worse & ((fu <= fw) | (w == x))
+        shift_v = worse & ~shift_w & ((fu <= fv) | (v == x) | (v == w))
+
+        v_new  = np.where (better | shift_w, w,  np.where (shift_v, u,  v))
+        fv_new = np.where (better | shift_w, fw, np.where (shift_v, fu, fv))
+        w_new  = np.where (better, x,  np.where (shift_w, u,  w))
+        fw_new = np.where (better, fx, np.where (shift_w, fu, fw))
+        x      = np.where (better, u,  x)
+        fx     = np.where (better, fu, fx)
+        v, fv, w, fw = v_new, fv_new, w_new, fw_new
+
+    return x, fx, n
+
+
+
 # ---------------------------------------------------------------------------
 # (c) https://github.com/fchollet/nelder-mead 
 # 
@@ -584,6 +862,99 @@ def findRoot (fn, xStart, bounds=None, no_improve_thr=10e-12):
 
 
 
+#------------ Levenberg-Marquardt least squares -----------------------------------
+
+
+def levenberg_marquardt (fn_residuals, fn_jacobian, x_start,
+                         bounds = None, 
+                         max_iter=100, 
+                         no_improve_thr=1e-10,
+                         lamb=1e-3, lamb_up=4.0, lamb_down=0.3, lamb_max=1e10):
+    '''
+        Levenberg-Marquardt optimization to minimize the sum of squared residuals 
+
+        Needs the jacobian of the residuals which should be analytic for speed 
+
+        Parameters
+        ----------
+        fn_residuals : function of x returning the array of residuals r (m)
+        fn_jacobian  : function of x returning the jacobian dr/dx (m x n)
+        x_start : np array - initial position
+        bounds : list of tuple(float) - (min, max) pair for boundary of x or None. 
+                 A step leaving the bounds will be clipped (projected). 
+        max_iter : int - always break after this number of iterations.
+        no_improve_thr : float - break if relative improvement of score is lower 
+        lamb : float - initial damping factor 
+        lamb_up, lamb_down : float - factors to increase / decrease damping 
+        lamb_max : float - break if damping becomes larger (no improvement possible)
+             
+        Returns
+        -------
+        (xbest,score) : np array tuple - x of minimum , best score (sum of squares)
+        niter : int - iterations needed 
+    '''
+
+    x = np.array (x_start, dtype=float)
+    dim = len(x)
+
+    if bounds is not None: 
+        lower = np.array ([-np.inf if b is None else b[0] for b in bounds])
+        upper = np.array ([ np.inf if b is None else b[1] for b in bounds])
+    
+    r = fn_residuals (x)
+    score = np.dot (r, r)
+
+    niter = 0
+    for niter in range (1, max_iter+1):
+
+        J = fn_jacobian (x)
+        g = J.T @ r
+        A = J.T @ J
+        diagA = np.maximum (np.diag(A), 1e-12)          # Marquardt scaling - avoid zero diagonal 
+
+        # variables at a bound which would be pushed outside are fixed for this iteration 
+        if bounds is not None: 
+            free = ~ (((x <= lower) & (g > 0.0)) | ((x >= upper) & (g < 0.0)))
+        else: 
+            free = np.ones (dim, dtype=bool)
+        A_free = A[np.ix_(free, free)]
+        g_free = g[free]
+
+        improved = False
+        while lamb <= lamb_max:
+            step = np.zeros (dim)
+            try: 
+                step[free] = np.linalg.solve (A_free + lamb * np.diag(diagA[free]), -g_free)
+            except np.linalg.LinAlgError:
+                lamb *= lamb_up
+                continue
+
+            x_new = x + step
+            if bounds is not None: 
+                x_new = np.clip (x_new, lower, upper)
+
+            r_new = fn_residuals (x_new)
+            score_new = np.dot (r_new, r_new)
+
+            if np.isfinite (score_new) and score_new < score: 
+                improved = True
+                lamb *= lamb_down
+                break
+            lamb *= lamb_up
+
+        if not improved:                                # no further improvement possible
+            break
+
+        delta = score - score_new
+        x, r, score = x_new, r_new, score_new
+
+        if delta <= no_improve_thr * max(score, 1e-30) or np.linalg.norm(step) < 1e-12 * dim: 
+            break
+
+    return (x, score), niter
+
+
+
 #------------ cosinus distribution -----------------------------------
 
 
@@ -8,9 +8,9 @@
 """
 import bisect
 import numpy as np
-from copy import deepcopy
 import math
-from math_util import findMin, newton
+from functools import lru_cache
+from math_util import findMin, newton, newton_array, newton_bracketed
 
 
 #------------ Helper -----------------------------------
@@ -63,6 +63,80 @@ def rref(B, tol=1e-8):
     return A
 
 
+#------------ Tridiagonal solver -----------------------------------
+
+# optional LAPACK backend (gtsv like banded solver) - numpy only if scipy isn't installed
+
+try:
+    from scipy.linalg import solve_banded
+except ImportError:
+    solve_banded = None
+
+TRIDIAGONAL_LAPACK_MIN = 1000           # min number of equations to use LAPACK backend 
+
+
+def solve_tridiagonal (a, b, c, d, backend=None):
+    """
+    Solves the tridiagonal system with sub diagonal a, diagonal b, super diagonal c 
+
+        b0   c0    0    0    
+        a0   b1   c1    0    
+         0   a1   b2   c2   
+         0    0   a2   b3
+
+    Parameters
+    ----------
+    a, c : array_like - sub and super diagonal (length n-1)
+    b :    array_like - diagonal (length n)
+    d :    array_like - right hand side either 1D (n) or 2D (n x k). All k right hand 
+           sides are solved together with a single elimination of the matrix 
+    backend : 'thomas' or 'lapack'. Default: LAPACK for large systems if scipy is 
+           available - otherwise Thomas algorithm 
+
+    Returns
+    -------
+    x : ndarray having the shape of d  
+    """
+
+    n = len(b)
+
+    if backend is None: 
+        if solve_banded is not None and n >= TRIDIAGONAL_LAPACK_MIN:
+            backend = 'lapack'
+        else: 
+            backend = 'thomas'
+
+    if backend == 'lapack':
+        if solve_banded is None:
+            raise ValueError ("Tridiagonal solver: LAPACK backend needs scipy")
+        ab = np.zeros ((3, n))
+        ab[0,1:]  = c
+        ab[1,:]   = b
+        ab[2,:-1] = a
+        return solve_banded ((1,1), ab, d)
+
+    # Thomas algorithm (TDMA) - loops over the equations, vectorized over the right hand sides 
+    #   refer to http://en.wikipedia.org/wiki/Tridiagonal_matrix_algorithm
+    #   and to https://gist.github.com/cbellei/8ab3ab8551b8dfc8b081c518ccd9ada9
+
+    bc = np.array (b, dtype=float)                  # copy arrays
+    dc = np.array (d, dtype=float)
+
+    for it in range(1, n):
+        mc = a[it-1]/bc[it-1]
+        bc[it] = bc[it] - mc*c[it-1] 
+        dc[it] = dc[it] - mc*dc[it-1]
+
+    x = np.zeros (dc.shape)
+    x[-1] = dc[-1]/bc[-1]
+
+    for il in range(n-2, -1, -1):
+        x[il] = (dc[il]-c[il]*x[il+1])/bc[il]
+
+    return x
+
+
+
 def print_array2D (aArr):
 
     for i, row in enumerate (aArr):
@@ -93,6 +167,34 @@ def print_array_compact (aArr,header=None):
 
 
 
+#------------ Polynomial roots -----------------------------------
+
+def _quadratic_roots (a, b, c):
+    """
+    returns the two real roots z1, z2 of a z**2 + b z + c = 0 for arrays of coefficients.
+    Complex roots are nan - linear equations (a=0) have their root in z1.
+    """
+
+    a, b, c = np.broadcast_arrays (*[np.asarray (v, dtype=float) for v in (a, b, c)])
+    z1 = np.full (a.shape, np.nan)
+    z2 = np.full (a.shape, np.nan)
+
+    # quadratic - numerically stable form avoiding cancellation
+    quad = a != 0.0
+    disc = np.where (quad, b**2 - 4 * a * c, -1.0)
+    real = quad & (disc >= 0.0)
+    q    = -0.5 * (b[real] + np.copysign (np.sqrt (disc[real]), b[real]))
+    z1[real] = q / a[real]
+    z2[real] = np.divide (c[real], q, out=np.full (q.shape, np.nan), where=(q != 0.0))
+
+    # linear 
+    lin = ~quad & (b != 0.0)
+    z1[lin] = - c[lin] / b[lin]
+
+    return z1, z2
+
+
+
 #------------ Spline 1D -----------------------------------
 
 class Spline1D: 
@@ -126,13 +228,71 @@ class Spline1D:
         if not (boundary == 'natural' or 'notaknot'): 
             boundary = 'notaknot'
 
+        y = np.asarray (y, dtype=float)
+
+        h = self._init_knots (x, len(y), boundary, arccos)
+
+        # keep for later evaluation 
+        self.y = y
+
+        M = self._calc_M (h, y, boundary)
+        self._set_coefficients (h, y, M)
+
+
+    @classmethod
+    def batch (cls, x, ys : list, boundary="notaknot") -> list['Spline1D']:
+        """
+        Build cubic splines for several y arrays having the same x. 
+
+        As the tridiagonal matrix only depends on x, it is eliminated only once 
+        for all right hand sides (e.g. x and y of a 2D spline) 
+
+        Parameters
+        ----------
+        x  : array_like - common knots of the splines
+        ys : list of array_like - the y values of each spline 
+        boundary : Type of boundary condition - see __init__
+
+        Returns
+        -------
+        splines : list of Spline1D - one for each y in ys
+        """
+
+        ys = [np.asarray (y, dtype=float) for y in ys]
+
+        master = cls.__new__(cls)
+        h = master._init_knots (x, len(ys[0]), boundary, False)
+
+        for y in ys:
+            if len(y) != len(master.x): 
+                raise ValueError('Spline: Length of x,y is different')
+
+        # solve all right hand sides at once - each column is a spline 
+        Y = np.column_stack (ys)
+        M = master._calc_M (h, Y, boundary)
+
+        splines = []
+        for k, y in enumerate (ys):
+            spl = cls.__new__(cls)
+            spl.x       = master.x
+            spl._arccos = False 
+            spl.y       = y
+            spl._set_coefficients (h, y, M[:,k])
+            splines.append (spl)
+        return splines
+
+
+    def _init_knots (self, x, ny : int, boundary, arccos):
+        # sets the knots x of self and returns the differences h of the knots 
+
+        x = np.asarray (x, dtype=float)
         n = len(x)
 
         if boundary == 'notaknot' and n < 4:
             raise ValueError("Spline: 'notaknot' must have at least 4 points")
         elif n < 3:
             raise ValueError('Spline: Must have at least 3 points')
-        if n != len(y): 
+        if n != ny: 
             raise ValueError('Spline: Length of x,y is different')
             
         if arccos:           # test of a arccos distribution to avoid oscillation at LE          
@@ -142,19 +302,27 @@ class Spline1D:
             self.x = x
             self._arccos = False 
 
-        # keep for later evaluation 
-        self.y = y
-
         # only delta x will be relevant 
         h = np.diff(self.x,1)                        # the differences hi = xi+1 - xi  (length n-1)
         if np.amin(h) <= 0.0: 
             raise ValueError('Spline: x is not strictly increasing')
+        return h
+
+
+    def _calc_M (self, h, y, boundary):
+        # returns the 2nd derivatives M at the knots 
+        #   y may be 1D or 2D having a right hand side in each column 
+
+        n = len(h) + 1
+
+        # as the rhs may be 2D, hc is h as column vector for broadcasting 
+        hc = h.reshape ((-1,) + (1,) * (y.ndim - 1))
 
         # build the tridiagonal matrix with simple, natural boundary condition
         A, B, C = self._build_tridiagonalArrays (n, h)
 
         # build the right hand side 
-        D = self._build_targetArray (n, h, y)
+        D = self._build_targetArray (n, hc, y)
 
         # boundary conditions - overwrite boundaries of A, B, C, D
 
@@ -193,25 +361,20 @@ class Spline1D:
             
         # print_array1D (h,"h") ; 
         # print_array1D (A,"A"); print_array1D (B,"B"); print_array1D (C, "C"); print_array1D (D, "D") 
+        return M
 
-        # extract coefficients of polynoms
-        self.a = np.zeros (n-1)
-        self.b = np.zeros (n-1)
-        self.c = np.zeros (n-1)
-        self.d = np.zeros (n-1)
-        for i in range(n-1):
-
-            #  a1 = y1
-            #  b1 = b(0) = C'(0) = -M0*h1/2 + (y1-y0)/h1 - (M1-M0)*h1/6 
-            #  c1 = M-1 / 2     
-            #  d1 = (M1 - M1) / (6 * h1)    
-             
-            self.a[i] = y[i]
-            self.b[i] = (y[i+1] - y[i]) / h[i]  - h[i] * (3 * M[i] +  (M[i+1] - M[i])) / 6 
-            self.c[i] = M[i] / 2
-            self.d[i] = (M[i+1]-M[i]) / (6 * h[i])
 
-            # print ("i:%d  a=%6.2f  b=%6.2f  c=%6.2f  d=%6.2f " % (i, self.a[i] , self.b[i] , self.c[i] , self.d[i] ))
+    def _set_coefficients (self, h, y, M):
+        # extract coefficients of polynoms - all segments at once 
+        #  a = y0
+        #  b = b(0) = C'(0) = -M0*h1/2 + (y1-y0)/h1 - (M1-M0)*h1/6 
+        #  c = M0 / 2     
+        #  d = (M1 - M0) / (6 * h1)    
+
+        self.a = np.array (y[:-1], dtype=float)
+        self.b = (y[1:] - y[:-1]) / h  - h * (3 * M[:-1] +  (M[1:] - M[:-1])) / 6 
+        self.c = M[:-1] / 2
+        self.d = (M[1:] - M[:-1]) / (6 * h)
 
 
     def _build_tridiagonalArrays (self, n: int, h ):
@@ -227,12 +390,9 @@ class Spline1D:
         B = np.empty(n); B.fill(2.0)
 
         A = np.zeros (n-1) 
-        for i in range(n-2):                    
-            A[i] = h[i]  / (h[i] + h[i+1])
+        A[:n-2] = h[:-1] / (h[:-1] + h[1:])
 
-        C = np.zeros (n-1) 
-        for i in range(n-1):                  
-            C[i] = h[i]  / (h[i-1] + h[i])
+        C = h / (np.roll(h,1) + h)             # C[0] is a dummy - set by boundary condition 
 
         return A, B, C
 
@@ -243,13 +403,12 @@ class Spline1D:
         #   https://en.wikipedia.org/wiki/Divided_differences
         
         #   d0                            D - rhs array length n
-        #   d1
+        #   d1                                (or n x k for k right hand sides)
         #   d2 
 
-        D = np.zeros(n)
-        for i in range(1, n - 1): 
-            D[i] = 6.0 * ((y[i + 1] - y[i]) / (h[i]) - (y[i] - y[i-1]) / (h[i-1])) / \
-                         (h[i] + h[i-1])        
+        D = np.zeros(y.shape)
+        D[1:-1] = 6.0 * ((y[2:] - y[1:-1]) / h[1:] - (y[1:-1] - y[:-2]) / h[:-1]) / \
+                        (h[1:] + h[:-1])        
         return D
 
 
@@ -257,59 +416,21 @@ class Spline1D:
         # solves the tridiagonal system ABC * M = D  
         #
         # when reduced the inner (n-2) x (n-2) matrix is solved (need for not a knot)
-        ''''
-        TDMA solver, a b c d can be NumPy array type or Python list type.
-        refer to http://en.wikipedia.org/wiki/Tridiagonal_matrix_algorithm
-        and to http://www.cfd-online.com/Wiki/Tridiagonal_matrix_algorithm_-_TDMA_(Thomas_algorithm)
-        '''
-        if reduced: 
-            di = 1
-        else:
-            di = 0 
-
-        # https://gist.github.com/cbellei/8ab3ab8551b8dfc8b081c518ccd9ada9
+        #   - M[0] and M[-1] are undefined then 
+        # D may hold several right hand sides as columns which are solved together 
 
-        iEnd = len(D) - di  # number of equations
+        di = 1 if reduced else 0
+        iEnd = len(D) - di 
 
-        ac, bc, cc, dc = map(np.array, (A, B, C, D)) # copy arrays
-        for it in range(1+di, iEnd):
-            mc = ac[it-1]/bc[it-1]
-            bc[it] = bc[it] - mc*cc[it-1] 
-            dc[it] = dc[it] - mc*dc[it-1]
-                    
-        M = bc
-        M[-1-di] = dc[-1-di]/bc[-1-di]
-
-        for il in range(iEnd-2, -1+di, -1):
-            M[il] = (dc[il]-cc[il]*M[il+1])/bc[il]
-
-        return M
-
-
-    def _solve_tridiagonalsystem2 (self, A, B, C, D):
-        # solves the tridiagonal system ABC * M = D  
-        ''''
-        TDMA solver, a b c d can be NumPy array type or Python list type.
-        refer to http://en.wikipedia.org/wiki/Tridiagonal_matrix_algorithm
-        and to http://www.cfd-online.com/Wiki/Tridiagonal_matrix_algorithm_-_TDMA_(Thomas_algorithm)
-        '''
-        nf = len(D) # number of equations
-        ac, bc, cc, dc = map(np.array, (A, B, C, D)) # copy arrays
-        for it in range(1+1, nf-1):
-            mc = ac[it-1]/bc[it-1]
-            bc[it] = bc[it] - mc*cc[it-1] 
-            dc[it] = dc[it] - mc*dc[it-1]
-                    
-        M = bc
-        M[-2] = dc[-2]/bc[-2]
-
-        for il in range(nf-3, -1+1, -1):
-            M[il] = (dc[il]-cc[il]*M[il+1])/bc[il]
+        a = A[di:iEnd-1]                        # sub diagonal   of (reduced) system 
+        b = B[di:iEnd]                          # diagonal 
+        c = C[di:iEnd-1]                        # super diagonal 
 
+        M = np.zeros (D.shape)
+        M[di:iEnd] = solve_tridiagonal (a, b, c, D[di:iEnd])
         return M
 
 
-
     def eval (self, x, der=0):
         """
         Evaluate self or its derivatives.
@@ -322,17 +443,168 @@ class Spline1D:
 
         Returns
         -------
-        y : ndarray or list of ndarrays
+        y : Scalar or ndarray 
             An array of values representing the spline function evaluated at
             the points in ``x``.  .
         """
 
-        if isinstance(x, float): 
-            return self._eval (x, der=der) 
-        else: 
-            f = np.zeros (np.size(x))
-            for i, xi in enumerate (x): f[i] = self._eval (xi, der=der) 
-            return f 
+        if isinstance(x, float) or np.isscalar(x): 
+            return self._eval (x, der=der)                          # optimizers evaluate single values
+
+        x = np.clip (np.asarray (x, dtype=float), self.x[0], self.x[-1])
+
+        if self._arccos: 
+            x = np.arccos(1.0 - x) * 2.0 / np.pi                   # acos(1.d0 - x(i)) * 2.d0 / pi 
+
+        # get the indices j of x in the function intervals of self - all at once
+        j = np.minimum (np.searchsorted (self.x, x, side='right') - 1, len(self.x) - 2)
+        z = (x - self.x[j])                # relative coordinate within interval 
+
+        a, b, c, d = self.a[j], self.b[j], self.c[j], self.d[j]
+
+        if   der == 0: f = a + b * z + c * z**2 + d * z**3
+        elif der == 1: f = b + 2 * c * z + 3 * d * z**2
+        elif der == 2: f = 2 * c + 6 * d * z
+        else:          f = np.zeros_like (z) 
+
+        return f 
+
+
+    def extrema (self):
+        """
+        Evaluate the local extrema (minima and maxima) of self.
+
+        For each cubic segment the roots of its quadratic derivative are calculated
+        analytically - all segments at once.
+
+        Returns
+        -------
+        x, y : ndarrays - position and value of the extrema in ascending x
+        """
+
+        # derivative of segment  b + 2c z + 3d z**2 = 0
+        z1, z2 = _quadratic_roots (3 * self.d, 2 * self.c, self.b)
+
+        x, y = self._segment_points (np.concatenate ((z1, z2)))
+
+        # only extrema where the sign of the derivative changes
+        ddy = self.eval (x, der=2)
+        keep = ddy != 0.0
+        return x[keep], y[keep]
+
+
+    def roots (self, value=0.0):
+        """
+        Evaluate all x where self(x) = value.
+
+        The cubic of each segment is solved analytically with the eigenvalues of
+        its companion matrix - all segments at once.
+
+        Parameters
+        ----------
+        value : Scalar - the spline value to look for
+
+        Returns
+        -------
+        x : ndarray - x values in ascending order
+        """
+
+        a = self.a - value
+        nseg = len(a)
+
+        z = np.full ((nseg, 3), np.nan)
+
+        # cubic segments - roots are the eigenvalues of the companion matrix
+        cubic = self.d != 0.0
+        if np.any (cubic):
+            d = self.d[cubic]
+            companion = np.zeros ((len(d), 3, 3))
+            companion [:, 0, :] = - np.column_stack ((self.c[cubic], self.b[cubic], a[cubic])) / d[:,None]
+            companion [:, 1, 0] = 1.0
+            companion [:, 2, 1] = 1.0
+            eig = np.linalg.eigvals (companion)
+            eig = np.where (np.abs (eig.imag) <= 1e-12 * (1.0 + np.abs (eig.real)), eig.real, np.nan)
+            z[cubic] = eig
+
+        # degenerated segments are quadratic or linear
+        quad = ~cubic
+        if np.any (quad):
+            z[quad, 0], z[quad, 1] = _quadratic_roots (self.c[quad], self.b[quad], a[quad])
+
+        x, y = self._segment_points (z.T.ravel())
+        return x
+
+
+    def _segment_points (self, z):
+        """
+        returns x, y of relative coordinates z of all segments (z is a concatenation
+        of arrays each having the length of segments) - only points within segment
+        """
+
+        nseg = len(self.a)
+        j = np.tile (np.arange (nseg), len(z) // nseg)
+        h = np.diff (self.x)
+
+        # only z within segment - last segment includes the end
+        inside = np.isfinite (z) & (z >= 0.0) & (z < h[j])
+        inside |= np.isfinite (z) & (j == nseg - 1) & np.isclose (z, h[j], rtol=0.0, atol=1e-12)
+        j, z = j[inside], z[inside]
+
+        x = self.x[j] + z
+        y = self.a[j] + self.b[j] * z + self.c[j] * z**2 + self.d[j] * z**3
+
+        if self._arccos: 
+            x = 1.0 - np.cos (x * np.pi / 2.0)              # inverse of arccos distribution 
+
+        x, iUnique = np.unique (x, return_index=True)
+        return x, y[iUnique]
+
+
+    def solve (self, value, bounds=None, epsilon=1e-12, max_iter=50):
+        """
+        Inverse of self - evaluates x where self(x) = value.
+        Self must be monotone within bounds. 
+
+        The bracketing knot interval of each value is found by 'searchsorted', 
+        then all values are solved together with a bracketed Newton iteration. 
+
+        Parameters
+        ----------
+        value : Scalar or an array of spline values 
+        bounds : (x_start, x_end) - optional - the part of self to look at
+        epsilon : tolerance of the spline value 
+        max_iter : max number of iterations 
+
+        Returns
+        -------
+        x : Scalar or ndarray - x values with self(x) = value
+        """
+
+        isScalar = np.isscalar (value)
+        value    = np.atleast_1d (np.asarray (value, dtype=float))
+
+        x_start, x_end = bounds if bounds is not None else (self.x[0], self.x[-1])
+
+        # the knots within bounds are the possible brackets 
+        xk = self.x [(self.x > x_start) & (self.x < x_end)]
+        xk = np.concatenate (([x_start], xk, [x_end]))
+        fk = self.eval (xk)
+        sign = 1.0 if fk[-1] >= fk[0] else -1.0             # monotone increasing or decreasing
+
+        value = np.clip (value, np.min (fk), np.max (fk))    # no solution outside 
+
+        j  = np.clip (np.searchsorted (sign * fk, sign * value) - 1, 0, len(xk) - 2)
+
+        # start value - linear interpolation within bracket 
+        df = fk[j+1] - fk[j]
+        t  = np.divide (value - fk[j], df, out=np.full_like (value, 0.5), where=(df != 0.0))
+        x0 = xk[j] + np.clip (t, 0.0, 1.0) * (xk[j+1] - xk[j])
+
+        x, niter = newton_bracketed (lambda x: self.eval (x) - value, 
+                                     lambda x: self.eval (x, der=1), 
+                                     xk[j], xk[j+1], x0=x0, epsilon=epsilon, max_iter=max_iter)
+
+        return x[0] if isScalar else x
 
 
     def _eval (self, x, der=0):
@@ -354,7 +626,6 @@ class Spline1D:
 
         if self._arccos: 
             x = np.arccos(1.0 - x) * 2.0 / np.pi                   # acos(1.d0 - x(i)) * 2.d0 / pi 
-            # copy x???        
 
         # get the index j of x in the function intervals of self 
         j = min(bisect.bisect(self.x, x)-1, len(self.x) -2)
@@ -426,8 +697,8 @@ class Spline2D:
         self.u[0]  = self.u[0].round(10)
         self.u[-1] = self.u[-1].round(10)
         
-        self.splx = Spline1D(self.s, x, boundary=boundary)
-        self.sply = Spline1D(self.s, y, boundary=boundary)
+        # x and y spline share the knots s - solve both with one elimination
+        self.splx, self.sply = Spline1D.batch (self.s, [x, y], boundary=boundary)
 
 
     def _calc_s(self, x, y):
@@ -499,6 +770,30 @@ class Spline2D:
         return self.sply.eval (s, der=der)
 
 
+    def eval_u_on_x (self, x, bounds=None):
+        """
+        Evaluate u having x - inverse of evalx. 
+        x(u) must be monotone within bounds like the upper or lower side of an airfoil
+
+        Parameters
+        ----------
+        x :   Scalar or an array of x values 
+        bounds : (u_start, u_end) - optional - the range of u to look at 
+
+        Returns
+        -------
+        u : Scalar or an array of normed arc length 0..1 
+        """
+
+        s0, s1 = self.s[0], self.s[-1]
+        if bounds is not None: 
+            bounds = (s0 + bounds[0] * (s1 - s0), s0 + bounds[1] * (s1 - s0))
+
+        s = self.splx.solve (x, bounds=bounds)
+
+        return (s - s0) / (s1 - s0)
+
+
     def curvature (self, u):
         """
         Evaluate the curvature of self at u 0..1
@@ -570,12 +865,67 @@ class Spline2D:
 def Ni(n,i): 
     return math.factorial(n) / (math.factorial(i) * math.factorial(n-i))
 
+# Binomial Coefficients of degree n as array - cached 
+@lru_cache (maxsize=None)
+def Ni_array (n): 
+    ni = np.array ([Ni(n, i) for i in range(n+1)])
+    ni.flags.writeable = False
+    return ni
+
 # Bernstein Basis Polynomial 
 def basisFunction (n, i, u):
     J = np.array (Ni(n, i) * (u ** i) * (1 - u) ** (n - i))
     return J 
 
 
+# Bernstein basis matrix for all control points - cached 
+#
+#   As typically the same u distribution is evaluated again and again while only 
+#   the control points change (dragging, matching) the basis matrix is cached.
+#   A Bezier evaluation becomes a single matrix vector product  B @ p  
+
+BASIS_CACHE_SIZE = 32                           # max number of cached basis matrices 
+
+_basis_cache = {}
+
+def basisMatrix (n, u, cache=True) -> np.ndarray:
+    """
+    Bernstein basis matrix of degree n evaluated at u 
+
+    Parameters
+    ----------
+    n : degree of Bezier - for the derivative der of a Bezier with degree n 
+        it's the basis of degree n-der 
+    u : array of parameter 0..1 
+    cache : bool, optional - use cache. Switch off for u values which won't be 
+        evaluated again (e.g. within an iteration) 
+
+    Returns
+    -------
+    B : ndarray (len(u), n+1) with B[j,i] = basisFunction (n, i, u[j])
+    """
+
+    u   = np.asarray (u, dtype=float)
+
+    if cache: 
+        key = (n, len(u), hash (u.tobytes()))
+        B = _basis_cache.get (key)
+    else: 
+        B = None 
+
+    if B is None: 
+        i  = np.arange (n+1)
+        uc = u[:, np.newaxis]
+        B  = Ni_array(n) * (uc ** i) * (1 - uc) ** (n - i)
+
+        if cache: 
+            if len(_basis_cache) >= BASIS_CACHE_SIZE:
+                _basis_cache.clear ()
+            B.flags.writeable = False
+            _basis_cache [key] = B
+    return B 
+
+
 # class for evaluating Bezier 
 
 class Bezier: 
@@ -742,14 +1092,17 @@ class Bezier:
 
         Parameters
         ----------
-        x :   Scalar - x-value 
+        x :   Scalar or array - x-value(s) 
         fast : bool, optional - only a linear interpolation of u is made .
 
         Returns
         -------
-        y : Scalar - y evaluated at x 
+        y : Scalar or array - y evaluated at x 
         """
 
+        if not np.isscalar (x): 
+            return self._eval_y_on_x_array (x, fast=fast, epsilon=epsilon)
+
         if fast and (not self._x is None) and (x >= self._x[0] and x <= self._x[-1]):
 
             # find closest index
@@ -787,6 +1140,53 @@ class Bezier:
         
 
 
+    def _eval_y_on_x_array (self, x, fast=True, epsilon=10e-10):
+        # eval_y_on_x for an array of x - u(x) is inverted for all x at once 
+
+        u = self.eval_u_on_x (x, fast=fast, epsilon=epsilon)
+        return self._eval_1D (self._py, u, cache=False)
+
+
+    def eval_u_on_x (self, x, fast=True, epsilon=10e-10):
+        """
+        Evaluate the parameter u values based on an array of x 
+
+        Parameters
+        ----------
+        x :   array - x-values 
+        fast : bool, optional - only a linear interpolation of u in the cached u,x table 
+               is made. Otherwise (or if there is no cached table) a vectorized newton 
+               iteration is made starting from the interpolated u.
+
+        Returns
+        -------
+        u : array - u evaluated at x 
+        """
+
+        x = np.asarray (x, dtype=float)
+        u = np.clip (x, 0.05, 0.95)                     # default start value for newton 
+
+        if self._x is not None:
+            inTable = np.logical_and (x >= self._x[0], x <= self._x[-1])
+
+            # find closest indices and interpolate u 
+            i = np.minimum (np.searchsorted (self._x, x, side='right') - 1, len(self._x) - 2)
+            i = np.maximum (i, 0)
+            u_lin = ((self._u[i+1]-self._u[i])/(self._x[i+1]-self._x[i])) * (x - self._x[i]) + self._u[i]
+            u[inTable] = u_lin[inTable]
+        else: 
+            inTable = np.zeros (len(x), dtype=bool)
+
+        toSolve = np.logical_not (inTable) if fast else np.ones (len(x), dtype=bool)
+
+        if np.any (toSolve): 
+            xs = x[toSolve]
+            u[toSolve], niter = newton_array (lambda u: self._eval_1D(self._px,u, cache=False) - xs,
+                                              lambda u: self._eval_1D(self._px,u, der=1, cache=False), u[toSolve], 
+                                              epsilon=epsilon, max_iter=20, bounds=(0.0,1.0))
+        return u
+
+
     def eval_x_on_y (self, y, fast=True):
         """
         Evaluate the x value based on y 
@@ -858,7 +1258,7 @@ class Bezier:
     # -------------  end public --------------------
 
 
-    def _eval_1D (self, pxy, u, der=0):
+    def _eval_1D (self, pxy, u, der=0, cache=True):
         #
         #                    Bezier Core
         #
@@ -866,20 +1266,15 @@ class Bezier:
         #   pxy:  either x or y coordinates of the bezier control points
         #   u:    Scalar or an array of normed arc length 0..1 at which to return bezier value
         #   der:  optional derivative - either 0,1 or 2 
+        #   cache: cache basis matrix of u - switch off for one time u arrays (iterations)
 
         if u is None or (np.isscalar(u) and (u > 1.0 or u < 0.0)):
             raise ValueError ("Bezier: parameter u = %s not valid " %u)
 
-        # init result (array)
-        if np.isscalar(u):
-            bezier = 0.0
-        else: 
-            bezier = np.zeros (np.size(u))
-
         # http://math.aalto.fi/~ahniemi/hss2012/Notes06.pdf
 
         n = np.size(pxy) - 1                            # n - degree of Bezier 
-        weights = deepcopy(pxy)                         # der = 0: weights = points 
+        weights = np.asarray (pxy, dtype=float)         # der = 0: weights = points 
         if der > 0:                                     
             weights = np.ediff1d(weights) * n           # new weight = difference * n 
             n = n - 1                                   # lower 1 degree 
@@ -887,20 +1282,17 @@ class Bezier:
             weights = np.ediff1d(weights) * n           # new weight = difference * n                           
             n = n - 1                                   # lower 1 degree 
 
-        # test self.basisFn = []   
-    
-        for i in range (len(weights)):
-            
-            # collect bernstein Polynomial self.basisFn.append (basisFunction(n, i, u))  
-
-            bezier += basisFunction(n, i, u) * weights[i] 
+        if np.isscalar(u):                              # single value e.g. newton iteration 
+            i = np.arange (n+1)
+            bezier = np.dot (Ni_array(n) * (u ** i) * (1 - u) ** (n - i), weights)
+        else: 
+            bezier = basisMatrix (n, u, cache=cache) @ weights   # cached basis 
 
         return bezier
 
 
 
 
-
 # ------------ test functions - to activate  -----------------------------------
 
 
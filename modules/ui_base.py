@@ -8,7 +8,7 @@ Highlevel abstract base classes for UI like Dialog, Edit frame or DIagram frame
 from tkinter import Frame
 import customtkinter as ctk
 from widgets            import *
-from common_utils       import fromDict, toDict
+from common_utils       import fromDict, toDict, ErrorMsg
 
 # Diagram abstract 
 import matplotlib.pyplot as plt
@@ -242,6 +242,75 @@ class Eval_With_ToolWindow (ctk.CTkToplevel):
         self.destroy()
 
 
+class Eval_Parallel_With_ToolWindow (Eval_With_ToolWindow):
+    """ evals several independent functions in parallel and shows a tool window during excution
+    
+    The functions are executed in a process pool. When a function has finished, its 
+    result is posted back to the tk main loop calling the resultFn of the function."""
+
+    def __init__(self, master : ctk.CTkFrame, 
+                 jobs : list,                  
+                 message: str, 
+                 width: int = 300, height: int = 150):
+        """evals the functions of jobs in parallel and shows a tool window during excution
+
+        Args:
+            master: parent frame 
+            jobs: list of tuples (functionFn, args, resultFn) - functionFn is called with 
+                  args in a seperate process, resultFn is called with the result of functionFn. 
+                  functionFn and args must be picklable  
+            message (str): message text during execution.
+            width  (optional): width of tool window. Defaults to 300.
+            height (optional): height of tool window. Defaults to 150.
+        """
+
+        self._jobs     = jobs
+        self._executor = None
+        self._futures  = {}                         # running future: resultFn 
+
+        super().__init__(master, None, message, width=width, height=height)
+
+
+    def _run_function (self):
+        """ submit the jobs to a process pool ..."""
+        from concurrent.futures import ProcessPoolExecutor
+
+        self._executor = ProcessPoolExecutor (max_workers=len(self._jobs))
+        for functionFn, args, resultFn in self._jobs:
+            future = self._executor.submit (functionFn, *args)
+            self._futures [future] = resultFn
+
+        # now poll if jobs are still running 
+        self.after (300, self._check_running)
+
+
+    def _check_running (self):
+        """ post results of finished jobs - if some are still running start next poll """
+
+        for future in [f for f in self._futures if f.done()]:
+            resultFn = self._futures.pop (future)
+            try: 
+                result = future.result()
+            except Exception as e:
+                ErrorMsg (f"Parallel execution failed: {e}")
+            else: 
+                resultFn (result)
+
+        if self._futures:
+
+            # if message is a function - do live update 
+            if callable(self._message):
+                self._msg_widget.configure(text=self._message())
+                self.update()
+
+            # set next poll 
+            self.after (300, self._check_running)
+        else: 
+            self._executor.shutdown (wait=False)
+            self._close()
+
+
+
 #-------------------------------------------------------------------------------
 #  Messagebox   
 #-------------------------------------------------------------------------------
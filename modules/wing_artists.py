@@ -365,8 +365,15 @@ class Planform_Artist (Artist):
     
         self._halfwingspan_sav = self.planform.halfwingspan
 
-        # planform outline 
-        y, x = self.planform.linesPolygon()
+        # planform outline - of the wing taken from the snapshot of the current revision 
+        if self._planform is None:
+            snapshot = self.model.snapshot()
+            y, x   = snapshot.outline_y, snapshot.outline_x
+            yh, hinge = snapshot.hinge_y, snapshot.hinge_x
+        else:
+            y, x   = self.planform.linesPolygon()
+            yh, hinge = self.planform.hingeLine()
+
         p = self.ax.plot(y, x,  '-', color=cl_planform, label= "Planform")  
         self._add (p)
         # planform outline for movement
@@ -377,7 +384,6 @@ class Planform_Artist (Artist):
         self._add(p)
 
         # hinge line
-        yh, hinge = self.planform.hingeLine()
         p = self.ax.plot(yh, hinge,   '-', linewidth=0.8, label="Hinge line", color='springgreen')
         self._add (p)
         # hinge line animated for movement
@@ -647,15 +653,17 @@ class Wing_Artist (Artist):
 
     def _plot(self):
     
+        snapshot = self.wing.snapshot()                 # geometry of the current revision 
+
         # planform outline 
-        x, y = self.planform.linesPolygon()
-        area, aspectRatio = self.planform.calc_area_AR (x,y)
+        x, y = snapshot.outline_y, snapshot.outline_x
+        area, aspectRatio = snapshot.area, snapshot.aspectRatio
 
         # hinge line
-        yh, hinge = self.planform.hingeLine()
+        yh, hinge = snapshot.hinge_y, snapshot.hinge_x
 
         # flaaps
-        flaps = self.planform.wing.getFlaps()
+        flaps = snapshot.flaps
 
         for mirror in [1, -1]:
 
@@ -768,7 +776,8 @@ class ChordLines_Artist (Artist):
             y, chord = self.planform.norm_chord_line ()
             quarterChord = chord/4
         else:
-            y, leadingEdge, trailingEdge = self.planform.lines()
+            snapshot = self.model.snapshot()
+            y, leadingEdge, trailingEdge = snapshot.y, snapshot.le, snapshot.te
             quarterChord = leadingEdge + (trailingEdge - leadingEdge)/4
 
         p = self.ax.plot(y, quarterChord, '--', color= cl_quarter, linewidth=0.7, label="Chord lines")
@@ -898,7 +907,8 @@ class PaneledPlanform_Artist (Planform_Artist):
     def _plot(self):
 
         # le and te of the original planform 
-        y, leadingEdge, trailingEdge = self.planform.lines()
+        snapshot = self.model.snapshot()
+        y, leadingEdge, trailingEdge = snapshot.y, snapshot.le, snapshot.te
         lw = 0.7
         p = self.ax.plot(y, leadingEdge,  '--', lw=lw, color=cl_planform)
         self._add (p)
@@ -1312,7 +1322,7 @@ class Flap_Artist (Artist):
         """ do plot of wing sections in the prepared axes   
         """
 
-        flaps = self.wing().getFlaps()
+        flaps = self.wing().snapshot().flaps
 
         n = len(flaps)                   # Number of colors
         if n < 2: n= 2
@@ -10,6 +10,7 @@
         |-- Planform                    - describes geometry, outline of the wing  
         |     (ellipsoid, trapezoid, straightTE, DXF)
         |-- Flap                        - the outline of a flap - dynamically created based on flap group
+        |-- PlanformSnapshot            - the geometry of planform, flaps, sections of a wing revision
         |
         |-- refPlanform                 - a ellipsoid reference planform 
         |-- refPlanform_DXF             - a DXF based reference planform 
@@ -26,6 +27,7 @@ import bisect
 import json
 import sys
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from math_util import findRoot, interpolate
 
 
@@ -70,6 +72,9 @@ class Wing:
 
         self.dataDict = dataDict
 
+        self._revision        = 0                       # increased with each change of wing geometry
+        self._snapshot        = None                    # PlanformSnapshot of the current revision
+
         self._name            = fromDict (dataDict, "wingName", "My new Wing", wingExists)
         self._wingspan        = fromDict (dataDict, "wingspan", 2000.0, wingExists) 
         self._rootchord       = fromDict (dataDict, "rootchord", 200.0, wingExists)
@@ -182,6 +187,7 @@ class Wing:
             newPlanform.assignToWing()              # get hinge and flap from dxf 
         # we got it 
         self._planform = newPlanform
+        self._changed()
 
 
     @property
@@ -202,6 +208,7 @@ class Wing:
             section : WingSection
             for section  in self.wingSections:    # all sections within new half wing span
                 section.adjustToWing (oldSpan)
+            self._changed()
             self.wingSections_reSort()
 
     @property
@@ -211,6 +218,7 @@ class Wing:
         if (newChord > 10.0):
             self._rootchord = newChord
             self.rootSection.adjustToWing()
+            self._changed()
             self.wingSections_reSort()
 
     @property
@@ -220,6 +228,7 @@ class Wing:
         if (newChord > 1.0):
             self._tipchord = newChord
             self.tipSection.adjustToWing()
+            self._changed()
             self.planform.refresh()             # e.g. update Bezier curve        
             self.wingSections_reSort()
 
@@ -231,14 +240,19 @@ class Wing:
         newAngle = max (newAngle,-10)
         newAngle = min (newAngle, 45)
         self._hingeAngle = newAngle
+        self._changed()
 
     @property
     def flapDepthRoot(self): return self._flapDepthRoot
-    def set_flapDepthRoot(self, newDepth): self._flapDepthRoot = newDepth
+    def set_flapDepthRoot(self, newDepth): 
+        self._flapDepthRoot = newDepth
+        self._changed()
 
     @property
     def flapDepthTip(self): return self._flapDepthTip
-    def set_flapDepthTip(self, newDepth): self._flapDepthTip = newDepth
+    def set_flapDepthTip(self, newDepth): 
+        self._flapDepthTip = newDepth
+        self._changed()
 
     @property
     def wingSections (self) -> list:
@@ -310,6 +324,24 @@ class Wing:
         return self.pathHandler.workingDir
 
 
+    @property
+    def revision (self) -> tuple: 
+        """ revision of wing and planform - changes with each modification of the geometry"""
+        return (self._revision, self.planform.revision)
+
+    def _changed (self):
+        """ wing data or wing sections changed - the snapshot will be rebuild"""
+        self._revision += 1
+
+
+    def snapshot (self) -> 'PlanformSnapshot':
+        """ the geometry of planform, flaps and sections of the current revision - memoized"""
+
+        if self._snapshot is None or self._snapshot.revision != self.revision: 
+            self._snapshot = PlanformSnapshot (self)
+        return self._snapshot
+
+
     # ---Methods --------------------- 
 
 
@@ -397,6 +429,7 @@ class Wing:
             newSection = WingSection (self, {"norm_chord": new_norm_chord})
             newSection.set_flapGroup (aSection.flapGroup)
             self.wingSections.insert(aSection_index+1,newSection)
+            self._changed()
         return newSection
 
 
@@ -408,6 +441,7 @@ class Wing:
         """
         if aSection and not aSection.isRoot and not aSection.isTip:
             self.wingSections.remove (aSection) 
+            self._changed()
         return 
 
 
@@ -496,6 +530,7 @@ class Wing:
             they have fixed yPos and chord mixed    """
 
         self._wingSections.sort (key=lambda sec: sec.yPos) 
+        self._changed()
     
 
     def wingSectionIndexOf (self, aSection):
@@ -585,18 +620,30 @@ class Wing:
                 sec.airfoil.do_strak(leftSec.airfoil,  rightSec.airfoil, blendBy, geometry)
 
 
-    def do_export_airfoils (self,toDir, useNick=True, teGap_mm = None): 
+    def do_export_airfoils (self,toDir, useNick=True, teGap_mm = None, concurrent=True): 
         """
         exports all also straked airfoils into directory 'toDir'. 
         Optionally use airfoils Nickname as new airfoil name.
-        Optionally a te gap in mm can be set for all exported airfoils"""
-        fileList  = []
+        Optionally a te gap in mm can be set for all exported airfoils
+        If concurrent, the airfoils of the sections are written in parallel threads"""
         
         self.do_strak (geometry=GEO_SPLINE)          # ensure strak airfoils are uptodate and splined (quality) 
 
-        sec: WingSection
-        for sec in self.wingSections:
-            fileList.append (sec.do_export_airfoil (toDir, useNick=useNick, teGap_mm = teGap_mm))
+        os.makedirs (toDir, exist_ok=True)
+
+        exportFn = lambda sec: sec.do_export_airfoil (toDir, useNick=useNick, teGap_mm = teGap_mm)
+
+        if concurrent and len(self.wingSections) > 1: 
+            with ThreadPoolExecutor () as executor:
+                fileList = list (executor.map (exportFn, self.wingSections))
+
+            # sections with the same airfoil file - the last one wins like in sequence 
+            lastSections = {fileName: sec for fileName, sec in zip (fileList, self.wingSections)}
+            for fileName, sec in lastSections.items():
+                if fileList.count (fileName) > 1: 
+                    exportFn (sec)
+        else: 
+            fileList = [exportFn (sec) for sec in self.wingSections]
         return fileList
 
 
@@ -666,6 +713,9 @@ class Planform:
 
         self.wing   = myWing
 
+        self._revision    = 0                           # increased when the chord distribution changed
+        self._chordLookup = None                        # lookup table chord -> y of a revision 
+
         # self.__class__.instances.append(weakref.proxy(self))
         if dataDict:                                    # no info for internal planforms
             InfoMsg (' ' + str(self)  + ' created')
@@ -746,6 +796,15 @@ class Planform:
     @property
     def isValid (self):         return self._isValid         # to overwrite
 
+    @property
+    def revision (self) -> int: 
+        """ revision of the planform parameters - increased with each change"""
+        return self._revision
+
+    def _changed (self):
+        """ planform parameters changed - cached values will be rebuild"""
+        self._revision += 1
+
 
     def _save (self, dataDict):
         """ stores the variables into the dataDict"""
@@ -779,7 +838,7 @@ class Planform:
 
     def norm_chord_function (self, y_norm, fast=False):
         """
-        abstract: returns the normalized chord at position yPos 
+        abstract: returns the normalized chord at position yPos - y_norm may be an array
         """
         return 0 
     
@@ -799,14 +858,13 @@ class Planform:
             :chord: array of chord values 
         """
         y       = self._norm_y_points() 
-        chord   = np.empty (y.size)
-        for i in range(y.size): chord[i] = self.norm_chord_function (y[i])
+        chord   = self.norm_chord_function (y)
         return y, chord
 
 
     def _planform_function (self, y):
         """
-        implemented in subclass
+        implemented in subclass - y may be scalar or array 
         """
         leadingEdge = 0.0
         trailingEdge = 0.0
@@ -814,6 +872,33 @@ class Planform:
         return leadingEdge, trailingEdge
 
 
+    def _hinge_le_te (self, y, chord, flapDepth):
+        """
+        leading and trailing edge at y defined by the hinge line and the flap depth
+
+        Args:
+            :y: the y-Position(s) in the planform 0.. halfSpanWidth 
+            :chord: chord length(s) at y 
+            :flapDepth: flap depth(s) at y 
+        Returns:
+            :leadingEdge:  ...-point(s) at y
+            :trailingEdge: ...-point(s) at y
+        """
+        hingeRootx   = (1-(self.flapDepthRoot/100)) * self.rootchord
+        hingeTipx    = hingeRootx + np.tan((self.hingeAngle/180) * np.pi) * self.halfwingspan
+
+        hinge        = (hingeTipx-hingeRootx)/(self.halfwingspan) * (y) + hingeRootx
+        leadingEdge  = hinge - (chord - flapDepth)
+        trailingEdge = leadingEdge + chord
+
+        return leadingEdge, trailingEdge
+
+
+    def _hingeDepth (self, y):
+        """ hinge depth in percent at y(s) - linear between root and tip"""
+        return self.flapDepthRoot + (self.flapDepthTip - self.flapDepthRoot) * (y / self.halfwingspan)
+
+
     def lines (self):
         """
         returns the major lines leading and trailing edge as arrays  
@@ -823,10 +908,7 @@ class Planform:
             :trailingEdge: array of x coordinates (chord direction)
         """
         y = self._norm_y_points() * self.halfwingspan
-        leadingEdge  = np.empty (y.size)
-        trailingEdge = np.empty (y.size)
-        for i in range(y.size): 
-            leadingEdge[i], trailingEdge[i] = self._planform_function (y[i])
+        leadingEdge, trailingEdge = self._planform_function (y)
 
         return y, leadingEdge, trailingEdge
 
@@ -913,39 +995,59 @@ class Planform:
             :y:   
         """
 
-        # some kind of bubble search is performed until accuracy is better than epsilon
-        # Should be overloaded for more precision 
+        # a monotone lookup table chord -> y is built once per revision out of the 
+        # dense chord line. The table segment brackets y which is then refined 
+        # with a few regula falsi (illinois) steps 
 
-        epsilon = 0.0001                           # normalized chord accuracy 
         myChord = chord / self.rootchord            # normalize 
 
         if(myChord > 1.0 or myChord < 0): 
             ErrorMsg ("Chord %f must be between 0.0 and root chord" % chord)
             return
 
-        y       = None
-        yLeft   = 0 
-        yRight  = 1
-        chordLeft   = self.norm_chord_function (yLeft,  fast=False)
-        chordRight  = self.norm_chord_function (yRight, fast=False)
-        
-        while y == None:
-            if   (abs (myChord - chordLeft)  < epsilon):
-                y = yLeft 
-                break
-            elif (abs (myChord - chordRight) < epsilon):
-                y = yRight
-                break
-            yMiddle = (yLeft + yRight) / 2 
-            chordMiddle = self.norm_chord_function (yMiddle, fast=False)
-            if (myChord > chordMiddle): 
-                yRight     = yMiddle 
-                chordRight = chordMiddle
-            else:
-                yLeft      = yMiddle
-                chordLeft  = chordMiddle
+        chords, ys, known = self._chord_lookup ()
+
+        if myChord not in known: 
+            i = min (max (np.searchsorted (chords, myChord), 1), len(chords) - 1)
+
+            y_a, f_a = ys[i],   chords[i]   - myChord   # f_a >= 0 
+            y_b, f_b = ys[i-1], chords[i-1] - myChord   # f_b <= 0 
+            y, side  = y_a, 0
+            for _ in range(30):
+                if f_a == f_b: break
+                y   = (y_b * f_a - y_a * f_b) / (f_a - f_b)
+                f_y = self.norm_chord_function (np.atleast_1d (y), fast=False)[0] - myChord
+                if abs(f_y) < 1e-10: break
+                if f_y > 0: 
+                    y_a, f_a = y, f_y
+                    if side == 1: f_b /= 2
+                    side = 1
+                else: 
+                    y_b, f_b = y, f_y
+                    if side == -1: f_a /= 2
+                    side = -1
+            known [myChord] = float(y)
+
+        return known [myChord] * self.halfwingspan
+
+
+    def _chord_lookup (self) -> tuple:
+        """ 
+        returns the lookup table of the current revision 
+            chords: increasing normalized chords  
+            ys: normalized y positions of chords 
+            known: dict of already evaluated chord: y 
+        """
 
-        return y * self.halfwingspan
+        if self._chordLookup is None or self._chordLookup[0] != self._revision: 
+
+            y_norm = np.linspace (0.0, 1.0, 201)
+            chords = self.norm_chord_function (y_norm, fast=False)
+            chords = np.minimum.accumulate (chords)     # ensure monotone decreasing 
+
+            self._chordLookup = (self._revision, np.flip (chords), np.flip (y_norm), {})
+
+        return self._chordLookup[1:]
 
 
 
@@ -1048,6 +1150,7 @@ class Planform_Bezier(Planform):
     def set_p1x(self, aVal): 
         self._px[1] = min (aVal, self._px[0])       # The angle may not become negative as chord value won't be unique!
         self._bezier.set_points (self._py, self._px)
+        self._changed()
         self.wing.wingSections_reSort()             # oder of sections could have changed 
 
     @property
@@ -1055,6 +1158,7 @@ class Planform_Bezier(Planform):
     def set_p1y(self, aVal): 
         self._py[1] = aVal 
         self._bezier.set_points (self._py, self._px)
+        self._changed()
         self.wing.wingSections_reSort()             # oder of sections could have changed 
 
     @property
@@ -1092,6 +1196,7 @@ class Planform_Bezier(Planform):
     def set_p2x(self, aVal): 
         self._px[2] = aVal 
         self._bezier.set_points (self._py, self._px)
+        self._changed()
         self.wing.wingSections_reSort()             # oder of sections could have changed 
 
     @property                                   
@@ -1099,6 +1204,7 @@ class Planform_Bezier(Planform):
     def set_p3x(self, aVal): 
         self._px[3] = aVal 
         self._bezier.set_points (self._py, self._px)
+        self._changed()
         self.wing.wingSections_reSort()             # oder of sections could have changed 
 
     @property                                    
@@ -1128,9 +1234,11 @@ class Planform_Bezier(Planform):
     def set_banana_p1x(self, aVal): 
         self._banana_px[1] = aVal 
         self._banana = None                             # Bezier with cache will be rebuild
+        self._changed()
     def set_banana_p1y(self, aVal): 
         self._banana_py[1] = aVal 
         self._banana = None                             # Bezier with cache will be rebuild
+        self._changed()
 
     def banana_line (self):
         """
@@ -1176,7 +1284,7 @@ class Planform_Bezier(Planform):
         Normally a linear interpolation is done for fast evaulation (fast=True). 
         Higher Precision is achieved with interpolation of the curve (fast=False) 
         Args:
-            :y_norm: the normalized y-Position in the planform 0..1
+            :y_norm: the normalized y-Position in the planform 0..1 - scalar or array
         Returns:
             :chord: the chord 0..1 at y
         """
@@ -1221,10 +1329,7 @@ class Planform_Bezier(Planform):
         y = norm_y * self.halfwingspan
         chord = norm_chord * self.rootchord
 
-        leadingEdge  = np.zeros (y.size)
-        trailingEdge = np.zeros (y.size)
-        for i in range(y.size): 
-            leadingEdge[i], trailingEdge[i] = self._planform_function (y[i], chord=chord[i])
+        leadingEdge, trailingEdge = self._planform_function (y, chord=chord)
 
         return y, leadingEdge, trailingEdge
     
@@ -1234,7 +1339,7 @@ class Planform_Bezier(Planform):
         calculates all relevant geo data of the planform at y 
 
         Args:
-            :y: the y-Position in the planform 0.. halfSpanWidth
+            :y: the y-Position in the planform 0.. halfSpanWidth - scalar or array
             :chord: chord length at y - optional - for optimization 
         Returns:
             :leadingEdge:  ...-point at y
@@ -1247,40 +1352,17 @@ class Planform_Bezier(Planform):
             chord =  self.norm_chord_function (y_norm) * self.rootchord 
 
         # calculate hingeDepth in percent at this particular point along the wing
-        hingeRootx   = (1-(self.flapDepthRoot/100)) * self.rootchord
-        hingeTipx    = hingeRootx + np.tan((self.hingeAngle/180) * np.pi) * self.halfwingspan
-        hingeDepth_y = interpolate(0.0, self.halfwingspan, self.flapDepthRoot, self.flapDepthTip,y)
+        hingeDepth_y = self._hingeDepth (y)
 
         # apply banana (bending of planform) at flapDepth
         flapDepth = (hingeDepth_y/100) * chord + \
                     self._norm_banana_function (y_norm) * self.rootchord 
 
         # finally the main "lines" at position y
-        hinge        = (hingeTipx-hingeRootx)/(self.halfwingspan) * (y) + hingeRootx
-        leadingEdge  = hinge - (chord - flapDepth)
-        trailingEdge = leadingEdge + chord
-
-        return leadingEdge, trailingEdge
+        return self._hinge_le_te (y, chord, flapDepth)
     
 
     
-    def find_yPosFromChord (self, chord):
-        """
-        calculates the y-Position from a chord length 
-        Returns:
-            :y:   
-        """
-        
-        # overloaded for Bezier 
-
-        normChord = chord / self.wing.rootchord       # normalize 
-
-        yPos = self._bezier.eval_x_on_y (normChord, fast=False) * self.wing.halfwingspan
-
-        return yPos 
-
-
-    
     def refresh (self): 
         """ refresh planform if wing parameters e.g. tipchord have changed"""
 
@@ -1316,7 +1398,7 @@ class Planform_Pure_Elliptical(Planform):
         """
         Returns the normalized chord of an elliptical planform at y 0..1
         Args:
-            :y_norm: the normalized y-Position in the planform 0..1
+            :y_norm: the normalized y-Position in the planform 0..1 - scalar or array
         Returns:
             :chord: the chord 0..1 at y
         """
@@ -1329,31 +1411,22 @@ class Planform_Pure_Elliptical(Planform):
         calculates all relevant geo data of the planform at y 
 
         Args:
-            :y: the y-Position in the planform 0.. halfSpanWidth
+            :y: the y-Position in the planform 0.. halfSpanWidth - scalar or array
         Returns:
             :leadingEdge:  ...-point at y
             :trailingEdge: ...-point at y
         """
-        hingeRootx = (1-(self.flapDepthRoot/100)) * self.rootchord
-        hingeTipx  = hingeRootx +  \
-                            np.tan((self.hingeAngle/180) * np.pi) * self.halfwingspan
-
         # chord-length at y
         y_norm = y / self.halfwingspan
         chord =  self.norm_chord_function (y_norm) * self.rootchord 
 
         # calculate hingeDepth in percent at this particular point along the wing
-        hingeDepth_y = interpolate(0.0, self.halfwingspan,
-                                    self.flapDepthRoot, self.flapDepthTip,y)
+        hingeDepth_y = self._hingeDepth (y)
 
         flapDepth = (hingeDepth_y/100) * chord 
 
         # finally the main "lines" at position y
-        hinge        = (hingeTipx-hingeRootx)/(self.halfwingspan) * (y) + hingeRootx
-        leadingEdge  = hinge - (chord - flapDepth)
-        trailingEdge = leadingEdge + chord
-
-        return leadingEdge, trailingEdge
+        return self._hinge_le_te (y, chord, flapDepth)
 
 
 
@@ -1389,7 +1462,7 @@ class Planform_Bezier_StraightTE (Planform_Bezier):
         calculates LE and TE of the planform at y 
 
         Args:
-            :y: the y-Position in the planform 0.. halfSpanWidth
+            :y: the y-Position in the planform 0.. halfSpanWidth - scalar or array
         Returns:
             :leadingEdge:  ...-point at y
             :trailingEdge: ...-point at y
@@ -1414,7 +1487,7 @@ class Planform_Bezier_StraightTE (Planform_Bezier):
             chord =  self.norm_chord_function (y_norm) * self.rootchord 
 
         # trailingEdge = interpolate(0.0, self.halfwingspan, teRootx, teTipx, y)
-        trailingEdge = interpolate(0.0, teCloseToTipy, teRootx, teCloseToTipx, y)
+        trailingEdge = teRootx + (teCloseToTipx - teRootx) * (y / teCloseToTipy)
         leadingEdge  = trailingEdge - chord
 
         return leadingEdge, trailingEdge
@@ -1453,23 +1526,44 @@ class Planform_Trapezoidal(Planform):
         The planform is defined by the wing sections having a position and a chord value.
         With these a multi trapezoid is defined
         Args:
-            :y_norm: the y-Position in the planform 0..1
+            :y_norm: the y-Position in the planform 0..1 - scalar or array
         Returns:
             :chord: the chord 0..1 at y
         """
 
         y_chords, chords = self.wing.get_wingSections_having_pos_and_chord ()   # tuple y_norm, c_norm
 
+        if np.any (y_norm < y_chords[0]) or np.any (y_norm > y_chords[-1]): 
+            raise ValueError ("Could not interpolate for trapezoid the value ", y_norm)
+
+        return np.interp (y_norm, y_chords, chords)
+
+
+    def find_yPosFromChord (self, chord):
+        """
+        calculates the y-Position from a chord length 
+        Returns:
+            :y:   
+        """
+
+        # overloaded - the trapezoid can be inverted directly 
+
+        myChord = chord / self.rootchord            # normalize 
+
+        y_chords, chords = self.wing.get_wingSections_having_pos_and_chord ()   # tuple y_norm, c_norm
+
         for iSec in range(len(y_chords) - 1):
-            y_before = y_chords [iSec]
-            y_after  = y_chords [iSec+1]
-            if y_norm  >= y_before and  y_norm  <= y_after:
-                chord_before = chords[iSec]
-                chord_after  = chords[iSec+1]
-                return interpolate(y_before, y_after, chord_before, chord_after, y_norm) 
+            chord_before = chords[iSec]
+            chord_after  = chords[iSec+1]
+            if min (chord_before, chord_after) <= myChord <= max (chord_before, chord_after):
+                if chord_before == chord_after: 
+                    y = y_chords [iSec]
+                else: 
+                    y = interpolate(chord_before, chord_after, y_chords [iSec], y_chords [iSec+1], myChord)
+                return y * self.halfwingspan
 
-        # not found ...? 
-        raise ValueError ("Could not interpolate for trapezoid the value ", y_norm)
+        ErrorMsg ("Chord %f must be between 0.0 and root chord" % chord)
+        return
 
 
     def _planform_function (self, y):
@@ -1477,32 +1571,22 @@ class Planform_Trapezoidal(Planform):
         calculates LE and TE of the planform at y 
 
         Args:
-            :y: the y-Position in the planform 0.. halfSpanWidth
+            :y: the y-Position in the planform 0.. halfSpanWidth - scalar or array
         Returns:
             :leadingEdge:  ...-point at y
             :trailingEdge: ...-point at y
         """
-        hingeRootx = (1-(self.flapDepthRoot/100)) * self.rootchord
-        # calculate hingeTipx from hinge line angle
-        hingeTipx = hingeRootx +  \
-                            np.tan((self.hingeAngle/180) * np.pi) * self.halfwingspan
-
         # chord-length at y
         y_norm = y / self.halfwingspan
         chord =  self.norm_chord_function (y_norm) * self.rootchord 
 
         # calculate hingeDepth in percent at this particular point along the wing
-        hingeDepth_y = interpolate(0.0, self.halfwingspan,
-                                    self.flapDepthRoot, self.flapDepthTip,y)
+        hingeDepth_y = self._hingeDepth (y)
 
         flapDepth = (hingeDepth_y/100) * chord 
 
         # finally the main "lines" at position y
-        hinge        = (hingeTipx-hingeRootx)/(self.halfwingspan) * (y) + hingeRootx
-        leadingEdge  = hinge - (chord - flapDepth)
-        trailingEdge = leadingEdge + chord
-
-        return leadingEdge, trailingEdge
+        return self._hinge_le_te (y, chord, flapDepth)
     
     def adjust_planform_to_reference (self):
         """
@@ -1553,6 +1637,8 @@ class Planform_Paneled (Planform_Trapezoidal):
         self._y_minWidth  = fromDict (dataDict, "y-minWidth", 20 , False)
         self._minTipChord = fromDict (dataDict, "minTipChord", 30 , False)
 
+        self._sectionTable = None                       # section yPos, chord, le, te of a wing revision
+
         self.distribution_fns = {}
         self.distribution_fns["uniform"]= lambda y : y
         self.distribution_fns["-sine"]  = lambda y : np.sin (y     * np.pi/2)
@@ -1615,14 +1701,11 @@ class Planform_Paneled (Planform_Trapezoidal):
     def isTipCutted (self):                     
         """ is tip cutted due to minTipChord?""" 
 
-        # sanity check: is minTipChord between chord at tip and chord tip-1
-
-        _, chordList = self.wing.get_wingSections_yPos_chord()
-        return chordList[-1] < self._minTipChord and chordList[-2] > self._minTipChord
+        return self._section_table() ['isTipCutted']
 
     # --- Methods --------------------- 
 
-    def _calc_reducedTipPos (self):
+    def _calc_reducedTipPos (self, yPosList, chordList):
         """ 
         returns a reduced tip y position if tipChord is smaller than minTipCord
          - other tip y position remains halfwingspan 
@@ -1633,7 +1716,6 @@ class Planform_Paneled (Planform_Trapezoidal):
 
         # sanity check: is minTipChord between chord at tip and chord tip-1
 
-        yPosList, chordList = self.wing.get_wingSections_yPos_chord()
         if chordList[-1] > minTipChord or chordList[-2] < minTipChord: return self.halfwingspan
 
         # find the y position having minTipChord 
@@ -1652,20 +1734,51 @@ class Planform_Paneled (Planform_Trapezoidal):
         return newTipPos
 
 
+    def _section_table (self) -> dict:
+        """ 
+        returns the table of the sections of the paneled planform - built once per 
+        wing revision and minTipChord 
+            yPos, chord: lists of section position and chord - tip maybe reduced 
+            le, te: arrays of leading and trailing edge at the sections 
+            isTipCutted: tip is reduced due to minTipChord 
+        """
+
+        key = (self.wing.revision, self._minTipChord)
+
+        if self._sectionTable is None or self._sectionTable['key'] != key: 
+
+            yPosList, chordList = self.wing.get_wingSections_yPos_chord()
+
+            # sanity check: is minTipChord between chord at tip and chord tip-1
+            isTipCutted = chordList[-1] < self._minTipChord and chordList[-2] > self._minTipChord
+
+            # is there a new tip yPos because of minimum tip chord? 
+            if isTipCutted:
+                reducedTipPos = self._calc_reducedTipPos(yPosList, chordList)
+                yPosList[-1]  = reducedTipPos                        # set "new" tip 
+                chordList[-1] = self.wing.planform.chord_function(reducedTipPos)
+
+            # get le te for all sections - take actual planform function 
+            le, te = self.wing.planform._planform_function (np.asarray (yPosList))
+
+            self._sectionTable = {'key': key, 'yPos': yPosList, 'chord': chordList, 
+                                  'le': le, 'te': te, 'isTipCutted': isTipCutted}
+
+        return self._sectionTable
+
+
     def _sections_yPos_chord (self):
         """ returns yPos and chord of all sections as two lists"""
 
+        table = self._section_table()
+        return list(table['yPos']), list(table['chord'])
 
-        yPosList, chordList = self.wing.get_wingSections_yPos_chord()
 
-        # is there a new tip yPos because of minimum tip chord? 
-        if self.isTipCutted:
+    def _sections_le_te (self):
+        """ returns leading and trailing edge at all sections as two arrays"""
 
-            reducedTipPos = self._calc_reducedTipPos()
-            yPosList[-1]  = reducedTipPos                        # set "new" tip 
-            chordList[-1] = self.wing.planform.chord_function(reducedTipPos)
-            
-        return yPosList, chordList
+        table = self._section_table()
+        return table['le'], table['te']
     
 
     def y_panels_forSection(self, sections_yPos, iSec):
@@ -1693,20 +1806,16 @@ class Planform_Paneled (Planform_Trapezoidal):
         the planform represented as trapezoid
         """
 
-        sections_yPos = self._sections_yPos_chord() [0]
+        table = self._section_table()
+        sections_yPos = table['yPos']
 
-        for iSec in range(len(sections_yPos) - 1):
-            y_before = sections_yPos [iSec]
-            y_after  = sections_yPos [iSec+1]
-            if y  >= y_before and  y <= y_after:
-                le_before, te_before = self.wing.planform._planform_function (y_before)
-                le_after, te_after   = self.wing.planform._planform_function (y_after)
-                le = interpolate(y_before, y_after, le_before, le_after, y) 
-                te = interpolate(y_before, y_after, te_before, te_after, y) 
-                return le, te
-
-        # not found ...? 
-        raise ValueError ("Could not interpolate '%s'for paneled planform the value " % y)
+        if np.any (y < sections_yPos[0]) or np.any (y > sections_yPos[-1]): 
+            raise ValueError ("Could not interpolate '%s'for paneled planform the value " % y)
+
+        sections_le, sections_te = table['le'], table['te']
+        le = np.interp (y, sections_yPos, sections_le) 
+        te = np.interp (y, sections_yPos, sections_te) 
+        return le, te
 
     def y_panel_lines (self):
         """
@@ -1724,48 +1833,38 @@ class Planform_Paneled (Planform_Trapezoidal):
         y_distribution_fn = self.distribution_fns [self.y_dist]
         sections_yPos = self._sections_yPos_chord() [0]
 
-        # get le te for all sections 
-        sections_le_te = []
-        for y_sec in sections_yPos: 
-            # take actual planform .. function (maybe faster) 
-            sections_le_te.append(self.wing.planform._planform_function (y_sec))
+        # le te for all sections of the actual planform 
+        sections_le, sections_te = self._sections_le_te()
 
         # now calc a y line according to y distribution function between sections 
+        yPos, le, te = [], [], []
         for iSec in range(len(sections_yPos) - 1):
             y_left   = sections_yPos [iSec]
             y_right  = sections_yPos [iSec+1]
-            dy_sec   = y_right - y_left
-            le_left  = sections_le_te[iSec][0]
-            te_left  = sections_le_te[iSec][1]
-            le_right = sections_le_te[iSec+1][0]
-            te_right = sections_le_te[iSec+1][1]
 
             # assure a min panel width in y-direction 
             y_panels = self.y_panels_forSection(sections_yPos, iSec)
 
-            # line on section will be double
-            for d_yn_pan in np.linspace (0, 1, y_panels +1): 
-                # ! perform the distribution function
-                yn_distrib_pan = y_distribution_fn (d_yn_pan)
-
-                le = interpolate(0.0, 1, le_left, le_right, yn_distrib_pan)
-                te = interpolate(0.0, 1, te_left, te_right, yn_distrib_pan)
-                yPos = y_left + yn_distrib_pan * dy_sec
-
-                lines_y.append([yPos, yPos])
-                lines_le_to_te.append([le, te])
-
-                # calculate the deviation to actual planform upto close to tip 
-                if yPos < self.halfwingspan:
-                    chord_paneled = te-le
-                    le,te  =  self.wing.planform._planform_function (yPos) 
-                    chord_actual  = te-le
-                    deviation = abs((chord_actual - chord_paneled) / chord_actual) * 100
-                else:
-                    deviation = 0 
-                deviations.append(deviation)
-
-        return lines_y, lines_le_to_te, deviations
+            # line on section will be double - ! perform the distribution function
+            yn_distrib_pan = y_distribution_fn (np.linspace (0, 1, y_panels +1))
+
+            le.append   (sections_le[iSec] + (sections_le[iSec+1] - sections_le[iSec]) * yn_distrib_pan)
+            te.append   (sections_te[iSec] + (sections_te[iSec+1] - sections_te[iSec]) * yn_distrib_pan)
+            yPos.append (y_left + yn_distrib_pan * (y_right - y_left))
+
+        yPos, le, te = np.concatenate (yPos), np.concatenate (le), np.concatenate (te)
+
+        # calculate the deviation to actual planform upto close to tip 
+        deviations = np.zeros (len(yPos))
+        inside     = yPos < self.halfwingspan
+        le_actual, te_actual = self.wing.planform._planform_function (yPos[inside]) 
+        chord_actual  = te_actual - le_actual
+        deviations[inside] = np.abs((chord_actual - (te[inside] - le[inside])) / chord_actual) * 100
+
+        lines_y        = [[y, y] for y in yPos]
+        lines_le_to_te = [[l, t] for l, t in zip (le, te)]
+
+        return lines_y, lines_le_to_te, list(deviations)
     
     def x_panel_lines (self):
         """
@@ -1779,10 +1878,8 @@ class Planform_Paneled (Planform_Trapezoidal):
         x_distribution_fn = self.distribution_fns [self.x_dist]
         sections_yPos = self._sections_yPos_chord() [0]
 
-        # get le te for all sections 
-        sections_le_te = []
-        for y_sec in sections_yPos: 
-            sections_le_te.append(self.wing.planform._planform_function (y_sec))
+        # le te for all sections of the actual planform 
+        sections_le, sections_te = self._sections_le_te()
 
 
         # now calc a x horizontal line according to x distribution function between sections 
@@ -1790,10 +1887,10 @@ class Planform_Paneled (Planform_Trapezoidal):
             y_left = sections_yPos [iSec]
             y_right  = sections_yPos [iSec+1]
 
-            le_left  = sections_le_te[iSec][0]
-            te_left  = sections_le_te[iSec][1]
-            le_right = sections_le_te[iSec+1][0]
-            te_right = sections_le_te[iSec+1][1]
+            le_left  = sections_le[iSec]
+            te_left  = sections_te[iSec]
+            le_right = sections_le[iSec+1]
+            te_right = sections_te[iSec+1]
 
             chord_left  = te_left  - le_left
             chord_right = te_right - le_right
@@ -1851,9 +1948,9 @@ class Planform_DXF(Planform):
 
         self._dxfMirrorX       = fromDict (dataDict, "dxfMirrorX", True, msg=False)   
 
-        self.le_norm_dxf        = None   # the normalized leading edge in points from DXF
-        self.te_norm_dxf        = None   # the normalized trailing edge in points from DXF
-        self.hingeLine_norm_dxf = None   # the normalized hinge line in points from DXF
+        self.le_norm_dxf        = None   # the normalized leading edge as array of x,y points from DXF
+        self.te_norm_dxf        = None   # the normalized trailing edge as array of x,y points from DXF
+        self.hingeLine_norm_dxf = None   # the normalized hinge line as array of x,y points from DXF
         self.hingeAngle_dxf     = None
         self.adaptHingeAngle    = False   # the hinge angle will be adapted to wing (for reference DXF)
         self.flapDepthRoot_dxf  = None
@@ -1893,6 +1990,7 @@ class Planform_DXF(Planform):
         return self._dxf_isReference
     def set_dxf_isReference (self, isOverlay: bool):
         self._dxf_isReference = isOverlay
+        self._changed()
 
     def dxf_filename (self):
         """ just the filename without the path of the dxf file"""
@@ -1923,6 +2021,7 @@ class Planform_DXF(Planform):
                 self._dxfPathFilename = self.wing.pathHandler.relFilePath(loadPathFile)
         else: 
             # clear self
+            self._changed()
             self._dxfPathFilename   = None
             self.le_norm_dxf        = None   
             self.te_norm_dxf        = None   
@@ -1945,7 +2044,7 @@ class Planform_DXF(Planform):
 
     @property
     def isValid (self): 
-        return (self.le_norm_dxf != None and self.te_norm_dxf != None)    
+        return (self.le_norm_dxf is not None and self.te_norm_dxf is not None)    
     
     def lines (self):
         # self can be empty
@@ -1957,18 +2056,18 @@ class Planform_DXF(Planform):
         """
         Returns the normalized chord of the planform at y 0..1
         Args:
-            :y_norm: the normalized y-Position in the planform 0..1
+            :y_norm: the normalized y-Position in the planform 0..1 - scalar or array
         Returns:
             :chord: the chord 0..1 at y
         """
         le = self.__get_xFromY(self.le_norm_dxf, y_norm)
         te = self.__get_xFromY(self.te_norm_dxf, y_norm)
 
-        if (le == None) or (te == None):
+        if (le is None) or (te is None):
             ErrorMsg("DXF import: y-coordinate not found, planform could not be created")
             return None
         else:
-            return abs(te-le)
+            return np.abs(te-le)
 
 
     def _planform_function (self, y):
@@ -1976,7 +2075,7 @@ class Planform_DXF(Planform):
         calculates all relevant geo data of the planform at y 
 
         Args:
-            :y: the y-Position in the planform 0.. halfSpanWidth
+            :y: the y-Position in the planform 0.. halfSpanWidth - scalar or array
         Returns:
             :leadingEdge:  ...-point at y
             :trailingEdge: ...-point at y
@@ -1988,26 +2087,17 @@ class Planform_DXF(Planform):
         if self.dxf_isReference: 
             return self._planform_function_dxf (y)
 
-        hingeRootx = (1-(self.flapDepthRoot/100)) * self.rootchord
-        hingeTipx = hingeRootx +  \
-                            np.tan((self.hingeAngle/180) * np.pi) * self.halfwingspan
-
         # chord-length at y
         y_norm = y / self.halfwingspan
         chord =  self.norm_chord_function (y_norm) * self.rootchord 
 
         # calculate hingeDepth in percent at this particular point along the wing
-        hingeDepth_y = interpolate(0.0, self.halfwingspan,
-                                    self.flapDepthRoot, self.flapDepthTip,y)
+        hingeDepth_y = self._hingeDepth (y)
 
         flapDepth = (hingeDepth_y/100) * chord 
 
         # finally the main "lines" at position y
-        hinge        = (hingeTipx-hingeRootx)/(self.halfwingspan) * (y) + hingeRootx
-        leadingEdge  = hinge - (chord - flapDepth)
-        trailingEdge = leadingEdge + chord
-
-        return leadingEdge, trailingEdge
+        return self._hinge_le_te (y, chord, flapDepth)
 
 
     def _planform_function_dxf (self, y):
@@ -2021,7 +2111,7 @@ class Planform_DXF(Planform):
         le_norm = self.__get_xFromY(self.le_norm_dxf, y_norm)
         te_norm = self.__get_xFromY(self.te_norm_dxf, y_norm)
         
-        if (le_norm == None) or (te_norm == None):
+        if (le_norm is None) or (te_norm is None):
             ErrorMsg("DXF import: y-coordinate not found, planform could not be created")
             return 0.0, 0.0
 
@@ -2044,66 +2134,50 @@ class Planform_DXF(Planform):
             :y:  array of the y-stations of the line (root & tip) 
             :hinge: array of hinge x values
         """
-        if not self.isValid or not self.hingeLine_norm_dxf: return [],[]
+        if not self.isValid or self.hingeLine_norm_dxf is None: return [],[]
 
-        npoints = len(self.hingeLine_norm_dxf)
-        y       = np.empty (npoints)
-        hinge   = np.empty (npoints)
-        for i in range(npoints): 
-            y[i]     = self.hingeLine_norm_dxf[i][0] * self.halfwingspan
-            hinge[i] = self.hingeLine_norm_dxf[i][1] * self.rootchord
+        y       = self.hingeLine_norm_dxf[:,0] * self.halfwingspan
+        hinge   = self.hingeLine_norm_dxf[:,1] * self.rootchord
+
+        # add hinge line angle to show original
+        if self.adaptHingeAngle:
+            hinge = hinge + np.tan((self.hingeAngle/180) * np.pi) * y
 
-            # add hinge line angle to show original
-            if self.adaptHingeAngle:
-                deltaHinge = np.tan((self.hingeAngle/180) * np.pi) * y[i]
-                hinge[i] += deltaHinge 
-        
         return y , hinge 
 
 
-    def __get_xFromY(self, line, x):
-        
+    def __get_xFromY(self, line : np.ndarray, x):
+        """ 
+        y value of a dxf line at x (line coordinates) - x may be scalar or array
+
+        The value is always interpolated between the contour points. The former lookup
+        snapped to a contour point within eps - so results may differ up to
+        eps * slope of the line (* rootchord) - on the examples max 0.022mm near the tip.
+        Args:
+            :line: array (n,2) of points x,y with increasing x
+        """
+
         eps = 0.00001                           # deviation for 2 points to be equal
-        y = None
 
-        iIdendical = None
-        iGreater = None 
+        xp = np.maximum.accumulate (line[:,0])  # ensure increasing x for interpolation
 
-        for idx in range(len(line)):
-            xp, yp = line[idx]
-            if (abs(x-xp) < eps):               # found identical point ?
-                iIdendical = idx
-            elif (xp >= (x+ eps)) and (idx>=1):        # first point with x value >= x
-                iGreater = idx
-                break
+        if np.any (np.asarray(x) < xp[0] - eps) or np.any (np.asarray(x) > xp[-1] + eps):
+            ErrorMsg("__get_yFromX, xcoordinate %s not found" % x)
+
+        return np.interp (x, xp, line[:,1])
 
-        if iIdendical:
-             x, y = line[iIdendical] 
-        elif iGreater:
-            x1, y1 = line[iGreater-1]
-            x2, y2 = line[iGreater]
-            y = interpolate(x1, x2, y1, y2, x)
-        else:
-            ErrorMsg("__get_yFromX, xcoordinate %f not found" % x)
-            y = 0.0
-                
-        return y
 
     def mirror_dxf (self):
 
+        self._changed()
+
         # assuming first point is at root
-        x, LE_y = self.le_norm_dxf[0]
-        x, TE_y = self.te_norm_dxf[0]
+        LE_y = self.le_norm_dxf[0,1]
+        TE_y = self.te_norm_dxf[0,1]
         y_mirror = (LE_y + TE_y) / 2
-        for i, p in enumerate(self.le_norm_dxf):
-            x,y = p
-            self.le_norm_dxf [i] = x, y_mirror - (y - y_mirror)
-        for i, p in enumerate(self.te_norm_dxf):
-            x,y = p
-            self.te_norm_dxf [i] = x, y_mirror - (y - y_mirror)
-        for i, p in enumerate(self.hingeLine_norm_dxf):
-            x,y = p
-            self.hingeLine_norm_dxf [i] = x, y_mirror - (y - y_mirror)
+        for line in [self.le_norm_dxf, self.te_norm_dxf, self.hingeLine_norm_dxf]:
+            if line is not None:
+                line[:,1] = y_mirror - (line[:,1] - y_mirror)
 
     def flapDepth_dxf (self, tipAt = 0.95):
         """returns flapDepth root and tip of dxf in percent"""
@@ -2111,7 +2185,7 @@ class Planform_DXF(Planform):
         flapDepthRoot_DXF = 0.0  
         flapDepthTip_DXF = 0.0
         
-        if  self.hingeLine_norm_dxf == None: return
+        if  self.hingeLine_norm_dxf is None: return
 
         le = self.__get_xFromY(self.le_norm_dxf, 0)
         te = self.__get_xFromY(self.te_norm_dxf, 0)
@@ -2142,11 +2216,17 @@ class Planform_DXF(Planform):
         from dxf_utils import import_fromDXF
 
         infoText = []
-        self.le_norm_dxf, self.te_norm_dxf, self.hingeLine_norm_dxf, self.hingeAngle_dxf = \
-            import_fromDXF(dxf_file)
+        le_norm, te_norm, hingeLine_norm, self.hingeAngle_dxf = import_fromDXF(dxf_file)
+
+        # the lines of x,y points as float arrays (n,2)
+        toArray = lambda line: None if line is None else np.asarray (line, dtype=float).reshape (-1,2)
+        self.le_norm_dxf        = toArray (le_norm)
+        self.te_norm_dxf        = toArray (te_norm)
+        self.hingeLine_norm_dxf = toArray (hingeLine_norm)
+        self._changed()
 
         # check result
-        if self.le_norm_dxf != None:
+        if self.le_norm_dxf is not None:
             InfoMsg("DXF planform imported from file %s" % dxf_file)
 
             infoText.append(" - Leading edge %d points"  % (len(self.le_norm_dxf)))
@@ -2156,7 +2236,7 @@ class Planform_DXF(Planform):
                 infoText.append(" - mirrored along y-axis")
                 InfoMsg("Mirroring DXF planform for LE showing upwards")
                 self.mirror_dxf()
-            if self.hingeLine_norm_dxf != None: 
+            if self.hingeLine_norm_dxf is not None: 
                 if self._dxfMirrorX:               # also mirror hinge line 
                     self.hingeAngle_dxf = - self.hingeAngle_dxf
                 infoText.append(" - Hinge line angle %.2f degrees" %self.hingeAngle_dxf)
@@ -2311,6 +2391,7 @@ class WingSection:
         """
         if (value == None):
             self._yPos = None
+            self.wing._changed()
         elif (value < 0.0 or value > self.wing.halfwingspan):
             ErrorMsg ("wingSection: Position must be inside half wingspan %dmm" %self.wing.halfwingspan)
         elif (self.isRoot or self.isTip):
@@ -2321,6 +2402,7 @@ class WingSection:
                 self._norm_chord  = None             # can't have fix position *and* relative chord setting
             else: 
                 self._norm_chord  = self.norm_chord  # also fix chord (trapezoid)
+            self.wing._changed()
 
     @property
     def norm_yPos (self):
@@ -2360,6 +2442,7 @@ class WingSection:
                 self._yPos       = None         # remove other values, section is flex
             else: 
                 self._yPos       = self.yPos    # also fix position (trapezoid)
+            self.wing._changed()
 
     @property
     def chord (self):
@@ -2376,6 +2459,7 @@ class WingSection:
         return self._flapGroup
     def set_flapGroup (self, value):
         self._flapGroup = value
+        self.wing._changed()
 
     @property
     def isRootOrTip (self): 
@@ -2411,6 +2495,7 @@ class WingSection:
                 # for trapezoid both position and chord must have a value 
                 if self._norm_chord is None:    self._norm_chord = self.norm_chord
                 if self._yPos is None:          self._yPos = self.yPos
+        self.wing._changed()
 
 
     def isSet_eitherPosOrChord_disabled (self): 
@@ -2467,6 +2552,7 @@ class WingSection:
         elif self.hasFixedPosition(): 
             if oldSpan:
                 self._yPos = self._yPos * self.wing.wingspan / oldSpan  
+        self.wing._changed()
 
  
     def hasFixedPosition (self):
@@ -2482,6 +2568,7 @@ class WingSection:
             self._yPos = self.yPos                  # write calculated value fix into variable    
         if self._norm_chord is None: 
             self._norm_chord = self.norm_chord      # write calculated value fix into variable                
+        self.wing._changed()
         return 
     
 
@@ -2492,6 +2579,7 @@ class WingSection:
         if ( self._yPos is None and self._norm_chord is None):
             raise ValueError ("Wingsection: Both position and norm chord are not defined")
         self._norm_chord = None      # remove fixed 
+        self.wing._changed()
         return 
 
 
@@ -2687,6 +2775,52 @@ class Flap:
         self.lineRight  = myWing.planform.flapLineAt  (sectionRight.yPos)
          
 
+#-------------------------------------------------------------------------------
+# Snapshot of the planform geometry   
+#-------------------------------------------------------------------------------
+
+class PlanformSnapshot:
+    """ 
+    The geometry of the wing planform at a certain revision of the wing - 
+    lines, outline, hinge, flaps and wing sections. 
+    Built once per revision by Wing.snapshot() and read by artists and exporters.
+    A snapshot is immutable - its arrays are read only 
+
+    Wing
+       |-- PlanformSnapshot 
+    """
+    def __init__(self, myWing: Wing):
+
+        planform : Planform = myWing.planform
+
+        self.revision  = myWing.revision 
+
+        self.y, self.le, self.te         = planform.lines()
+        self.outline_y, self.outline_x   = planform.linesPolygon()
+        self.hinge_y, self.hinge_x       = planform.hingeLine()
+        self.area, self.aspectRatio      = planform.calc_area_AR (self.outline_y, self.outline_x)
+
+        self.flaps = tuple (myWing.getFlaps())
+
+        sections_yPos, sections_chord    = myWing.get_wingSections_yPos_chord()
+        self.sections_yPos  = np.asarray (sections_yPos)
+        self.sections_chord = np.asarray (sections_chord)
+
+        for value in self.__dict__.values():
+            if isinstance (value, np.ndarray): 
+                value.setflags (write=False)
+        self._frozen = True
+
+
+    def __setattr__(self, name, value):
+        if getattr (self, '_frozen', False):
+            raise AttributeError ("PlanformSnapshot is immutable")
+        super().__setattr__(name, value)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__} of revision {self.revision}"
+
+
 #-------------------------------------------------------------------------------
 # Export airfoils of all wing sections    
 #-------------------------------------------------------------------------------